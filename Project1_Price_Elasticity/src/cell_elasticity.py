@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fe_elasticity import DEFAULT_PANEL_PATH, read_panel_codes, combine_codes, demean, _source_stamp
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# 🧩 Batched Part x Country Elasticity Engine
+# ==========================================
+# One log-log elasticity (with SE) per (part, country) cell in a single vectorized pass: grouped
+# sufficient statistics (n, Sx, Sy, Sxx, Sxy, Syy) via np.bincount, then closed-form within-cell OLS.
+# Optional part x month demeaning removes common seasonal/FX shocks first. Noisy cells can be shrunk
+# toward their part-level mean (empirical Bayes, method-of-moments prior variance). The result is a
+# compact Parquet lookup table for the price simulator.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+LOOKUP_PATH = os.path.join(base_dir, '..', 'artifacts', 'cell_elasticity.parquet')
+
+MIN_CELL_OBS = 3
+LOOKUP_VERSION = 2      # 2: residual dof net of absorbed part x month effects
+
+_lock = threading.Lock()
+_memory = {}
+
+
+def cell_sufficient_stats(y, x, cell, n_cells):
+    def gsum(w=None):
+        return np.bincount(cell, weights=w, minlength=n_cells).astype(np.float64)
+    return {'n': gsum(), 'sx': gsum(x), 'sy': gsum(y), 'sxx': gsum(x * x), 'sxy': gsum(x * y), 'syy': gsum(y * y)}
+
+
+def solve_cells(stats, absorbed=0.0):
+    # Within-cell OLS (cell intercept + slope) from centered cross-products, homoskedastic SEs.
+    # `absorbed`: per-cell degrees of freedom already used by effects swept out before the fit
+    n = stats['n']
+    dof = n - 2 - absorbed
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cxx = stats['sxx'] - stats['sx'] ** 2 / n
+        cxy = stats['sxy'] - stats['sx'] * stats['sy'] / n
+        cyy = stats['syy'] - stats['sy'] ** 2 / n
+        beta = cxy / cxx
+        rss = np.maximum(cyy - beta * cxy, 0)
+        se = np.sqrt(rss / dof / cxx)
+    # Too few rows (or residual dof) or no price variation -> not identified
+    bad = (n < MIN_CELL_OBS) | ~(dof > 0) | ~(cxx > 1e-12 * np.maximum(stats['sxx'], 1))
+    beta[bad], se[bad] = np.nan, np.nan
+    return beta, se
+
+
+def shrink_to_part(beta, se, cell_part, n_parts):
+    # Empirical Bayes: b_shrunk = m_part + B (b - m_part), B = tau^2 / (tau^2 + se^2)
+    ok = np.isfinite(beta) & np.isfinite(se) & (se > 0)
+    w = np.where(ok, 1.0 / np.where(ok, se, 1) ** 2, 0.0)
+    b0 = np.where(ok, beta, 0.0)
+
+    sum_w = np.bincount(cell_part, weights=w, minlength=n_parts)
+    part_mean = np.bincount(cell_part, weights=w * b0, minlength=n_parts) / np.where(sum_w > 0, sum_w, np.nan)
+
+    # tau^2 = Var(b) - mean(se^2) over the identified cells of each part (floored at 0)
+    cnt = np.bincount(cell_part, weights=ok.astype(float), minlength=n_parts)
+    mean_b = np.bincount(cell_part, weights=b0, minlength=n_parts) / np.maximum(cnt, 1)
+    var_b = np.bincount(cell_part, weights=np.where(ok, (b0 - mean_b[cell_part]) ** 2, 0), minlength=n_parts) / np.maximum(cnt - 1, 1)
+    mean_se2 = np.bincount(cell_part, weights=np.where(ok, se, 0) ** 2, minlength=n_parts) / np.maximum(cnt, 1)
+    tau2 = np.maximum(var_b - mean_se2, 0)
+
+    m = part_mean[cell_part]
+    factor = np.where(ok, tau2[cell_part] / (tau2[cell_part] + np.where(ok, se, 1) ** 2), 0.0)
+    shrunk = np.where(ok, m + factor * (b0 - m), m)
+    # Posterior SD also carries the uncertainty of the part mean itself (1 / sum of weights)
+    mean_var = (1.0 / np.where(sum_w > 0, sum_w, np.nan))[cell_part]
+    shrunk_se = np.where(ok, np.sqrt(factor * np.where(ok, se, 0) ** 2 + (1 - factor) ** 2 * mean_var),
+                         np.sqrt(tau2[cell_part] + mean_var))
+    return shrunk, shrunk_se, part_mean
+
+
+def estimate_cells(panel, absorb_time=True, shrink=True):
+    part, country = panel['part'], panel['country']
+    n_countries = len(panel['country_names'])
+    cell = part * n_countries + country
+    n_cells = len(panel['part_names']) * n_countries
+
+    n_parts = len(panel['part_names'])
+    n_obs = np.bincount(cell, minlength=n_cells)
+    cell_part = np.repeat(np.arange(n_parts), n_countries)
+
+    y, x = panel['y'], panel['x']
+    absorbed = 0.0
+    if absorb_time:
+        part_month = combine_codes(part, panel['month'])
+        y, x = demean([y, x], [part_month])
+        # A part's months - 1 absorbed effects (its mean is already in the cell intercepts), charged to its
+        # cells by row share: exact for the part's total residual dof, a pro-rata split per cell
+        months = np.bincount(part[np.unique(part_month, return_index=True)[1]], minlength=n_parts)
+        rows = np.bincount(part, minlength=n_parts)
+        absorbed = n_obs * ((months - 1) / np.maximum(rows, 1))[cell_part]
+
+    beta, se = solve_cells(cell_sufficient_stats(y, x, cell, n_cells), absorbed)
+    cell_country = np.tile(np.arange(n_countries), len(panel['part_names']))
+    out = pd.DataFrame({
+        'Part': pd.Categorical.from_codes(cell_part, panel['part_names']),
+        'Country': pd.Categorical.from_codes(cell_country, panel['country_names']),
+        'Elasticity': beta.astype(np.float32),
+        'SE': se.astype(np.float32),
+        'N': n_obs.astype(np.int32),
+    })
+    if shrink:
+        shrunk, shrunk_se, part_mean = shrink_to_part(beta, se, cell_part, len(panel['part_names']))
+        out['Elasticity_Shrunk'] = shrunk.astype(np.float32)
+        out['SE_Shrunk'] = shrunk_se.astype(np.float32)
+        out['Part_Mean'] = part_mean[cell_part].astype(np.float32)
+    return out[out['N'] > 0].reset_index(drop=True)
+
+
+def write_lookup(table, stamp, options):
+    arrow = pa.Table.from_pandas(table, preserve_index=False)
+    meta = {b'source_stamp': json.dumps(stamp).encode(), b'options': json.dumps(options).encode()}
+    atomic_write(LOOKUP_PATH, lambda tmp: pq.write_table(arrow.replace_schema_metadata({**(arrow.schema.metadata or {}), **meta}), tmp))
+
+
+def load_cell_elasticities(path=DEFAULT_PANEL_PATH, absorb_time=True, shrink=True):
+    # Cached lookup table; rebuilt only when the panel file changed
+    stamp = _source_stamp(path)
+    options = {'version': LOOKUP_VERSION, 'absorb_time': absorb_time, 'shrink': shrink}
+    with _lock:
+        cached = _memory.get('lookup')
+        if cached is not None and cached[0] == (stamp, options):
+            return cached[1]
+
+        table = None
+        if os.path.exists(LOOKUP_PATH):
+            meta = pq.read_schema(LOOKUP_PATH).metadata or {}
+            if json.loads(meta.get(b'source_stamp', b'null')) == stamp and json.loads(meta.get(b'options', b'null')) == options:
+                table = pq.read_table(LOOKUP_PATH, memory_map=True).to_pandas()
+        if table is None:
+            table = estimate_cells(read_panel_codes(path), absorb_time=absorb_time, shrink=shrink)
+            write_lookup(table, stamp, options)
+
+        _memory['lookup'] = ((stamp, options), table)
+        return table
+
+
+def cell_elasticity_for(table, part, country):
+    row = table[(table['Part'] == part) & (table['Country'] == country)]
+    return None if row.empty else row.iloc[0]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Per part x country elasticity lookup table")
+    parser.add_argument('--panel', default=DEFAULT_PANEL_PATH, help="panel CSV or Parquet (file or partition directory)")
+    parser.add_argument('--no-time-effects', action='store_true', help="skip part x month demeaning")
+    parser.add_argument('--no-shrink', action='store_true', help="skip shrinkage toward the part mean")
+    args = parser.parse_args()
+
+    table = load_cell_elasticities(args.panel, absorb_time=not args.no_time_effects, shrink=not args.no_shrink)
+    print(f"✅ {len(table):,} part x country elasticities -> {LOOKUP_PATH}")
+    print(table.head(10).to_string(index=False))
@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+for _path in [_root, os.path.join(_root, 'Project4_Profit_Dashboard', 'src')]:
+    if _path not in sys.path:
+        sys.path.append(_path)  # repo root: shared pipeline_utils; data_store: CSV / Parquet reads
+from pipeline_utils import atomic_write
+from data_store import read_source
+
+# ==========================================
+# 🧮 Multi-Way Fixed Effects Price Elasticity (no dummies)
+# ==========================================
+# ln(Q) = beta_part * ln(P) + FE + e, estimated per part with country and month fixed effects absorbed
+# (groups: part x country, part x month), plus a pooled beta with country, part and month effects.
+# Fixed effects are removed by alternating projections (iterated group demeaning with np.bincount on
+# integer group codes), so memory is a handful of float64 vectors of length N instead of an N x K dummy
+# matrix; tens of millions of rows fit comfortably. Standard errors are cluster-robust (default: Country).
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PANEL_PATH = os.path.join(base_dir, '..', 'data', 'panel_sales_data.csv')
+RESULTS_PATH = os.path.join(base_dir, '..', 'artifacts', 'fe_elasticity.json')
+
+COLUMNS = ['Date', 'Country', 'Part', 'Price_USD', 'Quantity']
+
+_lock = threading.Lock()
+_memory = {}
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def read_panel_codes(path=DEFAULT_PANEL_PATH):
+    # Compact read: integer group codes + float64 logs only. Prefers the Parquet copy when it's up to date.
+    df = read_source(path, COLUMNS, dtype={'Country': 'category', 'Part': 'category'}, parse_dates=['Date'])
+
+    # Log-log needs strictly positive price and quantity
+    valid = (df['Price_USD'].to_numpy() > 0) & (df['Quantity'].to_numpy() > 0)
+    df = df[valid]
+
+    part = df['Part'].astype('category')
+    country = df['Country'].astype('category')
+    month_codes, months = pd.factorize(pd.to_datetime(df['Date']).to_numpy().astype('datetime64[M]'), sort=True)
+    return {
+        'y': np.log(df['Quantity'].to_numpy(dtype=np.float64)),
+        'x': np.log(df['Price_USD'].to_numpy(dtype=np.float64)),
+        'part': part.cat.codes.to_numpy().astype(np.int64),
+        'country': country.cat.codes.to_numpy().astype(np.int64),
+        'month': month_codes.astype(np.int64),
+        'part_names': list(part.cat.categories.astype(str)),
+        'country_names': list(country.cat.categories.astype(str)),
+        'n_months': len(months),
+    }
+
+
+def combine_codes(a, b):
+    # Dense code for the interaction a x b
+    codes, _ = pd.factorize(a * (int(b.max()) + 1) + b)
+    return codes.astype(np.int64)
+
+
+def demean(columns, groups, tol=1e-10, max_iter=1000):
+    # Alternating projections: sweep the group means out of every column until the sweep stops moving them
+    out = [np.array(c, dtype=np.float64) for c in columns]
+    counts = [np.bincount(codes).astype(np.float64) for codes in groups]
+    for _ in range(max_iter):
+        moved = 0.0
+        for codes, cnt in zip(groups, counts):
+            for v in out:
+                means = np.bincount(codes, weights=v, minlength=len(cnt)) / cnt
+                v -= means[codes]
+                moved = max(moved, np.abs(means).max())
+        if moved < tol or len(groups) == 1:
+            break
+    return out
+
+
+def _n_levels(codes, within):
+    # Number of distinct absorbed levels inside each `within` group (degrees of freedom used by the FE)
+    pair = combine_codes(within, codes)
+    owner = np.zeros(int(pair.max()) + 1, dtype=np.int64)
+    owner[pair] = within
+    return np.bincount(owner, minlength=int(within.max()) + 1)
+
+
+def estimate_slopes(y, x, slope_group, fe_groups, cluster):
+    # One slope per slope_group level after absorbing fe_groups; cluster-robust (CR1) standard errors
+    y_t, x_t = demean([y, x], fe_groups)
+    n_s = int(slope_group.max()) + 1
+
+    sxx = np.bincount(slope_group, weights=x_t * x_t, minlength=n_s)
+    sxy = np.bincount(slope_group, weights=x_t * y_t, minlength=n_s)
+    beta = sxy / sxx
+    resid = y_t - beta[slope_group] * x_t
+
+    # Sum of scores per (slope group, cluster)
+    sc_codes = combine_codes(slope_group, cluster)
+    scores = np.bincount(sc_codes, weights=x_t * resid)
+    sc_slope = np.zeros(len(scores), dtype=np.int64)
+    sc_slope[sc_codes] = slope_group
+    meat = np.bincount(sc_slope, weights=scores ** 2, minlength=n_s)
+
+    n_obs = np.bincount(slope_group, minlength=n_s)
+    n_clusters = _n_levels(cluster, slope_group)
+    k = 1 + sum(_n_levels(g, slope_group) for g in fe_groups) - (len(fe_groups) - 1)
+    correction = n_clusters / np.maximum(n_clusters - 1, 1) * (n_obs - 1) / np.maximum(n_obs - k, 1)
+    se = np.sqrt(correction * meat) / sxx
+    return beta, se, n_obs
+
+
+def estimate_elasticities(panel, cluster='country'):
+    part, country, month = panel['part'], panel['country'], panel['month']
+    cluster_codes = panel[cluster] if cluster in ('country', 'part', 'month') else combine_codes(part, country)
+    rows = []
+
+    # Pooled OLS per part (only a part intercept) - the uncontrolled benchmark
+    beta, se, n = estimate_slopes(panel['y'], panel['x'], part, [part], cluster_codes)
+    rows += [('OLS', name, beta[i], se[i], n[i]) for i, name in enumerate(panel['part_names'])]
+
+    # Two-way FE per part: country and month effects within each part
+    fe_groups = [combine_codes(part, country), combine_codes(part, month)]
+    beta, se, n = estimate_slopes(panel['y'], panel['x'], part, fe_groups, cluster_codes)
+    rows += [('FE', name, beta[i], se[i], n[i]) for i, name in enumerate(panel['part_names'])]
+
+    # Pooled three-way FE (country, part, month): one elasticity for the portfolio
+    zeros = np.zeros_like(part)
+    beta, se, n = estimate_slopes(panel['y'], panel['x'], zeros, [country, part, month], cluster_codes)
+    rows.append(('FE_Pooled', 'ALL', beta[0], se[0], n[0]))
+
+    df = pd.DataFrame(rows, columns=['Model', 'Part', 'Elasticity', 'SE', 'N'])
+    df['t_stat'] = df['Elasticity'] / df['SE']
+    return df
+
+
+def load_elasticities(path=DEFAULT_PANEL_PATH, cluster='country'):
+    # Cached estimator output; re-estimates only when the panel file changed
+    stamp = _source_stamp(path)
+    with _lock:
+        cached = _memory.get((stamp[0], cluster))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        results = None
+        if os.path.exists(RESULTS_PATH):
+            with open(RESULTS_PATH) as f:
+                stored = json.load(f)
+            if stored['source_stamp'] == stamp and stored['cluster'] == cluster:
+                results = pd.DataFrame(stored['results'])
+        if results is None:
+            results = estimate_elasticities(read_panel_codes(path), cluster=cluster)
+            stored = {'source_stamp': stamp, 'cluster': cluster, 'results': results.to_dict(orient='records')}
+            atomic_write(RESULTS_PATH, lambda f: json.dump(stored, f, indent=2), mode='w')
+
+        _memory[(stamp[0], cluster)] = (stamp, results)
+        return results
+
+
+def elasticity_for(results, part, model='FE'):
+    row = results[(results['Model'] == model) & (results['Part'] == part)]
+    return None if row.empty else row.iloc[0]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Multi-way FE log-log price elasticity")
+    parser.add_argument('--panel', default=DEFAULT_PANEL_PATH, help="panel CSV or Parquet (file or partition directory)")
+    parser.add_argument('--cluster', default='country', choices=['country', 'part', 'month', 'part_country'])
+    args = parser.parse_args()
+
+    res = load_elasticities(args.panel, cluster=args.cluster)
+    print(f"✅ FE elasticities ({int(res['N'].max())} rows, clustered by {args.cluster}) -> {RESULTS_PATH}")
+    print(res.to_string(index=False))
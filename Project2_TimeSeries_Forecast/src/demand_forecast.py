@@ -0,0 +1,330 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+for _path in [_root, os.path.join(_root, 'Project4_Profit_Dashboard', 'src')]:
+    if _path not in sys.path:
+        sys.path.append(_path)  # repo root: shared pipeline_utils; data_store: CSV / Parquet reads
+from pipeline_utils import atomic_write
+from data_store import read_source
+
+# ==========================================
+# 📦 Hierarchical Demand Forecasting (every part x country series, parallel, incremental)
+# ==========================================
+# The panel's monthly Quantity becomes one series per (part, country) cell plus its aggregates (part
+# totals, country totals, grand total), all forecast HORIZON months ahead. Simple models (naive,
+# seasonal naive, SES, damped Holt) are a vectorized fast path: one pass over time for a whole chunk of
+# series and its full smoothing-parameter grid. 'ets' fits statsmodels Holt-Winters per series. Either
+# way series are fitted in chunks, across a process pool when workers > 1 (the matrix goes to each
+# worker once, tasks only carry row ranges). Base forecasts are then reconciled so parts and countries
+# add up (bottom-up, or the MinT projection with OLS / structural / in-sample-variance weights, which
+# only solves a system the size of the aggregate nodes). Fitted state is cached per series content
+# hash, so a refresh refits only the series whose history changed.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PANEL_PATH = os.path.join(base_dir, '..', '..', 'Project1_Price_Elasticity', 'data', 'panel_sales_data.csv')
+ARTIFACT_DIR = os.path.join(base_dir, '..', 'artifacts')
+FORECAST_PATH = os.path.join(ARTIFACT_DIR, 'demand_forecast.parquet')
+
+COLUMNS = ['Date', 'Country', 'Part', 'Quantity']
+HORIZON = 24            # 2-year plan, same as the macro VAR forecast
+SEASON = 12
+CHUNK_SERIES = 2000     # series per task
+ALPHAS = np.array([0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9])
+BETAS = np.array([0.01, 0.05, 0.1, 0.2])
+PHI = 0.9               # trend damping: 24 months out a straight-line trend would overshoot
+MIN_ETS_OBS = 2 * SEASON + 2
+FAST_METHODS = ('naive', 'snaive', 'ses', 'holt')
+METHODS = FAST_METHODS + ('ets',)
+RECONCILE = ('bottom_up', 'ols', 'wls_struct', 'mint_diag')
+LEVELS = ['total', 'part', 'country', 'series']
+STATE_VERSION = 1
+
+_shared = {}
+
+
+def read_demand(path=DEFAULT_PANEL_PATH):
+    # -> (n_series, n_months) Quantity matrix, one row per (part, country) cell seen in the data.
+    # Months nobody sold in count as zero demand. Prefers the Parquet copy when it's up to date.
+    df = read_source(path, COLUMNS, dtype={'Country': 'category', 'Part': 'category'}, parse_dates=['Date'])
+
+    part = df['Part'].astype('category')
+    country = df['Country'].astype('category')
+    month = pd.to_datetime(df['Date']).to_numpy().astype('datetime64[M]').astype(np.int64)
+    n_months = int(month.max() - month.min()) + 1
+    n_countries = len(country.cat.categories)
+    cell = part.cat.codes.to_numpy().astype(np.int64) * n_countries + country.cat.codes.to_numpy()
+
+    flat = cell * n_months + (month - month.min())
+    size = (len(part.cat.categories) * n_countries) * n_months
+    qty = np.bincount(flat, weights=df['Quantity'].to_numpy(dtype=np.float64), minlength=size).reshape(-1, n_months)
+    present = np.flatnonzero(np.bincount(cell, minlength=qty.shape[0]))
+    return {
+        'y': qty[present],
+        'part': present // n_countries,
+        'country': present % n_countries,
+        'part_names': list(part.cat.categories.astype(str)),
+        'country_names': list(country.cat.categories.astype(str)),
+        'months': pd.date_range(pd.Timestamp(np.datetime64(int(month.min()), 'M')), periods=n_months, freq='MS'),
+    }
+
+
+def _group_sum(values, codes, n_groups):
+    # Row sums of `values` per group code, column by column (bincount beats np.add.at by far)
+    return np.stack([np.bincount(codes, weights=values[:, j], minlength=n_groups) for j in range(values.shape[1])], axis=1)
+
+
+def build_hierarchy(demand):
+    # Stack [total, parts, countries, series]; `node` maps each bottom series to its three aggregate rows
+    y, part, country = demand['y'], demand['part'], demand['country']
+    n_p, n_c = len(demand['part_names']), len(demand['country_names'])
+    node = np.stack([np.zeros_like(part), 1 + part, 1 + n_p + country])
+    y_all = np.concatenate([y.sum(axis=0, keepdims=True), _group_sum(y, part, n_p), _group_sum(y, country, n_c), y])
+    level = np.repeat(np.arange(len(LEVELS)), [1, n_p, n_c, len(y)])
+    part_code = np.concatenate([[-1], np.arange(n_p), np.full(n_c, -1), part])
+    country_code = np.concatenate([[-1], np.full(n_p, -1), np.arange(n_c), country])
+    return {'y': y_all, 'level': level, 'part': part_code, 'country': country_code, 'node': node, 'n_agg': 1 + n_p + n_c}
+
+
+# ==========================================
+# ⚡ Vectorized fast path (whole chunk x parameter grid per time step)
+# ==========================================
+def smooth_grid(y, alphas, betas, phi, horizon):
+    # Damped-trend exponential smoothing (error-correction form) for every series and every (alpha, beta)
+    # at once; each series keeps its best in-sample one-step SSE. betas=[0] with no trend is SES.
+    n, t_len = y.shape
+    trend = np.any(betas > 0)
+    a = np.repeat(alphas, len(betas))[None, :]
+    ab = a * np.tile(betas, len(alphas))[None, :]
+    level = np.repeat(y[:, :1], a.shape[1], axis=1)
+    k = min(t_len - 1, SEASON)
+    slope = np.repeat((y[:, k:k + 1] - y[:, :1]) / max(k, 1), a.shape[1], axis=1) if trend else np.zeros_like(level)
+    sse = np.zeros_like(level)
+    for t in range(1, t_len):
+        fitted = level + phi * slope
+        err = y[:, t:t + 1] - fitted
+        sse += err * err
+        level = fitted + a * err
+        slope = phi * slope + ab * err
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(n)
+    damp = np.cumsum(phi ** np.arange(1, horizon + 1)) if trend else np.zeros(horizon)
+    forecast = level[rows, best][:, None] + slope[rows, best][:, None] * damp[None, :]
+    params = np.stack([a[0, best], (ab / a)[0, best], np.full(n, phi if trend else 0.0)], axis=1)
+    return forecast, sse[rows, best] / max(t_len - 1, 1), params
+
+
+def fit_fast(y, method, horizon=HORIZON):
+    # -> (forecast (n, horizon), in-sample one-step MSE (n,), params (n, 3): alpha, beta, phi)
+    n, t_len = y.shape
+    no_params = np.full((n, 3), np.nan)
+    if method == 'naive' or (method == 'snaive' and t_len < 2 * SEASON):
+        mse = np.mean(np.diff(y, axis=1) ** 2, axis=1) if t_len > 1 else np.zeros(n)
+        return np.repeat(y[:, -1:], horizon, axis=1), mse, no_params
+    if method == 'snaive':
+        last = y[:, -SEASON:]
+        mse = np.mean((y[:, SEASON:] - y[:, :-SEASON]) ** 2, axis=1)
+        return last[:, np.arange(horizon) % SEASON], mse, no_params
+    if method == 'ses':
+        return smooth_grid(y, ALPHAS, np.zeros(1), 1.0, horizon)
+    return smooth_grid(y, ALPHAS, BETAS, PHI, horizon)
+
+
+def fit_ets(y, horizon=HORIZON):
+    # Per-series statsmodels Holt-Winters (damped additive trend, additive seasonality when there are
+    # two full years); short or failed fits fall back to the vectorized damped Holt
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+    forecast, mse, params = fit_fast(y, 'holt', horizon)
+    if y.shape[1] < SEASON:
+        return forecast, mse, params
+    seasonal = 'add' if y.shape[1] >= MIN_ETS_OBS else None
+    for i, series in enumerate(y):
+        if np.ptp(series) == 0:
+            continue
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                res = ExponentialSmoothing(series, trend='add', damped_trend=True, seasonal=seasonal,
+                                           seasonal_periods=SEASON if seasonal else None, initialization_method='estimated').fit()
+            path = res.forecast(horizon)
+        except Exception:
+            continue
+        if np.all(np.isfinite(path)):
+            forecast[i], mse[i] = path, res.sse / len(series)
+            params[i] = [res.params['smoothing_level'], res.params['smoothing_trend'], res.params['damping_trend']]
+    return forecast, mse, params
+
+
+def fit_series(y, method, horizon=HORIZON):
+    return fit_ets(y, horizon) if method == 'ets' else fit_fast(y, method, horizon)
+
+
+def _init_worker(shared):
+    _shared.update(shared)
+
+
+def _fit_chunk(lo, hi, method, horizon):
+    return lo, fit_series(_shared['y'][lo:hi], method, horizon)
+
+
+def fit_all(y, method, horizon=HORIZON, workers=1, chunk_series=CHUNK_SERIES):
+    # Chunks are fitted independently, so results don't depend on the worker count or chunk size
+    forecast = np.empty((len(y), horizon))
+    mse, params = np.empty(len(y)), np.empty((len(y), 3))
+    bounds = [(lo, min(len(y), lo + chunk_series)) for lo in range(0, len(y), chunk_series)]
+    if workers <= 1 or len(bounds) <= 1:
+        _init_worker({'y': y})
+        results = (_fit_chunk(lo, hi, method, horizon) for lo, hi in bounds)
+        for lo, (f, m, p) in results:
+            forecast[lo:lo + len(f)], mse[lo:lo + len(f)], params[lo:lo + len(f)] = f, m, p
+    else:
+        # Matrix goes to each worker once (initializer), tasks only carry row ranges
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=({'y': y},)) as executor:
+            futures = [executor.submit(_fit_chunk, lo, hi, method, horizon) for lo, hi in bounds]
+            for fut in futures:
+                lo, (f, m, p) = fut.result()
+                forecast[lo:lo + len(f)], mse[lo:lo + len(f)], params[lo:lo + len(f)] = f, m, p
+    return forecast, mse, params
+
+
+# ==========================================
+# 🔺 Reconciliation (parts and countries add up)
+# ==========================================
+def reconcile(hierarchy, base, mse, method='mint_diag'):
+    # MinT projection y~ = y^ - W C' (C W C')^-1 C y^ with C = [I_agg, -S_agg] and diagonal W, solved on the
+    # n_agg aggregate nodes only (S_agg has three ones per bottom column). Negative bottom demand is then
+    # clipped and the aggregates re-summed, so the result stays coherent.
+    n_agg, node = hierarchy['n_agg'], hierarchy['node']
+    agg, bottom = base[:n_agg], base[n_agg:]
+    n_b = len(bottom)
+    if method != 'bottom_up':
+        if method == 'ols':
+            w = np.ones(len(base))
+        elif method == 'wls_struct':
+            w = np.concatenate([np.bincount(node.ravel(), minlength=n_agg), np.ones(n_b)]).astype(np.float64)
+        else:
+            w = np.maximum(mse, 1e-8 * max(float(np.mean(mse)), 1e-12))
+        w_agg, w_b = w[:n_agg], w[n_agg:]
+        resid = agg - sum(_group_sum(bottom, codes, n_agg) for codes in node)
+        pairs = (node[:, None, :] * n_agg + node[None, :, :]).ravel()
+        gram = np.bincount(pairs, weights=np.tile(w_b, 9), minlength=n_agg * n_agg).reshape(n_agg, n_agg)
+        gram[np.diag_indices(n_agg)] += w_agg
+        lam = np.linalg.solve(gram, resid)
+        bottom = bottom + w_b[:, None] * lam[node].sum(axis=0)
+    bottom = np.maximum(bottom, 0.0)
+    # node rows are disjoint per level, so one sum over the three maps rebuilds every aggregate
+    agg = sum(_group_sum(bottom, codes, n_agg) for codes in node)
+    return np.concatenate([agg, bottom])
+
+
+# ==========================================
+# 💾 Per-series fitted state (refit only what changed)
+# ==========================================
+def series_digests(hierarchy, names):
+    # Content hash of each series' identity and history; an appended month changes every digest
+    y = np.ascontiguousarray(hierarchy['y'])
+    return np.array([hashlib.blake2b(f'{name}\0'.encode() + y[i].tobytes(), digest_size=16).hexdigest()
+                     for i, name in enumerate(names)])
+
+
+def _state_path(method, horizon):
+    return os.path.join(ARTIFACT_DIR, f"demand_state_{method}_h{horizon}_v{STATE_VERSION}.npz")
+
+
+def load_state(method, horizon):
+    path = _state_path(method, horizon)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as npz:
+        return {name: npz[name] for name in npz.files}
+
+
+def save_state(state, method, horizon):
+    atomic_write(_state_path(method, horizon), lambda f: np.savez(f, **state), mode='wb')
+
+
+def node_names(demand, hierarchy):
+    parts, countries = np.array(demand['part_names'] + ['']), np.array(demand['country_names'] + [''])
+    return np.char.add(np.char.add(np.array(LEVELS)[hierarchy['level']], '|'),
+                       np.char.add(np.char.add(parts[hierarchy['part']], '|'), countries[hierarchy['country']]))
+
+
+def forecast_demand(path=DEFAULT_PANEL_PATH, method='holt', reconcile_method='mint_diag', horizon=HORIZON,
+                    workers=1, chunk_series=CHUNK_SERIES, use_state=True):
+    # -> (long forecast table, stats); only series without a cached fit for their exact history are refitted
+    start = time.perf_counter()
+    demand = read_demand(path)
+    hierarchy = build_hierarchy(demand)
+    digests = series_digests(hierarchy, node_names(demand, hierarchy))
+    n = len(digests)
+
+    base, mse, params = np.empty((n, horizon)), np.empty(n), np.empty((n, 3))
+    state = load_state(method, horizon) if use_state else None
+    hit = pd.Index(state['digest']).get_indexer(digests) if state is not None else np.full(n, -1)
+    reuse = hit >= 0
+    if reuse.any():
+        base[reuse], mse[reuse], params[reuse] = state['forecast'][hit[reuse]], state['mse'][hit[reuse]], state['params'][hit[reuse]]
+    refit = np.flatnonzero(~reuse)
+    fit_start = time.perf_counter()
+    if len(refit):
+        base[refit], mse[refit], params[refit] = fit_all(hierarchy['y'][refit], method, horizon, workers, chunk_series)
+    fit_seconds = time.perf_counter() - fit_start
+    if use_state and len(refit):
+        # Only current series are kept, so the state never outgrows the panel
+        save_state({'digest': digests, 'forecast': base, 'mse': mse, 'params': params}, method, horizon)
+
+    reconciled = reconcile(hierarchy, base, mse, reconcile_method)
+    total_seconds = time.perf_counter() - start
+
+    dates = pd.date_range(demand['months'][-1], periods=horizon + 1, freq='MS')[1:]
+    # Aggregate rows have code -1, i.e. a missing Part / Country (= all parts / countries)
+    table = pd.DataFrame({
+        'Level': pd.Categorical.from_codes(np.repeat(hierarchy['level'], horizon), LEVELS),
+        'Part': pd.Categorical.from_codes(np.repeat(hierarchy['part'], horizon), demand['part_names']),
+        'Country': pd.Categorical.from_codes(np.repeat(hierarchy['country'], horizon), demand['country_names']),
+        'Date': np.tile(dates.values, n),
+        'Forecast': reconciled.ravel().astype(np.float32),
+        'Base': base.ravel().astype(np.float32),
+    })
+    stats = {'series': n, 'bottom_series': len(demand['y']), 'months': len(demand['months']), 'horizon': horizon,
+             'method': method, 'reconcile': reconcile_method, 'refit': len(refit), 'reused': int(reuse.sum()),
+             'fit_seconds': fit_seconds, 'total_seconds': total_seconds,
+             'fit_series_per_s': len(refit) / fit_seconds if len(refit) and fit_seconds > 0 else None,
+             'series_per_s': n / total_seconds}
+    return table, stats
+
+
+def write_forecast(table, stats, path=FORECAST_PATH):
+    arrow = pa.Table.from_pandas(table, preserve_index=False)
+    meta = {b'stats': json.dumps(stats).encode()}
+    return atomic_write(path, lambda tmp: pq.write_table(arrow.replace_schema_metadata({**(arrow.schema.metadata or {}), **meta}), tmp))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Reconciled per part x country demand forecasts for the panel")
+    parser.add_argument('--panel', default=DEFAULT_PANEL_PATH, help="panel CSV or Parquet (file or partition directory)")
+    parser.add_argument('--method', default='holt', choices=METHODS)
+    parser.add_argument('--reconcile', default='mint_diag', choices=RECONCILE)
+    parser.add_argument('--horizon', type=int, default=HORIZON)
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument('--chunk-series', type=int, default=CHUNK_SERIES)
+    parser.add_argument('--refit-all', action='store_true', help="ignore the cached per-series state")
+    parser.add_argument('--out', default=FORECAST_PATH)
+    args = parser.parse_args()
+
+    table, stats = forecast_demand(args.panel, args.method, args.reconcile, args.horizon, args.workers,
+                                   args.chunk_series, use_state=not args.refit_all)
+    write_forecast(table, stats, args.out)
+    fit_rate = f"{stats['fit_series_per_s']:,.0f} series/s" if stats['fit_series_per_s'] else "nothing to refit"
+    print(f"✅ {stats['series']:,} series ({stats['bottom_series']:,} part x country + aggregates) x {stats['horizon']} months -> {args.out}")
+    print(f"   {args.method}: refit {stats['refit']:,}, reused {stats['reused']:,} in {stats['fit_seconds']:.2f}s ({fit_rate}); "
+          f"{args.reconcile} end to end {stats['total_seconds']:.2f}s ({stats['series_per_s']:,.0f} series/s)")
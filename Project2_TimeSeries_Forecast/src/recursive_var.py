@@ -0,0 +1,167 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from var_artifacts import ARTIFACT_DIR, DEFAULT_DATA_PATH, DEFAULT_LAGS, DEFAULT_STEPS, DEFAULT_IRF_HORIZON, load_var_frame, resolve_spec
+from var_core import lag_matrix, fit_var, orth_irfs, simulate
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# 🔁 Recursive (Online) VAR Estimation
+# ==========================================
+# Recursive least squares on the VAR(p) regression y_t = B' z_t + u_t, z_t = [1, y_{t-1}, ..., y_{t-p}].
+# The state keeps P = (Z'Z)^-1, B, Z'Y and Y'Y, so a new month is a Sherman-Morrison rank-one update
+# (O(m^2), m = 1 + k*p) instead of a refit, and the residual covariance is Y'Y - B'Z'Y without touching
+# past rows. With forgetting < 1, past rows are down-weighted by lambda^age (effective sample sum of
+# weights). Intramonth FX marks revise the latest (provisional) month with a downdate + update.
+# With forgetting = 1 the state equals a batch statsmodels fit on the same rows.
+
+STATE_PATH = os.path.join(ARTIFACT_DIR, 'var_rls_state.npz')
+
+
+def init_state(data, lags=DEFAULT_LAGS, forgetting=1.0, columns=None):
+    # Batch start on the first rows (needs more than 1 + k*p observations after the lags)
+    data = np.asarray(data, dtype=np.float64)
+    Z, Y = lag_matrix(data, lags)
+    fit = fit_var(data, lags)
+    return {
+        'columns': list(columns) if columns is not None else [f"y{i}" for i in range(data.shape[1])],
+        'lags': lags,
+        'forgetting': float(forgetting),
+        'P': np.linalg.inv(Z.T @ Z),
+        'B': np.vstack([fit['intercept'][None, :], np.swapaxes(fit['coefs'], 1, 2).reshape(-1, data.shape[1])]),
+        'ZtY': Z.T @ Y,
+        'YtY': Y.T @ Y,
+        'weight': float(len(Y)),            # sum of row weights (n without forgetting)
+        'window': data[-lags:].copy(),      # last p levels, oldest first
+        'last_z': Z[-1].copy(),             # regressor of the latest row (for revisions)
+        # Unweighted running moments for shock scaling (matches pandas std, ddof=1)
+        'n_obs': len(data), 'sum': data.sum(axis=0), 'sumsq': (data ** 2).sum(axis=0),
+    }
+
+
+def _regressor(window):
+    return np.concatenate([[1.0], window[::-1].ravel()])
+
+
+def _rank_one(state, z, y, sign):
+    # sign=+1 adds the row (z, y) with weight 1, sign=-1 removes it (downdate)
+    P, B = state['P'], state['B']
+    Pz = P @ z
+    denom = 1.0 + sign * (z @ Pz)
+    gain = Pz / denom
+    state['B'] = B + sign * np.outer(gain, y - z @ B)
+    state['P'] = P - sign * np.outer(gain, Pz)
+    state['ZtY'] = state['ZtY'] + sign * np.outer(z, y)
+    state['YtY'] = state['YtY'] + sign * np.outer(y, y)
+    state['weight'] += sign
+
+
+def update(state, y):
+    # One new observation (k,) -> O(m^2) coefficient/covariance refresh, in place
+    y = np.asarray(y, dtype=np.float64)
+    lam = state['forgetting']
+    if lam < 1.0:
+        state['P'] = state['P'] / lam
+        for key in ('ZtY', 'YtY'):
+            state[key] = state[key] * lam
+        state['weight'] *= lam
+    z = _regressor(state['window'])
+    _rank_one(state, z, y, +1)
+    state['window'] = np.vstack([state['window'][1:], y])
+    state['last_z'] = z
+    state['n_obs'] += 1
+    state['sum'] = state['sum'] + y
+    state['sumsq'] = state['sumsq'] + y ** 2
+    return state
+
+
+def revise_last(state, y):
+    # Replace the latest (provisional) observation, e.g. when a new daily FX mark arrives intramonth
+    y = np.asarray(y, dtype=np.float64)
+    old = state['window'][-1].copy()
+    z = state['last_z']
+    _rank_one(state, z, old, -1)
+    _rank_one(state, z, y, +1)
+    state['window'][-1] = y
+    state['sum'] = state['sum'] - old + y
+    state['sumsq'] = state['sumsq'] - old ** 2 + y ** 2
+    return state
+
+
+def params(state):
+    k, lags = len(state['columns']), state['lags']
+    B = state['B']
+    coefs = np.swapaxes(B[1:].reshape(lags, k, k), 1, 2)
+    rss = state['YtY'] - state['ZtY'].T @ B
+    sigma_u = (rss + rss.T) / 2 / (state['weight'] - B.shape[0])
+    return B[0], coefs, sigma_u
+
+
+def snapshot(state, steps=DEFAULT_STEPS, irf_horizon=DEFAULT_IRF_HORIZON):
+    # Artifact-shaped dict (same keys page 3 reads from get_var_artifact) from the current state
+    intercept, coefs, sigma_u = params(state)
+    k = len(state['columns'])
+    path = simulate(intercept, coefs, state['window'], np.zeros((steps, k)))
+    n = state['n_obs']
+    variance = (state['sumsq'] - state['sum'] ** 2 / n) / (n - 1)
+    return {
+        'columns': np.array(state['columns'], dtype=str),
+        'k_ar': np.array(state['lags']),
+        'intercept': intercept,
+        'coefs': coefs,
+        'sigma_u': sigma_u,
+        'forecast': path[state['lags']:],
+        'orth_irfs': orth_irfs(coefs, sigma_u, irf_horizon),
+        'last_obs': state['window'].copy(),
+        'series_std': np.sqrt(variance),
+    }
+
+
+# ==========================================
+# 💾 State persistence
+# ==========================================
+def save_state(state, path=STATE_PATH):
+    arrays = {key: np.asarray(value) for key, value in state.items()}
+    atomic_write(path, lambda f: np.savez(f, **arrays), mode='wb')
+
+
+def load_state(path=STATE_PATH):
+    with np.load(path, allow_pickle=False) as npz:
+        state = {name: npz[name] for name in npz.files}
+    state['columns'] = [str(c) for c in state['columns']]
+    for key in ('lags', 'n_obs'):
+        state[key] = int(state[key])
+    for key in ('forgetting', 'weight'):
+        state[key] = float(state[key])
+    return state
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Online VAR: initialize from history, then feed new months")
+    parser.add_argument('--init', action='store_true', help="(re)initialize the state from the full history CSV")
+    parser.add_argument('--forgetting', type=float, default=1.0, help="exponential forgetting factor (1 = none)")
+    parser.add_argument('--append', help="CSV of new monthly rows (Date + VAR columns) to feed in order")
+    parser.add_argument('--revise', help="CSV with one row replacing the latest provisional month")
+    args = parser.parse_args()
+
+    if args.init or not os.path.exists(STATE_PATH):
+        lags, columns = resolve_spec(DEFAULT_DATA_PATH)
+        df = load_var_frame(DEFAULT_DATA_PATH, columns)
+        state = init_state(df.values, lags, forgetting=args.forgetting, columns=df.columns)
+    else:
+        state = load_state()
+    if args.append:
+        for row in pd.read_csv(args.append)[state['columns']].to_numpy(dtype=np.float64):
+            update(state, row)
+    if args.revise:
+        revise_last(state, pd.read_csv(args.revise)[state['columns']].to_numpy(dtype=np.float64)[-1])
+    save_state(state)
+
+    art = snapshot(state)
+    print(f"✅ Online VAR state ({state['n_obs']} obs, forgetting={state['forgetting']}) -> {STATE_PATH}")
+    print(pd.DataFrame(art['forecast'][:6], columns=state['columns']).round(2).to_string())
@@ -0,0 +1,162 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# 📦 Fitted-VAR Artifact Store (Disk + In-Process Memory)
+# ==========================================
+# The dashboard (page 3) and generate_report_charts.py used to refit the same VAR from scratch.
+# Here the fit happens once per (data fingerprint, lag order, horizons): coefficients, residual
+# covariance, forecast and orthogonalized IRFs are written to an .npz artifact and kept in memory,
+# so slider interactions only rescale cached arrays. Lag order and variable set default to the
+# specification persisted by var_selection.py (var_spec.json) while it matches the data file.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_PATH = os.path.join(base_dir, '..', 'data', 'var_macro_data.csv')
+ARTIFACT_DIR = os.path.join(base_dir, '..', 'artifacts')
+ARTIFACT_VERSION = 1
+SPEC_PATH = os.path.join(ARTIFACT_DIR, 'var_spec.json')
+
+DEFAULT_LAGS = 2
+DEFAULT_STEPS = 24      # 2-year forecast
+DEFAULT_IRF_HORIZON = 12
+
+_lock = threading.Lock()
+_memory = {}
+_fingerprints = {}
+
+
+def file_fingerprint(path):
+    # Content hash (SHA-256) of the data file; memoized on (mtime, size) so reruns don't re-hash.
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _fingerprints.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    digest = h.hexdigest()
+    _fingerprints[path] = (stamp, digest)
+    return digest
+
+
+def load_var_frame(path=DEFAULT_DATA_PATH, columns=None):
+    df = pd.read_csv(path)
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.set_index('Date')
+    return df if columns is None else df[list(columns)]
+
+
+def load_var_spec(path=DEFAULT_DATA_PATH):
+    # Winning specification from var_selection.py; ignored once the data file changed
+    if not os.path.exists(SPEC_PATH):
+        return None
+    with open(SPEC_PATH) as f:
+        spec = json.load(f)
+    return spec if spec.get('fingerprint') == file_fingerprint(path) else None
+
+
+def resolve_spec(path=DEFAULT_DATA_PATH, lags=None, columns=None):
+    # Explicit arguments win; otherwise the persisted spec; otherwise DEFAULT_LAGS on every column
+    spec = load_var_spec(path) if lags is None or columns is None else None
+    if lags is None:
+        lags = spec['lags'] if spec else DEFAULT_LAGS
+    if columns is None and spec:
+        columns = spec['columns']
+    return int(lags), (None if columns is None else tuple(columns))
+
+
+def columns_tag(columns):
+    # Short filename tag for a variable subset ('' = all columns)
+    return '' if columns is None else '_c' + hashlib.sha256(','.join(columns).encode()).hexdigest()[:8]
+
+
+def _fit(df, lags, steps, irf_horizon):
+    from statsmodels.tsa.api import VAR
+
+    fitted = VAR(df).fit(lags)
+    irf = fitted.irf(irf_horizon)
+    forecast = fitted.forecast(df.values[-fitted.k_ar:], steps=steps)
+
+    return {
+        'columns': np.array(df.columns, dtype=str),
+        'k_ar': np.array(fitted.k_ar),
+        'intercept': np.asarray(fitted.intercept),
+        'coefs': np.asarray(fitted.coefs),             # (k_ar, k, k)
+        'sigma_u': np.asarray(fitted.sigma_u),         # residual covariance
+        'resid': np.asarray(fitted.resid),
+        'forecast': np.asarray(forecast),              # (steps, k)
+        'orth_irfs': np.asarray(irf.orth_irfs),        # (horizon+1, k, k)
+        'orth_stderr': np.asarray(irf.stderr(orth=True)),  # asymptotic SEs
+        'last_obs': df.values[-fitted.k_ar:],
+        'last_date': np.array(str(df.index[-1].date())),
+        'series_std': df.std().values,                 # pandas ddof=1, used for shock scaling
+    }
+
+
+def _artifact_path(fingerprint, lags, steps, irf_horizon, columns):
+    fname = f"var_{fingerprint[:16]}_lag{lags}_s{steps}_h{irf_horizon}{columns_tag(columns)}_v{ARTIFACT_VERSION}.npz"
+    return os.path.join(ARTIFACT_DIR, fname)
+
+
+def freeze_arrays(artifact):
+    # Cached arrays are shared by every caller in the process, so make accidental in-place edits fail loudly
+    for arr in artifact.values():
+        arr.flags.writeable = False
+    return artifact
+
+
+def get_var_artifact(path=DEFAULT_DATA_PATH, lags=None, steps=DEFAULT_STEPS, irf_horizon=DEFAULT_IRF_HORIZON, columns=None):
+    fingerprint = file_fingerprint(path)
+    lags, columns = resolve_spec(path, lags, columns)
+    key = (fingerprint, lags, steps, irf_horizon, columns)
+
+    with _lock:
+        if key in _memory:
+            return _memory[key]
+
+        art_path = _artifact_path(*key)
+        if os.path.exists(art_path):
+            with np.load(art_path, allow_pickle=False) as npz:
+                artifact = {name: npz[name] for name in npz.files}
+        else:
+            artifact = _fit(load_var_frame(path, columns), lags, steps, irf_horizon)
+            atomic_write(art_path, lambda f: np.savez(f, **artifact), mode='wb')
+
+        _memory[key] = freeze_arrays(artifact)
+        return _memory[key]
+
+
+def column_index(artifact, name):
+    return list(artifact['columns']).index(name)
+
+
+def shock_scale(artifact, impulse, shock):
+    # Multiplier on the 1-SD orthogonalized impulse for a shock of `shock` units of the impulse series
+    # (series SD). IRF chart, bootstrap bands, profit-at-risk and scenario engine all scale through here,
+    # so one slider value means the same shock everywhere.
+    return np.asarray(shock, dtype=np.float64) / artifact['series_std'][column_index(artifact, impulse)]
+
+
+def scaled_irf(artifact, impulse, response, shock):
+    # Orthogonalized IRF is per 1-SD shock; rescale to a shock of `shock` units of the impulse series
+    i = column_index(artifact, impulse)
+    r = column_index(artifact, response)
+    return artifact['orth_irfs'][:, r, i] * shock_scale(artifact, impulse, shock)
+
+
+if __name__ == '__main__':
+    art = get_var_artifact()
+    print(f"✅ VAR artifact ready (lag={int(art['k_ar'])}, vars={list(art['columns'])}) -> {ARTIFACT_DIR}")
@@ -0,0 +1,77 @@
+import numpy as np
+
+# ==========================================
+# 🧮 VAR Linear Algebra Core (batched numpy, no statsmodels)
+# ==========================================
+# Lag design matrices, OLS fits and companion-matrix impulse responses for VAR(p) with a constant.
+# Every function accepts an optional leading batch axis (replicates / candidate models), so many VARs
+# are fitted and their IRFs computed in a few stacked matmuls. Layouts follow statsmodels:
+# coefs[l, i, j] is the effect of y_j at lag l+1 on y_i; sigma_u uses the df_resid = T - k*p - 1 divisor.
+
+
+def lag_matrix(data, lags):
+    # data (..., T, k) -> Z (..., T-p, 1 + k*p) = [1, y_{t-1}, ..., y_{t-p}],  Y (..., T-p, k)
+    data = np.asarray(data, dtype=np.float64)
+    n_obs = data.shape[-2]
+    blocks = [data[..., lags - lag:n_obs - lag, :] for lag in range(1, lags + 1)]
+    ones = np.ones(data.shape[:-2] + (n_obs - lags, 1))
+    return np.concatenate([ones] + blocks, axis=-1), data[..., lags:, :]
+
+
+def ols(Z, Y):
+    # Batched normal equations; B (..., 1 + k*p, k)
+    ZtZ = np.swapaxes(Z, -1, -2) @ Z
+    ZtY = np.swapaxes(Z, -1, -2) @ Y
+    return np.linalg.solve(ZtZ, ZtY)
+
+
+def split_params(B, k, lags):
+    # B -> intercept (..., k), coefs (..., p, k, k)
+    intercept = B[..., 0, :]
+    coefs = B[..., 1:, :].reshape(B.shape[:-2] + (lags, k, k))
+    return intercept, np.swapaxes(coefs, -1, -2)
+
+
+def residual_cov(resid, n_params):
+    dof = resid.shape[-2] - n_params
+    return np.swapaxes(resid, -1, -2) @ resid / dof
+
+
+def fit_var(data, lags):
+    # Full VAR(p) fit; works on one series (T, k) or a batch (R, T, k)
+    Z, Y = lag_matrix(data, lags)
+    B = ols(Z, Y)
+    resid = Y - Z @ B
+    intercept, coefs = split_params(B, Y.shape[-1], lags)
+    return {'intercept': intercept, 'coefs': coefs, 'sigma_u': residual_cov(resid, Z.shape[-1]), 'resid': resid}
+
+
+def ma_coefs(coefs, horizon):
+    # MA(infinity) matrices Phi_0..Phi_h from the companion recursion Phi_i = sum_l Phi_{i-l} A_l
+    lags, k = coefs.shape[-3], coefs.shape[-1]
+    batch = coefs.shape[:-3]
+    phi = np.zeros(batch + (horizon + 1, k, k))
+    phi[..., 0, :, :] = np.eye(k)
+    for i in range(1, horizon + 1):
+        for lag in range(1, min(i, lags) + 1):
+            phi[..., i, :, :] += phi[..., i - lag, :, :] @ coefs[..., lag - 1, :, :]
+    return phi
+
+
+def orth_irfs(coefs, sigma_u, horizon):
+    # Orthogonalized (Cholesky) IRFs: Phi_i P with P P' = Sigma_u -> (..., horizon+1, k, k)
+    chol = np.linalg.cholesky(sigma_u)
+    return ma_coefs(coefs, horizon) @ chol[..., None, :, :]
+
+
+def simulate(intercept, coefs, init, shocks):
+    # Recursive VAR paths from `init` (..., p, k) driven by shocks (..., n, k) -> (..., p + n, k)
+    lags = coefs.shape[-3]
+    n = shocks.shape[-2]
+    out = np.concatenate([np.broadcast_to(init, shocks.shape[:-2] + init.shape[-2:]), np.zeros_like(shocks)], axis=-2)
+    for t in range(lags, lags + n):
+        y = intercept + shocks[..., t - lags, :]
+        for lag in range(1, lags + 1):
+            y = y + np.einsum('...ij,...j->...i', coefs[..., lag - 1, :, :], out[..., t - lag, :])
+        out[..., t, :] = y
+    return out
@@ -0,0 +1,164 @@
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from var_artifacts import DEFAULT_DATA_PATH, SPEC_PATH, file_fingerprint, load_var_frame
+from var_core import lag_matrix, simulate
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# 🔎 VAR Lag-Order & Variable-Set Selection
+# ==========================================
+# Grid over lag orders 1..max_lags and every variable subset that contains the required series.
+# One lagged design for (all variables, max_lags) is built once, and its Gram matrices Z'Z, Z'Y, Y'Y
+# (plus running Gram sums for the rolling-origin backtest) are shared: a candidate fit is an index
+# slice of those matrices and a small solve, never a pass over the data. Information criteria use the
+# common sample t >= max_lags (as statsmodels select_order); since they are not comparable across
+# variable sets, each subset takes its IC-best lag and subsets are ranked by out-of-sample RMSE on the
+# target series. The winner goes to var_spec.json, which var_artifacts picks up automatically.
+
+DEFAULT_MAX_LAGS = 6
+DEFAULT_REQUIRED = ('KRW_USD', 'Steel_Index')   # page 3 impulse / response
+DEFAULT_TARGETS = ('Steel_Index',)
+DEFAULT_IC = 'bic'
+DEFAULT_TEST_ORIGINS = 12
+DEFAULT_OOS_HORIZON = 6
+
+_shared = {}
+
+
+def design(data, max_lags, test_origins, oos_horizon):
+    # Everything candidates need, computed once
+    Z, Y = lag_matrix(data, max_lags)
+    outer = Z[:, :, None] * Z[:, None, :]
+    cross = Z[:, :, None] * Y[:, None, :]
+    first_origin = len(data) - test_origins - oos_horizon + 1
+    origins = np.arange(first_origin, first_origin + test_origins)
+    # Running sums over regression rows: training for origin o uses rows t < o, i.e. Z rows < o - max_lags
+    cum_zz = np.concatenate([np.zeros((1,) + outer.shape[1:]), np.cumsum(outer, axis=0)])
+    cum_zy = np.concatenate([np.zeros((1,) + cross.shape[1:]), np.cumsum(cross, axis=0)])
+    return {'data': data, 'max_lags': max_lags, 'ZtZ': Z.T @ Z, 'ZtY': Z.T @ Y, 'YtY': Y.T @ Y, 'nobs': len(Y),
+            'train_zz': cum_zz[origins - max_lags], 'train_zy': cum_zy[origins - max_lags],
+            'windows': data[origins[:, None] + np.arange(-max_lags, oos_horizon)],  # (origins, max_lags + h, k)
+            'origins': origins, 'min_train_rows': int(origins[0] - max_lags), 'oos_horizon': oos_horizon, 'scale': data.std(axis=0, ddof=1)}
+
+
+def _design_index(subset, lags, k_all):
+    return np.array([0] + [1 + (lag - 1) * k_all + j for lag in range(1, lags + 1) for j in subset])
+
+
+def _coefs(B, n_vars, lags):
+    return np.swapaxes(B[..., 1:, :].reshape(B.shape[:-2] + (lags, n_vars, n_vars)), -1, -2)
+
+
+def evaluate(shared, subset, lags, targets):
+    # subset / targets are column positions in the full data matrix
+    subset = np.asarray(subset)
+    k_all = shared['data'].shape[1]
+    idx = _design_index(subset, lags, k_all)
+    n_vars, nobs = len(subset), shared['nobs']
+    if len(idx) >= shared['min_train_rows']:
+        # More regressors per equation than the shortest backtest window: not identified
+        return {'aic': np.nan, 'bic': np.nan, 'hqic': np.nan, 'oos_rmse': np.nan}
+
+    # In-sample fit on the common sample: all from the shared Gram matrices
+    ZtZ = shared['ZtZ'][np.ix_(idx, idx)]
+    ZtY = shared['ZtY'][np.ix_(idx, subset)]
+    B = np.linalg.solve(ZtZ, ZtY)
+    rss = shared['YtY'][np.ix_(subset, subset)] - ZtY.T @ B
+    _, logdet = np.linalg.slogdet(rss / nobs)
+    free = lags * n_vars ** 2 + n_vars
+    ic = {'aic': logdet + 2.0 / nobs * free, 'bic': logdet + np.log(nobs) / nobs * free,
+          'hqic': logdet + 2.0 * np.log(np.log(nobs)) / nobs * free}
+
+    # Rolling-origin backtest: one batched solve over all origins, one batched recursive forecast
+    B_o = np.linalg.solve(shared['train_zz'][:, idx][:, :, idx], shared['train_zy'][:, idx][:, :, subset])
+    windows, p_max, h = shared['windows'][:, :, subset], shared['max_lags'], shared['oos_horizon']
+    init, actual = windows[:, p_max - lags:p_max], windows[:, p_max:]
+    paths = simulate(B_o[:, 0, :], _coefs(B_o, n_vars, lags), init, np.zeros((len(init), h, n_vars)))[:, lags:]
+    target_pos = [list(subset).index(t) for t in targets]
+    err = (paths[..., target_pos] - actual[..., target_pos]) / shared['scale'][subset][target_pos]
+    return {**ic, 'oos_rmse': float(np.sqrt(np.mean(err ** 2)))}
+
+
+def candidates(columns, required, max_lags, min_vars=2):
+    optional = [c for c in columns if c not in required]
+    for r in range(len(optional) + 1):
+        for extra in itertools.combinations(optional, r):
+            names = [c for c in columns if c in required or c in extra]
+            if len(names) >= min_vars:
+                for lags in range(1, max_lags + 1):
+                    yield names, lags
+
+
+def _init_worker(shared):
+    _shared.update(shared)
+
+
+def _evaluate_chunk(chunk, columns, targets):
+    rows = []
+    for names, lags in chunk:
+        subset = [columns.index(c) for c in names]
+        rows.append({'columns': names, 'lags': lags, **evaluate(_shared, subset, lags, [columns.index(t) for t in targets])})
+    return rows
+
+
+def select_var(df, max_lags=DEFAULT_MAX_LAGS, required=DEFAULT_REQUIRED, targets=DEFAULT_TARGETS, ic=DEFAULT_IC,
+               test_origins=DEFAULT_TEST_ORIGINS, oos_horizon=DEFAULT_OOS_HORIZON, workers=1, chunk_size=256):
+    columns = list(df.columns)
+    shared = design(df.to_numpy(dtype=np.float64), max_lags, test_origins, oos_horizon)
+    grid = list(candidates(columns, required, max_lags))
+    chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+    targets = list(targets)
+
+    if workers <= 1:
+        _init_worker(shared)
+        rows = [row for chunk in chunks for row in _evaluate_chunk(chunk, columns, targets)]
+    else:
+        # Shared design goes to each worker once (initializer), tasks only carry candidate lists
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as executor:
+            rows = [row for part in executor.map(_evaluate_chunk, chunks, [columns] * len(chunks), [targets] * len(chunks)) for row in part]
+
+    results = pd.DataFrame(rows)
+    results['variables'] = results['columns'].map(','.join)
+    # IC picks the lag within each variable set; out-of-sample error picks the set
+    per_set = results.loc[results.groupby('variables')[ic].idxmin()]
+    best = per_set.sort_values(['oos_rmse', 'lags']).iloc[0]
+    return results, best
+
+
+def save_spec(best, path, ic, n_candidates):
+    spec = {'fingerprint': file_fingerprint(path), 'columns': list(best['columns']), 'lags': int(best['lags']),
+            'criterion': f"{ic} lag within set, out-of-sample RMSE across sets", 'n_candidates': n_candidates,
+            'scores': {k: float(best[k]) for k in ('aic', 'bic', 'hqic', 'oos_rmse')}}
+    atomic_write(SPEC_PATH, lambda f: json.dump(spec, f, indent=2), mode='w')
+    return spec
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Select VAR lag order and variable set; persist var_spec.json")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH)
+    parser.add_argument('--max-lags', type=int, default=DEFAULT_MAX_LAGS)
+    parser.add_argument('--ic', default=DEFAULT_IC, choices=['aic', 'bic', 'hqic'])
+    parser.add_argument('--required', nargs='+', default=list(DEFAULT_REQUIRED))
+    parser.add_argument('--targets', nargs='+', default=list(DEFAULT_TARGETS))
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--dry-run', action='store_true', help="print the ranking without writing var_spec.json")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results, best = select_var(load_var_frame(args.data), max_lags=args.max_lags, required=args.required,
+                               targets=args.targets, ic=args.ic, workers=args.workers)
+    print(f"✅ {len(results):,} candidate VARs evaluated in {time.perf_counter() - start:.2f}s")
+    print(results.sort_values('oos_rmse')[['variables', 'lags', 'aic', 'bic', 'hqic', 'oos_rmse']].head(10).to_string(index=False))
+    if not args.dry_run:
+        spec = save_spec(best, args.data, args.ic, len(results))
+        print(f"✅ Selected {spec['columns']} lag={spec['lags']} -> {SPEC_PATH}")
@@ -1,13 +1,16 @@
-import pandas as pd
 import numpy as np
-import wbgapi as wb
 import os
+import sys
+import argparse
 
-print("Fetching Real Data from World Bank API (wbgapi)...")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from synthetic_data import synthesize_market_pricing
+from pipeline_utils import atomic_write
+from wb_fetcher import sync, load_panel, latest_values, DEFAULT_TTL, MAX_WORKERS
 
 # We want roughly ~50 diverse countries. Using major economies and emerging markets.
 country_codes = [
-    'USA', 'CHN', 'JPN', 'DEU', 'GBR', 'IND', 'FRA', 'ITA', 'CAN', 'KOR', 
+    'USA', 'CHN', 'JPN', 'DEU', 'GBR', 'IND', 'FRA', 'ITA', 'CAN', 'KOR',
     'RUS', 'BRA', 'AUS', 'ESP', 'MEX', 'IDN', 'NLD', 'SAU', 'TUR', 'CHE',
     'POL', 'SWE', 'BEL', 'ARG', 'THA', 'AUT', 'IRN', 'ARE', 'ZAF', 'DNK',
     'VNM', 'PHL', 'CHL', 'ROU', 'CZE', 'PRT', 'NZL', 'PER', 'GRC', 'KAZ',
@@ -22,60 +25,46 @@ indicators = {
     'FP.CPI.TOTL.ZG': 'Inflation_Rate'
 }
 
-try:
-    # Fetch most recent usable year (e.g., 2022)
-    df_wb = wb.data.DataFrame(indicators.keys(), country_codes, time=2022, skipBlanks=True, columns='series')
-    df_wb = df_wb.rename(columns=indicators)
-    df_wb = df_wb.reset_index()
-    df_wb.rename(columns={'economy': 'Country_Code'}, inplace=True)
-    
-    # Fill remaining NaNs if any (mean imputation per column for simplicity of the cluster)
-    df_wb['GDP_Per_Capita'] = df_wb['GDP_Per_Capita'].fillna(df_wb['GDP_Per_Capita'].mean())
-    df_wb['Inflation_Rate'] = df_wb['Inflation_Rate'].fillna(df_wb['Inflation_Rate'].mean())
-    
-    # We still need a "Part Price" to cluster and analyze pricing anomaly. 
-    # Let's synthesize Pricing strategy that somewhat correlates with GDP but with intentional anomalies
-    np.random.seed(42)
-    
-    prices = []
-    vols = []
-    
-    for _, row in df_wb.iterrows():
-        gdp = row['GDP_Per_Capita']
-        inf = row['Inflation_Rate']
-        
-        # Base pricing formula: Richer countries get charged slightly more. (10% of log GDP scaled)
-        base_price = 50 + (np.log(gdp) * 5)
-        
-        # Introduce "Mispriced" Anomalies for Interview Storytelling
-        # 1. 5% chance of being heavily underpriced (Rich country, cheap parts) -> Opportunity!
-        # 2. 5% chance of being heavily overpriced (Poor country, expensive parts) -> Risk!
-        anomaly = np.random.rand()
-        
-        if anomaly < 0.05:
-            price_usd = base_price * 0.6  # Underpriced!
-        elif anomaly > 0.95:
-            price_usd = base_price * 1.5  # Overpriced!
-        else:
-            price_usd = base_price + np.random.normal(0, 5) # Normal pricing
-            
-        prices.append(round(price_usd, 2))
-        
-        # Volume is inversely related to price, positively related to GDP
-        vol = 1000 * np.log(gdp) - (price_usd * 10) + np.random.normal(0, 500)
-        vols.append(max(100, int(vol)))
-        
-    df_wb['Avg_Part_Price_USD'] = prices
-    df_wb['Annual_Sales_Volume'] = vols
-    
-    output_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-    os.makedirs(output_dir, exist_ok=True)
-    csv_path = os.path.join(output_dir, 'worldbank_market_data.csv')
-    df_wb.to_csv(csv_path, index=False)
-    
-    print(f"✅ Successfully Fetched World Bank API Data ({len(df_wb)} countries) -> {csv_path}")
-    print(df_wb.head())
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the World Bank market table (cached, incremental fetch)")
+    parser.add_argument('--year', type=int, default=2022, help="snapshot year (latest earlier value fills gaps)")
+    parser.add_argument('--history', type=int, default=8, help="years of history kept in the cache")
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL, help="seconds before cached cells are revalidated")
+    parser.add_argument('--refresh', action='store_true', help="revalidate every cached cell")
+    parser.add_argument('--offline', action='store_true', help="build from the cache only")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
 
-except Exception as e:
-    print("Error fetching World Bank API:", e)
-    # Fallback generation logic omitted for brevity, but script shouldn't fail normally.
+    years = list(range(args.year - args.history + 1, args.year + 1))
+    print(f"Fetching World Bank API data ({len(indicators)} indicators x {len(years)} years, missing/stale cells only)...")
+    report = sync(list(indicators), years, country_codes, ttl=args.ttl, refresh=args.refresh, workers=args.workers, offline=args.offline)
+    print(f"   cache: {report['fresh']} fresh, {report['fetched']} fetched, {report['revalidated']} revalidated, "
+          f"{report['stale_fallback']} stale (offline fallback), {len(report['failed'])} unavailable")
+
+    try:
+        # Snapshot: the requested year, else the latest earlier value per country
+        snapshot = latest_values(load_panel(list(indicators), years, country_codes), args.year)
+        df_wb = snapshot.rename(columns=indicators).reindex(columns=['Inflation_Rate', 'GDP_Per_Capita'])
+        df_wb = df_wb.rename_axis(index='Country_Code', columns=None).reset_index()
+        if df_wb.empty or df_wb['GDP_Per_Capita'].isna().all():
+            raise RuntimeError("no World Bank data in the cache and the API is unreachable")
+
+        # Fill remaining NaNs if any (mean imputation per column for simplicity of the cluster)
+        df_wb['GDP_Per_Capita'] = df_wb['GDP_Per_Capita'].fillna(df_wb['GDP_Per_Capita'].mean())
+        df_wb['Inflation_Rate'] = df_wb['Inflation_Rate'].fillna(df_wb['Inflation_Rate'].mean())
+
+        # We still need a "Part Price" to cluster and analyze pricing anomaly.
+        # Let's synthesize Pricing strategy that somewhat correlates with GDP but with intentional anomalies
+        # Vectorized: one draw per column instead of per-row np.random calls
+        rng = np.random.default_rng(42)
+        df_wb['Avg_Part_Price_USD'], df_wb['Annual_Sales_Volume'] = synthesize_market_pricing(df_wb['GDP_Per_Capita'].values, rng)
+
+        csv_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'worldbank_market_data.csv')
+        atomic_write(csv_path, lambda tmp: df_wb.to_csv(tmp, index=False))
+
+        print(f"✅ Successfully Fetched World Bank API Data ({len(df_wb)} countries) -> {csv_path}")
+        print(df_wb.head())
+
+    except Exception as e:
+        # The existing CSV is left untouched, so the dashboard keeps its last good table
+        print("Error fetching World Bank API:", e)
@@ -0,0 +1,318 @@
+import os
+import sys
+import glob
+import time
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# 🧭 Market Segmentation Engine (mini-batch K-Means, streamed, persisted)
+# ==========================================
+# Segments markets (countries, or dealers / regions at larger scale factors) on log GDP per capita,
+# inflation, part price and log sales volume. The source is streamed in chunks (CSV, Parquet file or a
+# partitioned directory from synthetic_data.py) and never held in memory whole:
+#   pass 1  running mean / variance for the scaler + a fixed-size uniform sample (bottom-k keys)
+#   select  every k in the grid is fitted on the sample in parallel and scored by silhouette
+#   pass 2  the winning centroids are refined with mini-batch updates (partial_fit) over the stream
+# Centroids, per-centroid counts and scaler moments go to artifacts/market_segments.npz. assign()
+# labels new markets against them without refitting; partial_fit() folds new markets into the
+# centroids (per-centre learning rate 1 / count, as in Sculley's web-scale K-Means).
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(base_dir, '..', 'data', 'global_market_mock.csv')
+ARTIFACT_DIR = os.path.join(base_dir, '..', 'artifacts')
+MODEL_PATH = os.path.join(ARTIFACT_DIR, 'market_segments.npz')
+
+# Both market tables (synthetic markets and World Bank) map onto one set of column names
+ALIASES = {'Country_ID': 'Country_Code', 'GDP_Per_Capita_USD': 'GDP_Per_Capita', 'Inflation_Rate_%': 'Inflation_Rate'}
+RAW_COLUMNS = ['GDP_Per_Capita', 'Inflation_Rate', 'Avg_Part_Price_USD', 'Annual_Sales_Volume']
+FEATURES = ['Log_GDP', 'Inflation_Rate', 'Avg_Part_Price_USD', 'Log_Volume']
+
+K_GRID = range(2, 9)
+CHUNK_ROWS = 100_000        # rows read from the source at a time
+BATCH_ROWS = 4096           # rows per mini-batch update
+SAMPLE_ROWS = 20_000        # uniform sample the k grid is fitted on
+SILHOUETTE_ROWS = 3000      # silhouette is O(n^2), so it is scored on a sub-sample
+SAMPLE_EPOCHS = 10          # mini-batch passes over the sample per candidate k
+SEED = 42
+
+_lock = threading.Lock()
+_memory = {}
+_shared = {}
+
+
+def file_fingerprint(path):
+    # (size, mtime_ns) of a file, or of every part file of a partitioned directory
+    files = _source_files(path)
+    return ';'.join(f"{os.path.basename(f)}:{os.path.getsize(f)}:{os.stat(f).st_mtime_ns}" for f in files)
+
+
+def _source_files(path):
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, 'part-*')))
+    return [path]
+
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS, columns=None):
+    # Raw market rows in source order, `chunk_rows` at a time, only the columns asked for (names after ALIASES)
+    wanted = set(columns or RAW_COLUMNS + ['Country_Code'])
+    wanted |= {raw for raw, name in ALIASES.items() if name in wanted}
+    for part in _source_files(path):
+        if part.endswith('.csv'):
+            for chunk in pd.read_csv(part, chunksize=chunk_rows, usecols=lambda c: c in wanted):
+                yield chunk.rename(columns=ALIASES)
+        else:
+            pf = pq.ParquetFile(part)
+            columns = [c for c in pf.schema_arrow.names if c in wanted]
+            for batch in pf.iter_batches(batch_size=chunk_rows, columns=columns):
+                yield batch.to_pandas().rename(columns=ALIASES)
+
+
+def feature_matrix(df):
+    # -> (X float64 (n, len(FEATURES)), valid row mask); rows with a missing / non-positive input are invalid
+    df = df.rename(columns=ALIASES)
+    raw = df[RAW_COLUMNS].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        X = np.column_stack([np.log10(raw[:, 0]), raw[:, 1], raw[:, 2], np.log10(np.maximum(raw[:, 3], 1))])
+    valid = np.isfinite(X).all(axis=1) & (raw[:, 0] > 0)
+    return X, valid
+
+
+def _sq_distances(X, centroids):
+    d = (X * X).sum(axis=1)[:, None] - 2.0 * X @ centroids.T + (centroids * centroids).sum(axis=1)[None, :]
+    return np.maximum(d, 0.0)
+
+
+def nearest(X, centroids):
+    # -> (labels, squared distance to the assigned centroid)
+    d = _sq_distances(X, centroids)
+    labels = d.argmin(axis=1)
+    return labels, d[np.arange(len(X)), labels]
+
+
+def kmeans_plus_plus(X, k, rng):
+    centroids = [X[rng.integers(len(X))]]
+    closest = _sq_distances(X, centroids[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        idx = rng.choice(len(X), p=closest / total) if total > 0 else rng.integers(len(X))
+        centroids.append(X[idx])
+        closest = np.minimum(closest, _sq_distances(X, X[idx][None, :])[:, 0])
+    return np.array(centroids)
+
+
+def minibatch_update(centroids, counts, X, batch_rows=BATCH_ROWS):
+    # In place: each centre moves toward the mean of its batch members with step b_j / (n_j + b_j)
+    k, d = centroids.shape
+    for start in range(0, len(X), batch_rows):
+        batch = X[start:start + batch_rows]
+        labels, dist = nearest(batch, centroids)
+        batch_counts = np.bincount(labels, minlength=k).astype(np.float64)
+        sums = np.column_stack([np.bincount(labels, weights=batch[:, j], minlength=k) for j in range(d)])
+        counts += batch_counts
+        hit = batch_counts > 0
+        centroids[hit] += (sums[hit] - batch_counts[hit, None] * centroids[hit]) / counts[hit, None]
+        # A centre nobody has ever picked is dead weight: restart it on the worst-served point
+        dead = np.flatnonzero(counts == 0)
+        if len(dead):
+            far = np.argsort(dist)[::-1][:len(dead)]
+            centroids[dead[:len(far)]] = batch[far]
+    return centroids, counts
+
+
+def silhouette(X, labels, block_rows=1024):
+    # Mean silhouette with Euclidean distances, computed in row blocks so memory stays O(block * n)
+    k = int(labels.max()) + 1
+    onehot = np.eye(k)[labels]
+    sizes = onehot.sum(axis=0)
+    scores = np.zeros(len(X))
+    for start in range(0, len(X), block_rows):
+        block, own = X[start:start + block_rows], labels[start:start + block_rows]
+        per_cluster = np.sqrt(_sq_distances(block, X)) @ onehot
+        rows = np.arange(len(block))
+        own_size = sizes[own]
+        a = np.where(own_size > 1, per_cluster[rows, own] / np.maximum(own_size - 1, 1), 0.0)
+        mean_other = per_cluster / np.where(sizes > 0, sizes, np.nan)
+        mean_other[rows, own] = np.inf
+        b = np.nanmin(np.where(sizes > 0, mean_other, np.inf), axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            s = (b - a) / np.maximum(a, b)
+        # Singletons score 0 (Rousseeuw's convention, as scikit-learn)
+        scores[start:start + len(block)] = np.where((own_size > 1) & np.isfinite(s), s, 0.0)
+    return float(scores.mean())
+
+
+def scan(path, chunk_rows=CHUNK_ROWS, sample_rows=SAMPLE_ROWS, seed=SEED):
+    # Pass 1: running moments (Chan et al. merge) and a uniform sample of raw features (smallest random keys)
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1,)))
+    n, mean, m2 = 0, np.zeros(len(FEATURES)), np.zeros(len(FEATURES))
+    sample, keys = np.empty((0, len(FEATURES))), np.empty(0)
+    for chunk in iter_chunks(path, chunk_rows):
+        X, valid = feature_matrix(chunk)
+        X = X[valid]
+        if len(X) == 0:
+            continue
+        b, b_mean = len(X), X.mean(axis=0)
+        delta = b_mean - mean
+        m2 += ((X - b_mean) ** 2).sum(axis=0) + delta ** 2 * n * b / (n + b)
+        mean += delta * b / (n + b)
+        n += b
+        sample, keys = np.vstack([sample, X]), np.concatenate([keys, rng.random(b)])
+        if len(keys) > sample_rows:
+            keep = np.argpartition(keys, sample_rows)[:sample_rows]
+            sample, keys = sample[keep], keys[keep]
+    if n < 2:
+        raise ValueError(f"not enough valid market rows in {path}")
+    scale = np.sqrt(m2 / n)
+    return {'n_rows': n, 'mean': mean, 'scale': np.where(scale > 0, scale, 1.0), 'sample': sample[np.argsort(keys)]}
+
+
+def _init_worker(shared):
+    _shared.update(shared)
+
+
+def fit_candidate(k, seed=SEED, epochs=SAMPLE_EPOCHS, batch_rows=BATCH_ROWS):
+    # One k on the shared (scaled) sample; seeded per k so results don't depend on worker scheduling
+    X, score_idx = _shared['sample'], _shared['score_idx']
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(2, k)))
+    centroids, counts = kmeans_plus_plus(X, k, rng), np.zeros(k)
+    for _ in range(epochs):
+        minibatch_update(centroids, counts, X[rng.permutation(len(X))], batch_rows)
+    labels, dist = nearest(X, centroids)
+    n_used = len(np.unique(labels[score_idx]))
+    score = silhouette(X[score_idx], labels[score_idx]) if n_used > 1 else np.nan
+    return {'k': k, 'silhouette': score, 'inertia': float(dist.sum()), 'centroids': centroids, 'counts': counts}
+
+
+def select_k(sample, k_grid=K_GRID, workers=1, seed=SEED, silhouette_rows=SILHOUETTE_ROWS):
+    k_grid = [k for k in k_grid if 2 <= k < len(sample)]
+    if not k_grid:
+        raise ValueError(f"sample of {len(sample)} rows is too small for the k grid")
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(3,)))
+    # Every k is scored on the same sub-sample, so silhouettes are comparable
+    score_idx = np.sort(rng.choice(len(sample), min(silhouette_rows, len(sample)), replace=False))
+    shared = {'sample': sample, 'score_idx': score_idx}
+    if workers <= 1:
+        _init_worker(shared)
+        results = [fit_candidate(k, seed) for k in k_grid]
+    else:
+        # Sample goes to each worker once (initializer), tasks only carry k
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as executor:
+            results = list(executor.map(fit_candidate, k_grid, [seed] * len(k_grid)))
+    scored = [r for r in results if np.isfinite(r['silhouette'])]
+    best = max(scored, key=lambda r: (r['silhouette'], -r['k'])) if scored else results[0]
+    return best, results
+
+
+def fit_segments(path=DEFAULT_SOURCE, k_grid=K_GRID, workers=1, chunk_rows=CHUNK_ROWS, sample_rows=SAMPLE_ROWS, seed=SEED):
+    stats = scan(path, chunk_rows, sample_rows, seed)
+    best, results = select_k((stats['sample'] - stats['mean']) / stats['scale'], k_grid, workers, seed)
+
+    # Pass 2: warm-start from the sample fit, then stream the full table through mini-batch updates
+    model = {'features': np.array(FEATURES), 'mean': stats['mean'], 'scale': stats['scale'],
+             'centroids': best['centroids'].copy(), 'counts': np.zeros(best['k']),
+             'k_grid': np.array([r['k'] for r in results]), 'k_silhouette': np.array([r['silhouette'] for r in results]),
+             'k_inertia': np.array([r['inertia'] for r in results]), 'n_rows': np.array(stats['n_rows']),
+             'fingerprint': np.array(file_fingerprint(path))}
+    partial_fit(model, iter_chunks(path, chunk_rows))
+    return model
+
+
+def partial_fit(model, chunks, batch_rows=BATCH_ROWS):
+    # Fold new market rows (a DataFrame or an iterable of them) into the centroids; the scaler stays frozen
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    for chunk in chunks:
+        X, valid = feature_matrix(chunk)
+        if valid.any():
+            minibatch_update(model['centroids'], model['counts'], (X[valid] - model['mean']) / model['scale'], batch_rows)
+    return model
+
+
+def assign(model, df):
+    # Segment per row (-1 where an input is missing) and distance to its centroid in scaled units
+    X, valid = feature_matrix(df)
+    labels, dist = np.full(len(X), -1), np.full(len(X), np.nan)
+    if valid.any():
+        labels[valid], sq = nearest((X[valid] - model['mean']) / model['scale'], model['centroids'])
+        dist[valid] = np.sqrt(sq)
+    return labels, dist
+
+
+def centroid_table(model):
+    # Centroids back in raw units (GDP per capita / volume un-logged), one row per segment
+    raw = model['centroids'] * model['scale'] + model['mean']
+    return pd.DataFrame({'Segment': np.arange(len(raw)), 'GDP_Per_Capita': 10 ** raw[:, 0], 'Inflation_Rate': raw[:, 1],
+                         'Avg_Part_Price_USD': raw[:, 2], 'Annual_Sales_Volume': 10 ** raw[:, 3], 'Markets_Seen': model['counts']})
+
+
+def save_model(model, path=MODEL_PATH):
+    return atomic_write(path, lambda f: np.savez(f, **model), mode='wb')
+
+
+def load_model(path=MODEL_PATH):
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as npz:
+        return {name: npz[name] for name in npz.files}
+
+
+def get_segments(source=DEFAULT_SOURCE, path=MODEL_PATH):
+    # Persisted model if it was fitted on the current source, else fit (single process) and persist
+    fingerprint = file_fingerprint(source)
+    with _lock:
+        if (source, path, fingerprint) in _memory:
+            return _memory[(source, path, fingerprint)]
+        model = load_model(path)
+        if model is None or str(model['fingerprint']) != fingerprint:
+            model = fit_segments(source)
+            save_model(model, path)
+        _memory[(source, path, fingerprint)] = model
+        return model
+
+
+def segment_stamp(model):
+    # Cheap cache key for anything derived from the centroids
+    return (str(model['fingerprint']), len(model['centroids']), float(model['counts'].sum()))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Streamed mini-batch K-Means market segmentation")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help="*.csv / *.parquet or a partition directory")
+    parser.add_argument('--k-min', type=int, default=min(K_GRID))
+    parser.add_argument('--k-max', type=int, default=max(K_GRID))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--sample-rows', type=int, default=SAMPLE_ROWS)
+    parser.add_argument('--assign', help="label this market table with the saved model instead of fitting")
+    parser.add_argument('--update', action='store_true', help="with --assign: also fold those markets into the centroids")
+    parser.add_argument('--out', default=MODEL_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.assign:
+        model = load_model(args.out)
+        if model is None:
+            raise SystemExit(f"No saved model at {args.out}; fit one first")
+        df = pd.concat(iter_chunks(args.assign, args.chunk_rows), ignore_index=True)
+        df['Segment'], df['Segment_Distance'] = assign(model, df)
+        print(df.groupby('Segment')[RAW_COLUMNS].mean().assign(Markets=df['Segment'].value_counts()))
+        if args.update:
+            save_model(partial_fit(model, df), args.out)
+        print(f"✅ Assigned {len(df)} markets in {time.perf_counter() - start:.2f}s"
+              f"{' (centroids updated)' if args.update else ''}")
+    else:
+        model = fit_segments(args.source, range(args.k_min, args.k_max + 1), args.workers, args.chunk_rows, args.sample_rows)
+        save_model(model, args.out)
+        for k, s, inertia in zip(model['k_grid'], model['k_silhouette'], model['k_inertia']):
+            print(f"  k={k}: silhouette {s:.3f}, sample inertia {inertia:,.0f}")
+        print(centroid_table(model).round(2).to_string(index=False))
+        print(f"✅ k={len(model['centroids'])} fitted on {int(model['n_rows']):,} markets in {time.perf_counter() - start:.2f}s -> {args.out}")
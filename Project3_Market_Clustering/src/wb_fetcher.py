@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import time
+import argparse
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# 🌐 World Bank Fetcher (concurrent, cached per indicator x year, offline fallback)
+# ==========================================
+# The unit of work is one (indicator, year) cell: a single World Bank API v2 request covering every
+# requested country. Cells are fetched on a bounded thread pool (network-bound, so threads) and each
+# response is kept on disk with its ETag and fetch time. On a sync, fresh cells (younger than the TTL)
+# cost nothing, stale cells are revalidated with If-None-Match (a 304 only bumps the timestamp), and
+# only missing cells are downloaded in full. If the API is unreachable, cached cells are used as-is
+# (stale or not) and reported. WB_API_BASE points the fetcher at wb_standin_server.py for offline tests.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(base_dir, '..', 'artifacts', 'wb_cache')
+API_BASE = os.environ.get('WB_API_BASE', 'https://api.worldbank.org/v2')
+
+DEFAULT_TTL = 7 * 24 * 3600     # seconds before a cell is revalidated
+MAX_WORKERS = 8                 # concurrent requests
+TIMEOUT = 20
+RETRIES = 2
+PER_PAGE = 20000                # one page per cell for any realistic country list
+
+
+def cell_path(indicator, year, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{indicator}_{year}.json")
+
+
+def read_cell(indicator, year, cache_dir=CACHE_DIR):
+    path = cell_path(indicator, year, cache_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_cell(cell, cache_dir=CACHE_DIR):
+    atomic_write(cell_path(cell['indicator'], cell['year'], cache_dir), lambda f: json.dump(cell, f), mode='w')
+
+
+def _request(url, etag=None, timeout=TIMEOUT):
+    # -> (status, etag, parsed JSON or None on 304)
+    headers = {'Accept': 'application/json'}
+    if etag:
+        headers['If-None-Match'] = etag
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as resp:
+            return resp.status, resp.headers.get('ETag'), json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, e.headers.get('ETag') or etag, None
+        raise
+
+
+def _get_with_retry(url, etag, timeout, retries):
+    for attempt in range(retries + 1):
+        try:
+            return _request(url, etag, timeout)
+        except (urllib.error.URLError, TimeoutError, ConnectionError):
+            if attempt == retries:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+
+def fetch_cell(indicator, year, countries, cached=None, api_base=API_BASE, timeout=TIMEOUT, retries=RETRIES):
+    # One (indicator, year) cell for all countries; conditional when a cached ETag exists
+    url = f"{api_base}/country/{';'.join(countries)}/indicator/{indicator}?date={year}&format=json&per_page={PER_PAGE}"
+    status, etag, payload = _get_with_retry(url, cached.get('etag') if cached else None, timeout, retries)
+    if status == 304:
+        return {**cached, 'fetched_at': time.time(), 'etag': etag}, 'revalidated'
+
+    meta, rows = (payload + [None])[:2] if isinstance(payload, list) else ({}, None)
+    if rows is None and 'message' in meta:
+        raise ValueError(f"World Bank API error for {indicator} {year}: {meta['message']}")
+    values = {row['countryiso3code']: row['value'] for row in rows or [] if row.get('countryiso3code')}
+    for page in range(2, int(meta.get('pages') or 1) + 1):
+        _, _, more = _get_with_retry(f"{url}&page={page}", None, timeout, retries)
+        values.update({row['countryiso3code']: row['value'] for row in more[1] or [] if row.get('countryiso3code')})
+    # Countries the API didn't return are recorded as None so they don't count as missing next time
+    values = {c: values.get(c) for c in countries} | values
+    return {'indicator': indicator, 'year': int(year), 'etag': etag if int(meta.get('pages') or 1) == 1 else None,
+            'fetched_at': time.time(), 'values': values}, 'fetched'
+
+
+def plan_sync(indicators, years, countries, ttl=DEFAULT_TTL, refresh=False, cache_dir=CACHE_DIR, now=None):
+    # Classify every cell: 'fresh' (skip), 'stale' (revalidate) or 'missing' (full fetch)
+    now = now or time.time()
+    plan = {}
+    for indicator in indicators:
+        for year in years:
+            cell = read_cell(indicator, year, cache_dir)
+            if cell is None or not set(countries) <= set(cell['values']):
+                plan[(indicator, year)] = ('missing', cell)
+            elif refresh or now - cell['fetched_at'] > ttl:
+                plan[(indicator, year)] = ('stale', cell)
+            else:
+                plan[(indicator, year)] = ('fresh', cell)
+    return plan
+
+
+def sync(indicators, years, countries, ttl=DEFAULT_TTL, refresh=False, workers=MAX_WORKERS, offline=False,
+         api_base=API_BASE, cache_dir=CACHE_DIR, timeout=TIMEOUT, retries=RETRIES):
+    plan = plan_sync(indicators, years, countries, ttl, refresh, cache_dir)
+    report = {'fresh': 0, 'fetched': 0, 'revalidated': 0, 'stale_fallback': 0, 'failed': []}
+    todo = {}
+    for key, (state, cell) in plan.items():
+        if state == 'fresh':
+            report['fresh'] += 1
+        elif offline and cell is not None:
+            report['stale_fallback'] += 1
+        elif offline:
+            report['failed'].append(key)
+        else:
+            todo[key] = cell
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures, subset = {}, set()
+        for (indicator, year), cached in todo.items():
+            # A partially cached cell only asks for the countries it lacks (full, unconditional request)
+            missing = [c for c in countries if cached is None or c not in cached['values']]
+            if missing and cached is not None:
+                subset.add((indicator, year))
+            args = (missing, None) if missing else (countries, cached)
+            futures[executor.submit(fetch_cell, indicator, year, *args, api_base, timeout, retries)] = (indicator, year)
+        for fut in as_completed(futures):
+            key = futures[fut]
+            try:
+                cell, outcome = fut.result()
+                if todo[key] is not None and outcome == 'fetched':
+                    cell['values'] = todo[key]['values'] | cell['values']
+                    if key in subset:
+                        # The ETag only validates the subset request: drop it, so the cell's next revalidation
+                        # re-fetches the full country list and keeps that request's ETag
+                        cell['etag'] = None
+                write_cell(cell, cache_dir)
+                report[outcome] += 1
+            except Exception as e:
+                # Offline / API error: keep serving whatever is cached for this cell
+                if todo[key] is not None:
+                    report['stale_fallback'] += 1
+                else:
+                    report['failed'].append(key)
+                print(f"⚠️ {key[0]} {key[1]}: {e}")
+    return report
+
+
+def load_panel(indicators, years, countries=None, cache_dir=CACHE_DIR):
+    # Long table (Country_Code, Indicator, Year, Value) from the cache
+    rows = []
+    for indicator in indicators:
+        for year in years:
+            cell = read_cell(indicator, year, cache_dir)
+            if cell is None:
+                continue
+            rows.extend((c, indicator, int(year), v) for c, v in cell['values'].items() if countries is None or c in countries)
+    return pd.DataFrame(rows, columns=['Country_Code', 'Indicator', 'Year', 'Value'])
+
+
+def latest_values(panel, year):
+    # Wide snapshot: per country and indicator, the value for `year` or else the latest earlier one
+    known = panel[(panel['Year'] <= year) & panel['Value'].notna()].sort_values('Year')
+    return known.groupby(['Country_Code', 'Indicator'])['Value'].last().unstack('Indicator')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sync World Bank indicator x year cells into the local cache")
+    parser.add_argument('--indicators', nargs='+', default=['NY.GDP.PCAP.CD', 'FP.CPI.TOTL.ZG'])
+    parser.add_argument('--years', default='2015-2022', help="e.g. 2022 or 2015-2022")
+    parser.add_argument('--countries', nargs='+', required=True)
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL)
+    parser.add_argument('--refresh', action='store_true', help="revalidate every cached cell (conditional requests)")
+    parser.add_argument('--offline', action='store_true', help="no network; report what the cache covers")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    args = parser.parse_args()
+
+    lo, _, hi = args.years.partition('-')
+    years = list(range(int(lo), int(hi or lo) + 1))
+    start = time.perf_counter()
+    report = sync(args.indicators, years, args.countries, ttl=args.ttl, refresh=args.refresh, workers=args.workers, offline=args.offline)
+    print(f"✅ {len(args.indicators) * len(years)} cells in {time.perf_counter() - start:.2f}s: {report}")
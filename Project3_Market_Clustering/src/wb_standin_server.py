@@ -0,0 +1,126 @@
+import re
+import json
+import time
+import zlib
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+
+# ==========================================
+# 🧪 World Bank API Stand-in (local, deterministic, no network)
+# ==========================================
+# Serves the subset of the World Bank API v2 the fetcher uses:
+#   /v2/country/{ISO3;ISO3;...}/indicator/{ID}?date=YYYY&format=json&per_page=N&page=P
+# with the same [meta, rows] JSON shape. Values are a deterministic function of (country, indicator,
+# year), so repeated runs agree; responses carry an ETag and honour If-None-Match with 304. Optional
+# latency and failure rate exercise the fetcher's concurrency, retries and offline fallback.
+#   python wb_standin_server.py --port 8765   then   WB_API_BASE=http://127.0.0.1:8765/v2 python fetch_wb_data.py
+
+ROUTE = re.compile(r'^/v2/country/(?P<countries>[^/]+)/indicator/(?P<indicator>[^/]+)/?$')
+MISSING_RATE = 0.03     # share of (country, indicator, year) values served as null, like real gaps
+
+
+def _seed(*parts):
+    return zlib.crc32('|'.join(map(str, parts)).encode())
+
+
+def standin_value(country, indicator, year):
+    # Plausible levels for the indicators the dashboard uses, a noisy level for anything else
+    rng = np.random.default_rng(_seed(country, indicator, year))
+    if rng.random() < MISSING_RATE:
+        return None
+    base = np.random.default_rng(_seed(country, indicator))
+    if indicator == 'NY.GDP.PCAP.CD':
+        level = np.exp(base.normal(9.3, 1.1))                       # ~ $1k - $100k
+        return round(float(level * 1.03 ** (int(year) - 2015) * np.exp(rng.normal(0, 0.04))), 2)
+    if indicator == 'FP.CPI.TOTL.ZG':
+        return round(float(base.gamma(2.0, 2.0) + rng.normal(0, 1.5)), 3)
+    return round(float(base.lognormal(3, 1) * (1 + rng.normal(0, 0.05))), 3)
+
+
+def _payload(countries, indicator, year, page, per_page):
+    rows = [{'indicator': {'id': indicator, 'value': indicator}, 'country': {'id': c[:2], 'value': c},
+             'countryiso3code': c, 'date': str(year), 'value': standin_value(c, indicator, year),
+             'unit': '', 'obs_status': '', 'decimal': 1} for c in countries]
+    pages = max(1, -(-len(rows) // per_page))
+    chunk = rows[(page - 1) * per_page:page * per_page]
+    meta = {'page': page, 'pages': pages, 'per_page': per_page, 'total': len(rows), 'sourceid': '2', 'lastupdated': '2024-01-01'}
+    return [meta, chunk]
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_rate = 0.0
+    stats = {'requests': 0, 'not_modified': 0, 'failed': 0}
+    _stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def do_GET(self):
+        self._count('requests')
+        url = urlparse(self.path)
+        match = ROUTE.match(url.path)
+        if match is None:
+            return self._send(404, [{'message': [{'id': '120', 'key': 'Invalid value', 'value': 'Unknown route'}]}])
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_rate and np.random.random() < self.fail_rate:
+            self._count('failed')
+            return self._send(503, {'error': 'stand-in failure injection'})
+
+        query = parse_qs(url.query)
+        year = query.get('date', ['2022'])[0]
+        page, per_page = int(query.get('page', ['1'])[0]), int(query.get('per_page', ['50'])[0])
+        countries = match['countries'].upper().split(';')
+        body = json.dumps(_payload(countries, match['indicator'], year, page, per_page)).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self._count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        body = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=0, latency=0.0, fail_rate=0.0):
+    # Starts in a daemon thread; returns the server (server.server_address[1] is the bound port)
+    handler = type('Handler', (StandinHandler,), {'latency': latency, 'fail_rate': fail_rate,
+                                                   'stats': {'requests': 0, 'not_modified': 0, 'failed': 0}})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local World Bank API v2 stand-in for offline fetcher tests")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="share of requests answered with 503")
+    args = parser.parse_args()
+
+    server = serve(args.port, args.latency, args.fail_rate)
+    print(f"✅ World Bank stand-in on http://127.0.0.1:{server.server_address[1]}/v2 (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,250 @@
+import os
+import sys
+import glob
+import time
+import hashlib
+import argparse
+import threading
+for _project in ['Project1_Price_Elasticity', 'Project2_TimeSeries_Forecast', 'Project3_Market_Clustering']:
+    _src = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', _project, 'src'))
+    if _src not in sys.path:
+        sys.path.append(_src)
+from data_store import DATASETS
+from perf_metrics import bind, span
+
+# ==========================================
+# 🔄 Stale-While-Revalidate Data Snapshots (background refresh, atomic swap)
+# ==========================================
+# Every script run takes the current snapshot once and reads datasets and models only from it, so a
+# run never mixes old and new data and never waits on a reload. A daemon thread polls the source
+# files: a file whose (size, mtime) changed and then stayed put for SETTLE seconds is content-hashed;
+# if the bytes really changed, the entries derived from it are rebuilt on that thread (the other
+# entries are carried over) and published as a new snapshot in a single reference swap. Runs already
+# in flight finish on the previous snapshot. A failed rebuild keeps serving the previous snapshot.
+# Entries are built on first use, on the requesting thread: a page opened before warm_up() (which
+# fills them all after first paint) reached its entry waits for that one build. Only first use blocks;
+# the refresher keeps every built entry fresh off the request path.
+
+POLL_INTERVAL = float(os.environ.get('DASHBOARD_REFRESH_INTERVAL', 5.0))   # seconds between source polls
+SETTLE = 2.0    # a changed source must keep the same stamp this long (writers finish first)
+
+
+def _dataset(name):
+    def build():
+        from shared_data import get_dataset
+        return get_dataset(name)
+    return build
+
+
+def _cube():
+    from panel_cube import get_cube
+    return get_cube()
+
+
+def _catalogue():
+    # Cube baselines joined with FE / cell elasticities: the price optimizer's and profit-at-risk's input
+    from panel_cube import get_cube
+    from fe_elasticity import load_elasticities
+    from cell_elasticity import load_cell_elasticities
+    from price_optimizer import catalogue_inputs
+    cube = get_cube()
+    return None if cube is None else catalogue_inputs(cube, load_elasticities(), load_cell_elasticities())
+
+
+def _var_artifact():
+    from var_artifacts import get_var_artifact
+    return get_var_artifact()
+
+
+def _irf_bands():
+    # In-process: never fork the multithreaded Streamlit server for a bootstrap pool
+    from irf_bootstrap import get_irf_bands
+    return get_irf_bands(workers=1)
+
+
+def _segments():
+    # Fitted on the World Bank table page 4 shows, so its countries are scaled and assigned within their own
+    # distribution (the synthetic market table keeps its own model in market_segments.MODEL_PATH)
+    from market_segments import ARTIFACT_DIR, get_segments
+    return get_segments(DATASETS['wb']['csv'], os.path.join(ARTIFACT_DIR, 'market_segments_wb.npz'))
+
+
+# entry -> (sources it is derived from, builder); a refresh rebuilds affected entries in this order
+ENTRIES = {
+    'var': (['var'], _dataset('var')),
+    'wb': (['wb'], _dataset('wb')),
+    'cube': (['panel'], _cube),
+    'catalogue': (['panel'], _catalogue),
+    'var_artifact': (['var', 'var_spec'], _var_artifact),
+    'irf_bands': (['var', 'var_spec'], _irf_bands),
+    'segments': (['wb'], _segments),
+}
+
+_lock = threading.Lock()
+_current = {}    # 'snapshot' -> the published snapshot
+_watch = {}      # source -> {'stamp', 'hash', 'pending': (stamp, first seen) or None}
+_building = {}   # entry -> lock held while it is built on first use
+status = {'state': 'idle', 'last_check': None, 'last_refresh': None, 'refresh_seconds': None, 'refreshed': [], 'error': None}
+
+
+def sources():
+    # Data files plus var_spec.json: a new spec from var_selection.py refits the VAR entries
+    from var_artifacts import SPEC_PATH
+    return {**{name: spec['csv'] for name, spec in DATASETS.items()}, 'var_spec': SPEC_PATH}
+
+
+def _files(path):
+    return sorted(glob.glob(os.path.join(path, '*'))) if os.path.isdir(path) else [path]
+
+
+def file_stamp(path):
+    # (name, size, mtime_ns) per file, or None while the source is missing
+    try:
+        return tuple((os.path.basename(f), st.st_size, st.st_mtime_ns) for f in _files(path) for st in [os.stat(f)])
+    except FileNotFoundError:
+        return None
+
+
+def content_hash(path):
+    h = hashlib.sha256()
+    try:
+        for f in _files(path):
+            with open(f, 'rb') as fh:
+                for block in iter(lambda: fh.read(1 << 20), b''):
+                    h.update(block)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def _token(deps):
+    # What an entry was built from; used in cache keys of anything derived from the entry
+    paths = sources()
+    return tuple(file_stamp(paths[s]) for s in deps)
+
+
+def current_snapshot():
+    # The snapshot a script run should use from start to end
+    with _lock:
+        if 'snapshot' not in _current:
+            _current['snapshot'] = {'version': 1, 'created': time.time(), 'entries': {}}
+            for name, path in sources().items():
+                _watch.setdefault(name, {'stamp': file_stamp(path), 'hash': None, 'pending': None})
+        return _current['snapshot']
+
+
+def resolve(snapshot, key):
+    # -> (value, token); an entry nobody asked for yet is built on first use from the data as it is now.
+    # One build per entry: a page asking while warm-up is building it waits for that build.
+    hit = snapshot['entries'].get(key)
+    if hit is None:
+        with _lock:
+            building = _building.setdefault(key, threading.Lock())
+        with building:
+            hit = snapshot['entries'].get(key)
+            if hit is None:
+                deps, build = ENTRIES[key]
+                token = _token(deps)
+                value = build()
+                with _lock:
+                    hit = snapshot['entries'].setdefault(key, (value, token))
+    return hit
+
+
+def check(now=None):
+    # One poll -> sources whose content changed and has settled since it was last seen
+    now = time.monotonic() if now is None else now
+    current_snapshot()
+    changed = set()
+    for name, path in sources().items():
+        seen = _watch.setdefault(name, {'stamp': file_stamp(path), 'hash': None, 'pending': None})
+        stamp = file_stamp(path)
+        if stamp == seen['stamp']:
+            seen['pending'] = None
+            if seen['hash'] is None:
+                seen['hash'] = content_hash(path)   # baseline, hashed here rather than on the first request
+            continue
+        if seen['pending'] is None or seen['pending'][0] != stamp:
+            seen['pending'] = (stamp, now)           # still being written? wait until the stamp settles
+            continue
+        if now - seen['pending'][1] < SETTLE:
+            continue
+        digest = content_hash(path)
+        if seen['hash'] is None or digest != seen['hash']:
+            changed.add(name)
+        seen.update(stamp=stamp, hash=digest, pending=None)
+    return changed
+
+
+def refresh(changed):
+    # Rebuild the built entries derived from `changed` sources on this thread, then publish in one swap
+    old = current_snapshot()
+    start = time.perf_counter()
+    with _lock:
+        built = dict(old['entries'])                  # resolve() adds entries under _lock
+    entries, rebuilt = {}, []
+    for key, (deps, build) in ENTRIES.items():
+        hit = built.get(key)
+        if hit is None:
+            continue                                  # never used: stays lazy
+        if changed.isdisjoint(deps):
+            entries[key] = hit
+        else:
+            token = _token(deps)
+            with span(f'refresh_{key}'):
+                entries[key] = (build(), token)
+            rebuilt.append(key)
+    snapshot = {'version': old['version'] + 1, 'created': time.time(), 'entries': entries}
+    with _lock:
+        # Entries first built during this refresh were built from the current files: carry them over
+        for key, hit in old['entries'].items():
+            entries.setdefault(key, hit)
+        _current['snapshot'] = snapshot
+    status.update(last_refresh=time.time(), refresh_seconds=time.perf_counter() - start, refreshed=rebuilt, error=None)
+    return snapshot
+
+
+def run(interval=POLL_INTERVAL, stop=None):
+    stop = stop or threading.Event()
+    bind('refresh')
+    status['state'] = 'watching'
+    while not stop.wait(interval):
+        try:
+            changed = check()
+            status['last_check'] = time.time()
+            if changed:
+                status['state'] = 'refreshing'
+                refresh(changed)
+        except Exception as e:
+            # Previous snapshot stays published; the source is retried once it changes again
+            print("Data refresh failed:", e)
+            status['error'] = str(e)
+        status['state'] = 'watching'
+
+
+def start_background(interval=POLL_INTERVAL):
+    # Daemon thread: never holds the process open on shutdown
+    thread = threading.Thread(target=run, args=(interval,), name='dashboard-refresher', daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build every dashboard snapshot entry, then watch the sources and refresh")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL)
+    parser.add_argument('--once', action='store_true', help="build the snapshot and exit")
+    args = parser.parse_args()
+
+    snapshot = current_snapshot()
+    for key in ENTRIES:
+        start = time.perf_counter()
+        resolve(snapshot, key)
+        print(f"✅ {key} ({time.perf_counter() - start:.2f}s)")
+    check()
+    while not args.once:
+        time.sleep(args.interval)
+        changed = check()
+        if changed:
+            snapshot = refresh(changed)
+            print(f"✅ {sorted(changed)} changed -> snapshot v{snapshot['version']}: rebuilt {status['refreshed']} "
+                  f"in {status['refresh_seconds']:.2f}s")
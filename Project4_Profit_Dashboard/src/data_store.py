@@ -0,0 +1,124 @@
+import os
+import sys
+import shutil
+import argparse
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from perf_metrics import span
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# 🗄️ Columnar Data Store (Parquet, memory-mapped, column-pruned)
+# ==========================================
+# The dashboard used to re-parse three CSVs on every cold start with object strings and float64
+# everywhere. Each dataset now lives as Parquet next to its CSV (a single file, or a partitioned
+# directory written by synthetic_data.py) with categorical keys and compact numerics. Reads are
+# memory-mapped and only pull the columns a page asks for. CSV stays the import/export format:
+# a CSV newer than its Parquet copy is re-imported automatically. read_source() applies the same
+# freshness rule to any CSV / Parquet path (the estimators' --panel inputs, scaled test data).
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.join(base_dir, '..', '..')
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+DATASETS = {
+    'panel': {
+        'csv': os.path.join(root_dir, 'Project1_Price_Elasticity', 'data', 'panel_sales_data.csv'),
+        'schema': pa.schema([('Date', pa.timestamp('ms')), ('Country', _CATEGORY), ('Part', _CATEGORY),
+                             ('Price_USD', pa.float32()), ('Quantity', pa.int32()), ('KRW_USD', pa.float32())]),
+    },
+    'var': {
+        # VAR inputs stay float64: 75 rows, and the fit should not depend on storage precision
+        'csv': os.path.join(root_dir, 'Project2_TimeSeries_Forecast', 'data', 'var_macro_data.csv'),
+        'schema': pa.schema([('Date', pa.timestamp('ms')), ('KRW_USD', pa.float64()),
+                             ('Steel_Index', pa.float64()), ('Aluminum_Index', pa.float64())]),
+    },
+    'wb': {
+        'csv': os.path.join(root_dir, 'Project3_Market_Clustering', 'data', 'worldbank_market_data.csv'),
+        'schema': pa.schema([('Country_Code', _CATEGORY), ('Inflation_Rate', pa.float32()), ('GDP_Per_Capita', pa.float32()),
+                             ('Avg_Part_Price_USD', pa.float32()), ('Annual_Sales_Volume', pa.int32())]),
+    },
+}
+
+
+def parquet_path(name):
+    return os.path.splitext(DATASETS[name]['csv'])[0] + '.parquet'
+
+
+def source_stamp(name):
+    # Cheap change detector for the CSV source: (size, mtime_ns)
+    stat = os.stat(DATASETS[name]['csv'])
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def is_stale(csv_path, pq_path):
+    # The one freshness rule: a Parquet copy is usable unless it is missing or older than its CSV
+    if not os.path.exists(pq_path):
+        return True
+    return os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(pq_path)
+
+
+def _is_stale(name):
+    return is_stale(DATASETS[name]['csv'], parquet_path(name))
+
+
+def import_csv(name):
+    # CSV -> compact Parquet (one-off per CSV change)
+    spec = DATASETS[name]
+    with span('csv_parse'):
+        df = pd.read_csv(spec['csv'], parse_dates=['Date'] if 'Date' in spec['schema'].names else None)
+    table = pa.Table.from_pandas(df[spec['schema'].names], schema=spec['schema'], preserve_index=False)
+
+    pq_path = parquet_path(name)
+    if os.path.isdir(pq_path):
+        shutil.rmtree(pq_path)
+    return atomic_write(pq_path, lambda tmp: pq.write_table(table, tmp))
+
+
+def export_csv(name, csv_path=None):
+    df = load_table(name)
+    csv_path = csv_path or DATASETS[name]['csv']
+    df.to_csv(csv_path, index=False)
+    return csv_path
+
+
+def load_table(name, columns=None, as_arrow=False):
+    # columns=None -> all columns; columns=[] -> nothing needed, skip I/O entirely
+    # as_arrow -> the pyarrow Table itself (None when there is no data), for callers that derive before converting
+    if columns is not None and len(columns) == 0:
+        return pd.DataFrame()
+    if _is_stale(name):
+        if not os.path.exists(DATASETS[name]['csv']):
+            return None if as_arrow else pd.DataFrame()
+        import_csv(name)
+    with span('parquet_read'):
+        table = pq.read_table(parquet_path(name), columns=columns, memory_map=True)
+        return table if as_arrow else table.to_pandas()
+
+
+def read_source(path, columns=None, **csv_options):
+    # Any CSV, Parquet file or partition directory -> DataFrame; a CSV is read from its up-to-date
+    # Parquet copy when there is one (nothing is converted here). csv_options go to pd.read_csv.
+    pq_path = path if path.endswith('.parquet') or os.path.isdir(path) else os.path.splitext(path)[0] + '.parquet'
+    if pq_path == path or not is_stale(path, pq_path):
+        with span('parquet_read'):
+            return pq.read_table(pq_path, columns=columns, memory_map=True).to_pandas()
+    with span('csv_parse'):
+        return pd.read_csv(path, usecols=columns, **csv_options)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert dashboard CSVs to Parquet (or export back to CSV)")
+    parser.add_argument('--export', action='store_true', help="write Parquet contents back to CSV")
+    args = parser.parse_args()
+
+    for name in DATASETS:
+        if args.export:
+            print(f"✅ {name} -> {export_csv(name)}")
+        elif os.path.exists(DATASETS[name]['csv']):
+            print(f"✅ {name} -> {import_csv(name)}")
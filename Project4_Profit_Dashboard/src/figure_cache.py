@@ -0,0 +1,65 @@
+import copy
+import threading
+from collections import OrderedDict
+import plotly.io as pio
+import plotly.graph_objects as go
+from perf_metrics import span
+
+# ==========================================
+# 🖼️ Figure Spec Cache (LRU, memory-capped, shared across sessions)
+# ==========================================
+# Building a Plotly figure (px.* + validation) costs tens of milliseconds per chart per rerun even
+# when nothing changed. Built figures are kept here as plain specs, keyed by the caller on the dataset
+# fingerprint plus the widget inputs that shape the chart. A hit returns a fresh Figure from a copy of
+# the spec without re-validation (~1-2 ms), so request-specific overlays (the add_vline markers driven
+# by sliders) can be added to it without touching the cached entry. Least recently used specs are
+# evicted once the cached JSON size passes MAX_BYTES.
+
+MAX_BYTES = 64 * 1024 ** 2
+MAX_ENTRIES = 256
+
+_lock = threading.Lock()
+_specs = OrderedDict()   # key -> (spec dict, size in bytes)
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+
+
+def _evict(max_bytes, max_entries):
+    while _specs and (_stats['bytes'] > max_bytes or len(_specs) > max_entries):
+        _, (_, size) = _specs.popitem(last=False)
+        _stats['bytes'] -= size
+        _stats['evictions'] += 1
+
+
+def cached_figure(key, build, max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES):
+    # key: hashable (chart name, data fingerprint, inputs...); build: zero-arg callable returning a Figure
+    with _lock:
+        entry = _specs.get(key)
+        if entry is not None:
+            _specs.move_to_end(key)
+            _stats['hits'] += 1
+    if entry is None:
+        # Build outside the lock so one slow chart doesn't block every other session
+        with span('figure_build'):
+            spec = build().to_dict()
+            size = len(pio.to_json(spec, validate=False))
+        with _lock:
+            _stats['misses'] += 1
+            if key not in _specs and size <= max_bytes:
+                _specs[key] = (spec, size)
+                _stats['bytes'] += size
+                _evict(max_bytes, max_entries)
+        entry = (spec, size)
+    # Spec was validated when it was built; the copy keeps per-request overlays out of the cache
+    with span('figure_copy'):
+        return go.Figure(copy.deepcopy(entry[0]), _validate=False)
+
+
+def cache_info():
+    with _lock:
+        return {**_stats, 'entries': len(_specs)}
+
+
+def clear():
+    with _lock:
+        _specs.clear()
+        _stats.update(hits=0, misses=0, evictions=0, bytes=0)
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import glob
+import shutil
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from data_store import DATASETS, load_table, source_stamp
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# 🧊 Materialized Panel Cube (Part x Country x Month)
+# ==========================================
+# Page 1 used to sum Price_USD * Quantity over the raw panel and page 2 filtered the panel per part
+# on every rerun. The cube keeps additive measures per (Part, Country, Month) cell plus roll-ups, so
+# pages read a few hundred cells instead of scanning rows. Appending a month only aggregates the new
+# rows and upserts the touched cells/roll-ups into a new cube object (readers keep the one they got);
+# on disk, cells are partitioned by month so an append writes just that month's file.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+CUBE_DIR = os.path.join(base_dir, '..', 'artifacts', 'panel_cube')
+
+KEYS = ['Part', 'Country', 'Month']
+MEASURES = ['Revenue', 'Quantity', 'Price_Sum', 'Rows']
+ROLLUPS = {'part': ['Part'], 'country': ['Country'], 'month': ['Month'], 'part_country': ['Part', 'Country']}
+SOURCE_COLUMNS = ['Date', 'Country', 'Part', 'Price_USD', 'Quantity']
+
+_lock = threading.Lock()
+_memory = {}
+
+
+def aggregate_rows(df):
+    price = df['Price_USD'].to_numpy(dtype=np.float64)
+    qty = df['Quantity'].to_numpy(dtype=np.int64)
+    frame = pd.DataFrame({
+        'Part': df['Part'].astype(str).to_numpy(),
+        'Country': df['Country'].astype(str).to_numpy(),
+        'Month': pd.to_datetime(df['Date']).to_numpy().astype('datetime64[M]').astype('datetime64[ns]'),
+        'Revenue': price * qty,
+        'Quantity': qty,
+        'Price_Sum': price,
+        'Rows': np.ones(len(df), dtype=np.int64),
+    })
+    return frame.groupby(KEYS, sort=True)[MEASURES].sum()
+
+
+def _with_means(frame):
+    out = frame.copy()
+    out['Mean_Price'] = out['Price_Sum'] / out['Rows']
+    out['Mean_Quantity'] = out['Quantity'] / out['Rows']
+    return out
+
+
+def build_cube(df, stamp=None):
+    cells = aggregate_rows(df)
+    cube = {'cells': cells, 'meta': {'source_stamp': stamp, 'n_rows': int(cells['Rows'].sum())}}
+    for name, keys in ROLLUPS.items():
+        cube[name] = cells.groupby(level=keys).sum()
+    cube['total'] = cells.sum()
+    return cube
+
+
+def _upsert(target, delta):
+    # New frame: existing cells summed, new ones added (a new month is all new cells); target untouched
+    return target.add(delta[target.columns], fill_value=0).astype(target.dtypes.to_dict()).sort_index()
+
+
+def append_rows(cube, new_rows):
+    # Returns a new cube: the old one may still be held by a page mid-run (dashboard snapshot)
+    delta = aggregate_rows(new_rows)
+    meta = dict(cube['meta'], n_rows=cube['meta']['n_rows'] + int(delta['Rows'].sum()))
+    updated = {'cells': _upsert(cube['cells'], delta), 'meta': meta, 'total': cube['total'] + delta.sum()}
+    for name, keys in ROLLUPS.items():
+        updated[name] = _upsert(cube[name], delta.groupby(level=keys).sum())
+    touched = sorted({str(m)[:7] for m in delta.index.get_level_values('Month')})
+    return updated, touched
+
+
+def rollup(cube, name):
+    # Roll-up with derived means (Mean_Price == mean of Price_USD over the raw rows)
+    return _with_means(cube[name])
+
+
+# ==========================================
+# 💾 Persistence (cells partitioned by month)
+# ==========================================
+def _month_file(month):
+    return os.path.join(CUBE_DIR, 'cells', f"{month}.parquet")
+
+
+def _write_frame(frame, path):
+    atomic_write(path, lambda tmp: pq.write_table(pa.Table.from_pandas(frame.reset_index(), preserve_index=False), tmp))
+
+
+def save_cube(cube, months=None):
+    # months=None -> write every month partition; otherwise only the touched ones
+    os.makedirs(os.path.join(CUBE_DIR, 'cells'), exist_ok=True)
+    cells = cube['cells']
+    month_keys = cells.index.get_level_values('Month').strftime('%Y-%m')
+    if months is None:
+        for stale in glob.glob(os.path.join(CUBE_DIR, 'cells', '*.parquet')):
+            os.remove(stale)
+        months = sorted(set(month_keys))
+    for month in months:
+        _write_frame(cells[month_keys == month], _month_file(month))
+    for name in ROLLUPS:
+        _write_frame(cube[name], os.path.join(CUBE_DIR, f"rollup_{name}.parquet"))
+    atomic_write(os.path.join(CUBE_DIR, 'meta.json'), lambda f: json.dump(cube['meta'], f), mode='w')
+
+
+def load_cube():
+    meta_path = os.path.join(CUBE_DIR, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        cube = {'meta': json.load(f)}
+    cube['cells'] = pq.read_table(os.path.join(CUBE_DIR, 'cells')).to_pandas().set_index(KEYS).sort_index()
+    for name, keys in ROLLUPS.items():
+        cube[name] = pq.read_table(os.path.join(CUBE_DIR, f"rollup_{name}.parquet")).to_pandas().set_index(keys)
+    cube['total'] = cube['cells'][MEASURES].sum()
+    return cube
+
+
+def _current_cube():
+    # Caller holds _lock. Reuse the persisted cube while the panel source is unchanged; full rebuild
+    # only when it changed
+    stamp = source_stamp('panel')
+    cached = _memory.get('cube')
+    if cached is not None and cached['meta']['source_stamp'] == stamp:
+        return cached
+    cube = load_cube()
+    if cube is None or cube['meta']['source_stamp'] != stamp:
+        cube = build_cube(load_table('panel', SOURCE_COLUMNS), stamp)
+        if os.path.isdir(CUBE_DIR):
+            shutil.rmtree(CUBE_DIR)
+        save_cube(cube)
+    _memory['cube'] = cube
+    return cube
+
+
+def get_cube():
+    if not os.path.exists(DATASETS['panel']['csv']):
+        return None
+    with _lock:
+        return _current_cube()
+
+
+def append_month(new_rows):
+    # Monthly ingest: append raw rows to the panel CSV and update only the affected cube cells. Both
+    # happen under _lock, so no get_cube() sees the new CSV stamp before the cube that matches it.
+    csv_path = DATASETS['panel']['csv']
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"no panel source at {csv_path}: generate the panel before appending months")
+    with _lock:
+        cube = _current_cube()
+        new_rows[pd.read_csv(csv_path, nrows=0).columns].to_csv(csv_path, mode='a', header=False, index=False)
+        cube, touched = append_rows(cube, new_rows)
+        cube['meta']['source_stamp'] = source_stamp('panel')
+        save_cube(cube, months=touched)
+        _memory['cube'] = cube
+    return touched
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build or incrementally update the panel aggregate cube")
+    parser.add_argument('--append', help="CSV with new panel rows (same columns as panel_sales_data.csv)")
+    args = parser.parse_args()
+
+    if args.append:
+        touched = append_month(pd.read_csv(args.append, parse_dates=['Date']))
+        print(f"✅ Appended {args.append} -> updated cube months {touched}")
+    else:
+        cube = get_cube()
+        if cube is None:
+            raise SystemExit(f"No panel source at {DATASETS['panel']['csv']}; generate the panel first")
+        print(f"✅ Panel cube ready ({len(cube['cells'])} cells from {cube['meta']['n_rows']} rows) -> {CUBE_DIR}")
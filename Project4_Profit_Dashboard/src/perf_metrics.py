@@ -0,0 +1,169 @@
+import os
+import sys
+import time
+import bisect
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+try:
+    import resource          # POSIX only: peak RSS
+except ImportError:
+    resource = None
+
+# ==========================================
+# ⏱️ Hot-Path Timing Spans (per page / per session, Prometheus text export)
+# ==========================================
+# `with span('var_fit'):` times one stage of a script run (data load, CSV parse, model fit, figure
+# build, chart serialization, ...). Each observation lands in two places: a process-wide histogram
+# per (page, stage), exported as Prometheus text to METRICS_PATH (at most every EXPORT_INTERVAL
+# seconds; node_exporter's textfile collector can pick it up), and the caller's session dict
+# (st.session_state) for the sidebar panel. bind() sets the page / session for the current run, so
+# code below app.py records spans without knowing about Streamlit. Stdlib only and ~1 us per span.
+# Memory: RSS is always reported; PERF_TRACEMALLOC=1 also traces Python allocations (slower).
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+METRICS_PATH = os.environ.get('DASHBOARD_METRICS_PATH', os.path.join(base_dir, '..', 'artifacts', 'dashboard_metrics.prom'))
+EXPORT_INTERVAL = 15.0      # seconds between metric file writes
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = 'dashboard'
+
+if os.environ.get('PERF_TRACEMALLOC') == '1' and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+_lock = threading.Lock()
+_totals = {}                 # (page, stage) -> {'count', 'sum', 'max', 'last', 'buckets'}
+_state = {'last_export': 0.0, 'started': time.time()}
+_context = ContextVar('perf_context', default=('', None))
+
+
+def bind(page, session=None):
+    # Page label and session store (a dict, e.g. st.session_state entry) for spans in this run / thread
+    _context.set((str(page), session))
+    maybe_export()
+
+
+def _new_entry(with_buckets):
+    entry = {'count': 0, 'sum': 0.0, 'max': 0.0, 'last': 0.0}
+    if with_buckets:
+        entry['buckets'] = [0] * (len(BUCKETS) + 1)
+    return entry
+
+
+def _observe(entry, seconds):
+    entry['count'] += 1
+    entry['sum'] += seconds
+    entry['max'] = max(entry['max'], seconds)
+    entry['last'] = seconds
+    if 'buckets' in entry:
+        entry['buckets'][bisect.bisect_left(BUCKETS, seconds)] += 1
+
+
+def record(stage, seconds, page=None, session=None):
+    bound_page, bound_session = _context.get()
+    page = bound_page if page is None else str(page)
+    session = bound_session if session is None else session
+    with _lock:
+        _observe(_totals.setdefault((page, stage), _new_entry(True)), seconds)
+    if session is not None:
+        # Session dicts are only touched by their own session's script thread
+        _observe(session.setdefault((page, stage), _new_entry(False)), seconds)
+
+
+@contextmanager
+def span(stage, page=None, session=None):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, page, session)
+
+
+def memory_snapshot():
+    # Bytes; None where the platform can't tell
+    snap = {'rss': None, 'peak_rss': None, 'traced': None, 'traced_peak': None}
+    try:
+        with open('/proc/self/statm') as f:
+            snap['rss'] = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak if sys.platform == 'darwin' else peak * 1024   # macOS reports bytes, Linux KiB
+        snap['peak_rss'] = max(peak, snap['rss'] or 0)                # ru_maxrss can lag the live RSS
+    if tracemalloc.is_tracing():
+        snap['traced'], snap['traced_peak'] = tracemalloc.get_traced_memory()
+    return snap
+
+
+def stage_table(session=None, page=None):
+    # Rows for display: this session's stages (or the process totals), slowest total first
+    with _lock:
+        source = dict(session if session is not None else _totals)
+    rows = [{'page': p, 'stage': stage, 'calls': e['count'], 'last_ms': e['last'] * 1000,
+             'mean_ms': e['sum'] / e['count'] * 1000, 'max_ms': e['max'] * 1000, 'total_s': e['sum']}
+            for (p, stage), e in source.items() if e['count'] and (page is None or p == str(page))]
+    return sorted(rows, key=lambda r: -r['total_s'])
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    with _lock:
+        totals = {key: {**e, 'buckets': list(e['buckets'])} for key, e in _totals.items()}
+    name = f'{PREFIX}_stage_seconds'
+    lines = [f'# HELP {name} Wall time of instrumented dashboard stages.', f'# TYPE {name} histogram']
+    for (page, stage), e in sorted(totals.items()):
+        labels = f'page="{_label(page)}",stage="{_label(stage)}"'
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float('inf'),), e['buckets']):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {e["sum"]:.6f}')
+        lines.append(f'{name}_count{{{labels}}} {e["count"]}')
+    lines += [f'# HELP {name}_max Slowest observation per stage since process start.', f'# TYPE {name}_max gauge']
+    lines += [f'{name}_max{{page="{_label(p)}",stage="{_label(s)}"}} {e["max"]:.6f}' for (p, s), e in sorted(totals.items())]
+
+    gauges = {'process_resident_memory_bytes': ('Resident set size.', 'rss'),
+              'process_peak_resident_memory_bytes': ('Peak resident set size.', 'peak_rss'),
+              'python_traced_memory_bytes': ('Python heap traced by tracemalloc (PERF_TRACEMALLOC=1).', 'traced')}
+    snap = memory_snapshot()
+    for metric, (help_text, key) in gauges.items():
+        if snap[key] is not None:
+            lines += [f'# HELP {PREFIX}_{metric} {help_text}', f'# TYPE {PREFIX}_{metric} gauge', f'{PREFIX}_{metric} {snap[key]}']
+    lines += [f'# HELP {PREFIX}_process_start_time_seconds Unix time the metrics registry started.',
+              f'# TYPE {PREFIX}_process_start_time_seconds gauge', f'{PREFIX}_process_start_time_seconds {_state["started"]:.3f}']
+    return '\n'.join(lines) + '\n'
+
+
+def export_prometheus(path=METRICS_PATH):
+    # A scraper never reads a half-written file
+    return atomic_write(path, lambda f: f.write(prometheus_text()), mode='w')
+
+
+def maybe_export(path=METRICS_PATH, interval=EXPORT_INTERVAL):
+    # Throttled export; one thread wins the slot, the others return immediately
+    now = time.monotonic()
+    with _lock:
+        if now - _state['last_export'] < interval:
+            return None
+        _state['last_export'] = now
+    try:
+        return export_prometheus(path)
+    except OSError as e:
+        print("Metrics export failed:", e)
+        return None
+
+
+def reset():
+    with _lock:
+        _totals.clear()
+        _state['last_export'] = 0.0
@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Project1_Price_Elasticity', 'src')))
+from panel_cube import get_cube, rollup
+from fe_elasticity import load_elasticities
+from cell_elasticity import load_cell_elasticities
+
+# ==========================================
+# 🎯 Portfolio Optimal-Price Solver (vectorized)
+# ==========================================
+# Profit-maximizing price change for every part and part x country cell at once, over numpy arrays.
+# Demand models (c = relative price change, E = elasticity):
+#   linear   : Q = Q0 * (1 + E c)     -> concave quadratic profit, closed-form vertex
+#   constant : Q = Q0 * (1 + c)^E     -> P* = C E / (1 + E) when E < -1, else the upper bound
+# Bounds (default +-20%) and a per-cell margin floor P >= C / (1 - floor) are applied by clipping,
+# which is exact because both profit curves are unimodal in c. Curves for plotting are one
+# broadcasted (cells x grid) evaluation.
+
+DEMAND_MODELS = ('linear', 'constant')
+DEFAULT_BOUNDS = (-0.20, 0.20)
+DEFAULT_MARGIN_RATE = 0.30  # assumed current margin -> unit cost = price * (1 - margin)
+PORTFOLIO = '전체'
+
+# Prior elasticities, only used when neither the cell nor the part FE estimate is a valid (negative) demand response
+PRIOR_ELASTICITY = {'Brake_Pad': -0.85, 'Oil_Filter': -1.45, 'Spark_Plug': -1.15}
+
+
+def demand(base_qty, elasticity, chg, model='linear'):
+    if model == 'linear':
+        return base_qty * np.maximum(1 + elasticity * chg, 0)
+    return base_qty * (1 + chg) ** elasticity
+
+
+def profit(base_price, base_qty, cost, elasticity, chg, model='linear'):
+    return (base_price * (1 + chg) - cost) * demand(base_qty, elasticity, chg, model)
+
+
+def optimal_change(base_price, cost, elasticity, model='linear', bounds=DEFAULT_BOUNDS, margin_floor=0.0):
+    # Returns (optimal relative change, constraint label) for every cell
+    base_price, cost, elasticity = (np.asarray(a, dtype=np.float64) for a in (base_price, cost, elasticity))
+    lo = np.maximum(bounds[0], cost / (1 - margin_floor) / base_price - 1)
+    hi = np.full_like(lo, bounds[1])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if model == 'linear':
+            # d/dc [(P0 (1+c) - C)(1 + E c)] = 0
+            interior = (elasticity * cost - base_price * (1 + elasticity)) / (2 * elasticity * base_price)
+            # Linear demand hits zero at c = -1/E; never price past it
+            hi = np.where(elasticity < 0, np.minimum(hi, -1 / elasticity), hi)
+            valid = elasticity < 0
+        else:
+            interior = cost * elasticity / (1 + elasticity) / base_price - 1
+            valid = elasticity < -1
+    # Non-negative / inelastic demand: profit keeps rising with price -> upper bound
+    interior = np.where(valid, interior, np.inf)
+
+    chg = np.clip(interior, lo, hi)
+    infeasible = lo > hi
+    chg = np.where(infeasible, hi, chg)
+    binding = np.select([infeasible, chg >= hi, chg <= lo], ['infeasible', 'upper', 'floor' if margin_floor > 0 else 'lower'], 'interior')
+    binding = np.where((binding == 'floor') & np.isclose(lo, bounds[0]), 'lower', binding)
+    return chg, binding
+
+
+def profit_curve(base_price, base_qty, cost, elasticity, grid, model='linear'):
+    # (cells x grid) profit matrix in one broadcast
+    col = lambda a: np.asarray(a, dtype=np.float64)[:, None]
+    return profit(col(base_price), col(base_qty), col(cost), col(elasticity), np.asarray(grid)[None, :], model)
+
+
+# ==========================================
+# 📦 Catalogue inputs + repricing proposal
+# ==========================================
+def catalogue_inputs(cube, fe_results, cell_lookup, margin_rate=DEFAULT_MARGIN_RATE):
+    # One row per part (Country == PORTFOLIO) and per part x country cell, with the elasticity actually used
+    parts = rollup(cube, 'part')
+    cells = rollup(cube, 'part_country')
+    rows = pd.concat([
+        pd.DataFrame({'Part': parts.index.astype(str), 'Country': PORTFOLIO,
+                      'Base_Price': parts['Mean_Price'].to_numpy(), 'Base_Qty': parts['Mean_Quantity'].to_numpy()}),
+        pd.DataFrame({'Part': cells.index.get_level_values('Part').astype(str), 'Country': cells.index.get_level_values('Country').astype(str),
+                      'Base_Price': cells['Mean_Price'].to_numpy(), 'Base_Qty': cells['Mean_Quantity'].to_numpy()}),
+    ], ignore_index=True)
+    rows['Cost'] = rows['Base_Price'] * (1 - margin_rate)
+
+    fe = fe_results[fe_results['Model'] == 'FE'].set_index('Part')
+    fe_e = rows['Part'].map(fe['Elasticity']).to_numpy(dtype=np.float64)
+    fe_se = rows['Part'].map(fe['SE']).to_numpy(dtype=np.float64)
+    lookup = cell_lookup.assign(Part=cell_lookup['Part'].astype(str), Country=cell_lookup['Country'].astype(str)).set_index(['Part', 'Country'])
+    cell_idx = pd.MultiIndex.from_arrays([rows['Part'], rows['Country']])
+    cell_e = lookup['Elasticity_Shrunk'].reindex(cell_idx).to_numpy(dtype=np.float64)
+    cell_se = lookup['SE_Shrunk'].reindex(cell_idx).to_numpy(dtype=np.float64)
+    prior = rows['Part'].map(PRIOR_ELASTICITY).fillna(-1.0).to_numpy(dtype=np.float64)
+
+    use_cell = cell_e < 0
+    use_fe = ~use_cell & (fe_e < 0)
+    rows['Elasticity'] = np.select([use_cell, use_fe], [cell_e, fe_e], prior)
+    rows['Elasticity_SE'] = np.select([use_cell, use_fe], [cell_se, fe_se], np.nan)
+    rows['Source'] = np.select([use_cell, use_fe], ['cell', 'fe'], 'prior')
+    rows['N'] = lookup['N'].reindex(cell_idx).to_numpy()
+    return rows
+
+
+def solve_catalogue(inputs, model='linear', bounds=DEFAULT_BOUNDS, margin_floor=0.0, grid_points=41):
+    price, qty, cost, e = (inputs[c].to_numpy(dtype=np.float64) for c in ('Base_Price', 'Base_Qty', 'Cost', 'Elasticity'))
+    chg, binding = optimal_change(price, cost, e, model=model, bounds=bounds, margin_floor=margin_floor)
+
+    base_profit = profit(price, qty, cost, e, 0.0, model)
+    opt_profit = profit(price, qty, cost, e, chg, model)
+    table = inputs.assign(Optimal_Change_Pct=chg * 100, Optimal_Price=price * (1 + chg), Optimal_Qty=demand(qty, e, chg, model),
+                          Base_Profit=base_profit, Optimal_Profit=opt_profit, Profit_Uplift=opt_profit - base_profit, Binding=binding)
+
+    grid = np.linspace(bounds[0], bounds[1], grid_points)
+    return {'table': table, 'grid_pct': grid * 100, 'curves': profit_curve(price, qty, cost, e, grid, model),
+            'model': model, 'bounds': bounds, 'margin_floor': margin_floor}
+
+
+def repricing_plan(model='linear', bounds=DEFAULT_BOUNDS, margin_floor=0.0, margin_rate=DEFAULT_MARGIN_RATE, grid_points=41):
+    inputs = catalogue_inputs(get_cube(), load_elasticities(), load_cell_elasticities(), margin_rate=margin_rate)
+    return solve_catalogue(inputs, model=model, bounds=bounds, margin_floor=margin_floor, grid_points=grid_points)
+
+
+def plan_row(plan, part, country=PORTFOLIO):
+    table = plan['table']
+    hits = np.flatnonzero((table['Part'].to_numpy() == part) & (table['Country'].to_numpy() == country))
+    return (None, None) if len(hits) == 0 else (table.iloc[hits[0]], plan['curves'][hits[0]])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Portfolio-wide optimal price proposal")
+    parser.add_argument('--model', default='linear', choices=DEMAND_MODELS)
+    parser.add_argument('--bound', type=float, default=20.0, help="max absolute price change in percent")
+    parser.add_argument('--margin-floor', type=float, default=0.0, help="minimum margin after repricing (0-1)")
+    parser.add_argument('--out', help="optional CSV path for the proposal")
+    args = parser.parse_args()
+
+    inputs = catalogue_inputs(get_cube(), load_elasticities(), load_cell_elasticities())
+    start = time.perf_counter()
+    plan = solve_catalogue(inputs, model=args.model, bounds=(-args.bound / 100, args.bound / 100), margin_floor=args.margin_floor)
+    elapsed = time.perf_counter() - start
+
+    table = plan['table']
+    print(f"✅ Solved {len(table):,} rows ({args.model} demand) in {elapsed * 1000:.1f} ms")
+    print(table[['Part', 'Country', 'Elasticity', 'Source', 'Optimal_Change_Pct', 'Profit_Uplift', 'Binding']].head(20).to_string(index=False))
+    if args.out:
+        table.to_csv(args.out, index=False)
+        print(f"✅ Proposal -> {args.out}")
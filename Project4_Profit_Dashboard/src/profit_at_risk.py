@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'Project2_TimeSeries_Forecast', 'src')))
+from var_artifacts import DEFAULT_DATA_PATH, get_var_artifact, column_index, shock_scale
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import iter_bounded
+
+# ==========================================
+# 🎲 Monte Carlo Profit-at-Risk (VAR cost paths x demand elasticity)
+# ==========================================
+# Joint KRW/USD, steel and aluminum paths are simulated from the fitted VAR (intercept + lag
+# coefficients, Gaussian shocks with the residual covariance via its Cholesky factor). Each path is
+# pushed through a per-part cost pass-through, a partial price pass-through and a constant-elasticity
+# demand response, and cumulated into horizon profit. Paths are generated in fixed-size chunks with
+# their own SeedSequence(seed, spawn_key=(chunk,)) stream, so results are bit-identical for any worker
+# count; only (paths x parts) horizon totals are kept, never the full paths.
+
+DEFAULT_PATHS = 100_000
+DEFAULT_HORIZON = 24
+CHUNK_PATHS = 20_000
+DEFAULT_SEED = 42
+ALPHA = 0.05  # VaR / CVaR tail
+
+# Unit-cost sensitivity to a relative move of each macro driver (assumed BOM/import shares)
+PASS_THROUGH = {
+    'Brake_Pad': {'KRW_USD': 0.35, 'Steel_Index': 0.45, 'Aluminum_Index': 0.05},
+    'Oil_Filter': {'KRW_USD': 0.35, 'Steel_Index': 0.25, 'Aluminum_Index': 0.15},
+    'Spark_Plug': {'KRW_USD': 0.35, 'Steel_Index': 0.10, 'Aluminum_Index': 0.20},
+}
+DEFAULT_PASS_THROUGH = {'KRW_USD': 0.35, 'Steel_Index': 0.25, 'Aluminum_Index': 0.10}
+PRICE_PASS_THROUGH = 0.5  # share of the cost move passed on to the selling price
+
+
+def var_model(artifact, fx_shock=0.0, impulse='KRW_USD'):
+    # Arrays the workers need (plain ndarrays so they pickle cheaply)
+    chol = np.linalg.cholesky(artifact['sigma_u'])
+    i = column_index(artifact, impulse)
+    # Orthogonalized one-off shock in month 1, scaled exactly like the page-3 IRF (shock_scale)
+    first_shock = chol[:, i] * shock_scale(artifact, impulse, fx_shock)
+    return {'intercept': np.array(artifact['intercept']), 'coefs': np.array(artifact['coefs']), 'chol': chol,
+            'last_obs': np.array(artifact['last_obs']), 'first_shock': first_shock, 'columns': list(artifact['columns'])}
+
+
+def part_arrays(parts, columns, price_pass_through=PRICE_PASS_THROUGH):
+    # parts: DataFrame with Part, Base_Price, Base_Qty, Cost, Elasticity (e.g. price_optimizer rows)
+    weights = np.array([[PASS_THROUGH.get(p, DEFAULT_PASS_THROUGH).get(c, 0.0) for c in columns] for p in parts['Part']])
+    return {'price': parts['Base_Price'].to_numpy(dtype=np.float64), 'qty': parts['Base_Qty'].to_numpy(dtype=np.float64),
+            'cost': parts['Cost'].to_numpy(dtype=np.float64), 'elasticity': parts['Elasticity'].to_numpy(dtype=np.float64),
+            'weights': weights, 'price_pass': price_pass_through}
+
+
+def simulate_chunk(model, arrays, horizon, seed, index, n_paths, dtype=np.float64):
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    cast = lambda a: np.asarray(a, dtype=dtype)
+    intercept, coefs, chol = cast(model['intercept']), cast(model['coefs']), cast(model['chol'])
+    last_obs = cast(model['last_obs'])
+    weights, price, qty, cost, elasticity = (cast(arrays[k]) for k in ('weights', 'price', 'qty', 'cost', 'elasticity'))
+    n_lags, k = coefs.shape[0], coefs.shape[1]
+
+    # Rolling window of the last n_lags levels per path (most recent last)
+    hist = np.broadcast_to(last_obs, (n_paths, n_lags, k)).copy()
+    anchor = last_obs[-1]
+    total = np.zeros((n_paths, len(price)), dtype=dtype)
+    for t in range(horizon):
+        y = intercept + rng.standard_normal((n_paths, k), dtype=dtype) @ chol.T
+        if t == 0:
+            y += cast(model['first_shock'])
+        for lag in range(n_lags):
+            y += hist[:, n_lags - 1 - lag] @ coefs[lag].T
+        hist[:, :-1] = hist[:, 1:]
+        hist[:, -1] = y
+
+        cost_chg = (y / anchor - 1) @ weights.T                       # (paths, parts)
+        price_ratio = np.maximum(1 + arrays['price_pass'] * cost_chg, 1e-3)
+        total += (price * price_ratio - cost * (1 + cost_chg)) * (qty * price_ratio ** elasticity)
+    return total
+
+
+def _chunks(n_paths, chunk_paths):
+    return [(i, min(chunk_paths, n_paths - lo)) for i, lo in enumerate(range(0, n_paths, chunk_paths))]
+
+
+def simulate_profits(model, arrays, n_paths=DEFAULT_PATHS, horizon=DEFAULT_HORIZON, seed=DEFAULT_SEED,
+                     workers=1, chunk_paths=CHUNK_PATHS, dtype=np.float64):
+    # (n_paths, n_parts) cumulative horizon profit, written chunk by chunk into one preallocated array
+    out = np.empty((n_paths, len(arrays['price'])), dtype=dtype)
+    chunks = _chunks(n_paths, chunk_paths)
+    tasks = [(model, arrays, horizon, seed, index, size, dtype) for index, size in chunks]
+    offsets = np.cumsum([0] + [size for _, size in chunks])
+    if workers <= 1:
+        results = (simulate_chunk(*task) for task in tasks)
+        for (index, _), block in zip(chunks, results):
+            out[offsets[index]:offsets[index + 1]] = block
+        return out
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for (index, _), block in zip(chunks, iter_bounded(executor, simulate_chunk, tasks, window=2 * workers)):
+            out[offsets[index]:offsets[index + 1]] = block
+    return out
+
+
+def risk_summary(parts, profits, horizon=DEFAULT_HORIZON, alpha=ALPHA):
+    # VaR / CVaR are losses against the no-shock plan profit ((P0 - C0) * Q0 * horizon)
+    plan = ((parts['Base_Price'] - parts['Cost']) * parts['Base_Qty']).to_numpy(dtype=np.float64) * horizon
+    p = np.asarray(profits, dtype=np.float64)
+    q_alpha = np.quantile(p, alpha, axis=0)
+    tail = np.where(p <= q_alpha, p, np.nan)
+    return pd.DataFrame({
+        'Part': parts['Part'].to_numpy(),
+        'Plan_Profit': plan,
+        'Mean_Profit': p.mean(axis=0),
+        'Std_Profit': p.std(axis=0),
+        'P05': q_alpha,
+        'P50': np.quantile(p, 0.5, axis=0),
+        'P95': np.quantile(p, 1 - alpha, axis=0),
+        'VaR': plan - q_alpha,
+        'CVaR': plan - np.nanmean(tail, axis=0),
+        'Prob_Below_Plan': (p < plan).mean(axis=0),
+    })
+
+
+def profit_at_risk(parts, n_paths=DEFAULT_PATHS, horizon=DEFAULT_HORIZON, fx_shock=0.0, seed=DEFAULT_SEED, workers=1,
+                   dtype=np.float64, price_pass_through=PRICE_PASS_THROUGH, var_path=DEFAULT_DATA_PATH, artifact=None):
+    # artifact: an already-loaded VAR artifact (the dashboard's data snapshot), else read for var_path
+    model = var_model(get_var_artifact(var_path) if artifact is None else artifact, fx_shock=fx_shock)
+    arrays = part_arrays(parts, model['columns'], price_pass_through)
+    profits = simulate_profits(model, arrays, n_paths=n_paths, horizon=horizon, seed=seed, workers=workers, dtype=dtype)
+    return risk_summary(parts, profits, horizon), profits
+
+
+if __name__ == '__main__':
+    from price_optimizer import PORTFOLIO, repricing_plan
+
+    parser = argparse.ArgumentParser(description="Monte Carlo profit-at-risk per part from VAR cost paths")
+    parser.add_argument('--paths', type=int, default=DEFAULT_PATHS)
+    parser.add_argument('--horizon', type=int, default=DEFAULT_HORIZON, help="months")
+    parser.add_argument('--fx-shock', type=float, default=0.0, help="one-off KRW/USD shock in month 1 (KRW)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--float32', action='store_true', help="simulate in float32 (half the memory)")
+    args = parser.parse_args()
+
+    table = repricing_plan()['table']
+    parts = table[table['Country'] == PORTFOLIO].reset_index(drop=True)
+    start = time.perf_counter()
+    summary, _ = profit_at_risk(parts, n_paths=args.paths, horizon=args.horizon, fx_shock=args.fx_shock, seed=args.seed,
+                                workers=args.workers, dtype=np.float32 if args.float32 else np.float64)
+    print(f"✅ {args.paths:,} paths x {args.horizon} months in {time.perf_counter() - start:.2f}s")
+    print(summary.to_string(index=False))
@@ -0,0 +1,139 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# ==========================================
+# 🔬 Level-of-Detail Rendering (downsampling + WebGL)
+# ==========================================
+# Charts used to ship every point to the browser. Time series are now reduced server-side to about
+# as many points as the chart has pixels: LTTB (Largest-Triangle-Three-Buckets, keeps the visual
+# shape) or min/max bucketing (keeps every spike). The reduction is applied to the visible x-range
+# only, so zooming in (narrower range) returns more detail for that window. Reduced series stay SVG
+# (go.Scatter): at ~chart-width points WebGL buys nothing. Large scatters (page 4's 3D market map is
+# WebGL already) are sampled server-side with a fixed seed, always keeping flagged rows (e.g. pricing
+# anomalies). Inputs below the thresholds pass through untouched.
+
+MAX_SERIES_POINTS = 1_500     # ~ chart width in pixels
+MAX_SCATTER_POINTS = 20_000   # server-side sample size for large scatters
+SAMPLE_SEED = 7
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if x.dtype == object:
+        # datetime / Timestamp bounds coming from widgets
+        x = pd.to_datetime(x).to_numpy()
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb(x, y, n_out):
+    # Indices of the LTTB-selected points (first and last always kept)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    xf, yf = _as_float(x), np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        nlo, nhi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        ax, ay = xf[nlo:nhi].mean(), yf[nlo:nhi].mean()
+        area = np.abs((xf[prev] - ax) * (yf[lo:hi] - yf[prev]) - (xf[prev] - xf[lo:hi]) * (ay - yf[prev]))
+        prev = lo + int(area.argmax())
+        keep[b + 1] = prev
+    return keep
+
+
+def minmax_buckets(y, n_out):
+    # Indices of the min and max of each bucket (2 points per bucket), in x order
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    yf = np.asarray(y, dtype=np.float64)
+    starts = np.linspace(0, n, n_buckets + 1).astype(np.int64)[:-1]
+    bucket = np.repeat(np.arange(n_buckets), np.diff(np.append(starts, n)))
+    order = np.lexsort((yf, bucket))                       # sorted by bucket, then value
+    first = np.searchsorted(bucket[order], np.arange(n_buckets))
+    last = np.append(first[1:], n) - 1
+    return np.unique(np.concatenate([order[first], order[last]]))
+
+
+def visible_slice(x, x_range=None, pad=1):
+    # Index slice covering x_range (+ one point of padding so lines run to the edges)
+    if x_range is None:
+        return slice(0, len(x))
+    xs = _as_float(x)
+    lo = max(int(np.searchsorted(xs, _as_float([x_range[0]])[0], side='left')) - pad, 0)
+    hi = min(int(np.searchsorted(xs, _as_float([x_range[1]])[0], side='right')) + pad, len(xs))
+    return slice(lo, hi)
+
+
+def downsample(x, y, max_points=MAX_SERIES_POINTS, method='lttb', x_range=None):
+    # Returns (x, y) reduced to <= max_points within the visible range
+    x, y = np.asarray(x), np.asarray(y)
+    window = visible_slice(x, x_range)
+    x, y = x[window], y[window]
+    idx = lttb(x, y, max_points) if method == 'lttb' else minmax_buckets(y, max_points)
+    return x[idx], y[idx]
+
+
+def series_trace(x, y, max_points=MAX_SERIES_POINTS, method='lttb', x_range=None, **kwargs):
+    # Drop-in for go.Scatter(x=..., y=..., mode='lines', ...) with LOD
+    xs, ys = downsample(x, y, max_points, method, x_range)
+    return go.Scatter(x=xs, y=ys, **kwargs)
+
+
+def sample_rows(df, max_points=MAX_SCATTER_POINTS, keep=None, seed=SAMPLE_SEED):
+    # Deterministic server-side sample; rows where `keep` is True are always included
+    if len(df) <= max_points:
+        return df
+    keep = np.zeros(len(df), dtype=bool) if keep is None else np.asarray(keep, dtype=bool)
+    rest = np.flatnonzero(~keep)
+    n_rest = max(max_points - int(keep.sum()), 0)
+    chosen = np.random.default_rng(seed).choice(rest, size=min(n_rest, len(rest)), replace=False)
+    return df.iloc[np.sort(np.concatenate([np.flatnonzero(keep), chosen]))]
+
+
+# ==========================================
+# ⏱️ Before / after measurement
+# ==========================================
+def _measure(build):
+    start = time.perf_counter()
+    fig = build()
+    payload = fig.to_json()
+    return {'points': sum(len(t.x) for t in fig.data if t.x is not None), 'payload_kb': len(payload.encode()) / 1024,
+            'build_serialize_ms': (time.perf_counter() - start) * 1000}
+
+
+def benchmark(n_series=1_000_000, n_scatter=200_000, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('1990-01-01', periods=n_series, freq='min').to_numpy()
+    fx = 1100 + np.cumsum(rng.normal(0, 0.5, n_series))
+    markets = pd.DataFrame({'x': rng.normal(size=n_scatter), 'y': rng.normal(size=n_scatter)})
+    outlier = np.abs(markets['y']) > 3.5
+
+    rows = {
+        'series: raw go.Scatter': _measure(lambda: go.Figure(go.Scatter(x=dates, y=fx, mode='lines'))),
+        'series: LTTB': _measure(lambda: go.Figure(series_trace(dates, fx, mode='lines'))),
+        'series: min/max': _measure(lambda: go.Figure(series_trace(dates, fx, method='minmax', mode='lines'))),
+        'series: LTTB, zoomed 1%': _measure(lambda: go.Figure(series_trace(dates, fx, x_range=(dates[0], dates[n_series // 100]), mode='lines'))),
+        'scatter: raw go.Scatter': _measure(lambda: go.Figure(go.Scatter(x=markets['x'], y=markets['y'], mode='markers'))),
+        'scatter: sampled Scattergl': _measure(lambda: go.Figure(go.Scattergl(**{k: v for k, v in sample_rows(markets, keep=outlier).items()}, mode='markers'))),
+    }
+    return pd.DataFrame(rows).T
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure chart payloads before/after LOD rendering")
+    parser.add_argument('--series-points', type=int, default=1_000_000)
+    parser.add_argument('--scatter-points', type=int, default=200_000)
+    args = parser.parse_args()
+    print(benchmark(args.series_points, args.scatter_points).round(1).to_string())
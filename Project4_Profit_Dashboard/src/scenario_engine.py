@@ -0,0 +1,205 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+for _path in [_root, os.path.join(_root, 'Project2_TimeSeries_Forecast', 'src')]:
+    if _path not in sys.path:
+        sys.path.append(_path)  # repo root: shared pipeline_utils; var_artifacts: fitted VAR store
+from pipeline_utils import iter_bounded
+from var_artifacts import DEFAULT_DATA_PATH, get_var_artifact, column_index, shock_scale
+from price_optimizer import DEMAND_MODELS, PORTFOLIO, repricing_plan, profit
+from profit_at_risk import PASS_THROUGH, DEFAULT_PASS_THROUGH
+
+# ==========================================
+# 🧪 Headless Scenario Engine (same math as the dashboard pages)
+# ==========================================
+# A scenario row is (Part, [Country], Price_Change_Pct, FX_Shock, [Model]). Each batch is evaluated
+# with numpy over all rows at once: elasticity-based profit change from the price-optimizer baselines
+# (page 2), and the VAR forecast plus the orthogonalized IRF rescaled to the FX shock (page 3), turned
+# into a unit-cost change through the per-part pass-through weights. Large scenario files are read in
+# batches, evaluated in a bounded process pool (context shipped once per worker) and streamed to
+# Parquet/CSV in input order.
+
+BATCH_ROWS = 50_000
+IMPULSE = 'KRW_USD'
+RESPONSES = ('Steel_Index', 'Aluminum_Index')
+
+_context = {}
+
+
+def load_context(var_path=DEFAULT_DATA_PATH):
+    # Everything a batch needs: per-model catalogue baselines and the fitted VAR artifact
+    art = get_var_artifact(var_path)
+    return {'plans': {model: repricing_plan(model=model)['table'] for model in DEMAND_MODELS},
+            'var': {name: np.array(art[name]) for name in ('columns', 'forecast', 'orth_irfs', 'series_std', 'last_obs')}}
+
+
+def shock_response(var, shocks, response, impulse=IMPULSE):
+    # (rows, horizon+1) response paths: 1-SD orthogonal IRF rescaled to each shock (as scaled_irf)
+    i, r = column_index(var, impulse), column_index(var, response)
+    return np.outer(shock_scale(var, impulse, shocks), var['orth_irfs'][:, r, i])
+
+
+def _baselines(plans, scenarios):
+    # Align every scenario row to its catalogue row (Part x Country) for its demand model
+    models = scenarios['Model'].to_numpy()
+    out = pd.DataFrame(index=scenarios.index, columns=['Base_Price', 'Base_Qty', 'Cost', 'Elasticity'], dtype=np.float64)
+    for model in np.unique(models):
+        table = plans[model].set_index(['Part', 'Country'])
+        rows = scenarios[models == model]
+        idx = pd.MultiIndex.from_arrays([rows['Part'], rows['Country']])
+        out.loc[rows.index] = table[out.columns].reindex(idx).to_numpy()
+    return out
+
+
+def evaluate(scenarios, context=None):
+    context = context or _context
+    scenarios = scenarios.copy()
+    if 'Country' not in scenarios:
+        scenarios['Country'] = PORTFOLIO
+    if 'Model' not in scenarios:
+        scenarios['Model'] = 'linear'
+    if 'FX_Shock' not in scenarios:
+        scenarios['FX_Shock'] = 0.0
+    scenarios['Part'] = scenarios['Part'].astype(str)
+    scenarios['Country'] = scenarios['Country'].fillna(PORTFOLIO).astype(str)
+
+    # Page 2: elasticity-based profit change (vectorized per demand model)
+    base = _baselines(context['plans'], scenarios)
+    chg = scenarios['Price_Change_Pct'].to_numpy(dtype=np.float64) / 100
+    price, qty, cost, e = (base[c].to_numpy(dtype=np.float64) for c in base.columns)
+    base_profit = np.full(len(scenarios), np.nan)
+    new_profit = np.full(len(scenarios), np.nan)
+    for model in DEMAND_MODELS:
+        mask = scenarios['Model'].to_numpy() == model
+        base_profit[mask] = profit(price[mask], qty[mask], cost[mask], e[mask], 0.0, model)
+        new_profit[mask] = profit(price[mask], qty[mask], cost[mask], e[mask], chg[mask], model)
+    out = scenarios.assign(Elasticity=e, Base_Profit=base_profit, New_Profit=new_profit,
+                           Profit_Change=new_profit - base_profit, Profit_Change_Pct=(new_profit / base_profit - 1) * 100)
+
+    # Page 3: forecast + shock response per response series, and the implied unit-cost change
+    var = context['var']
+    shocks = scenarios['FX_Shock'].to_numpy(dtype=np.float64)
+    anchor = var['last_obs'][-1]
+    cost_pct = np.zeros((len(scenarios), var['orth_irfs'].shape[0]))
+    weights = lambda col: scenarios['Part'].map(lambda p: PASS_THROUGH.get(p, DEFAULT_PASS_THROUGH).get(col, 0.0)).to_numpy()
+    for col in [c for c in RESPONSES if c in var['columns']] + [IMPULSE]:
+        path = shock_response(var, shocks, col)
+        j = column_index(var, col)
+        if col != IMPULSE:
+            peak = np.abs(path).argmax(axis=1)
+            out[f'{col}_Peak_Response'] = path[np.arange(len(path)), peak]
+            out[f'{col}_Peak_Month'] = peak
+            out[f'{col}_Forecast_12M'] = var['forecast'][min(11, len(var['forecast']) - 1), j] + path[:, min(11, path.shape[1] - 1)]
+        cost_pct += weights(col)[:, None] * path / anchor[j] * 100
+    peak = np.abs(cost_pct).argmax(axis=1)
+    out['Cost_Change_Peak_Pct'] = cost_pct[np.arange(len(cost_pct)), peak]
+    out['Cost_Peak_Month'] = peak
+    return out
+
+
+# ==========================================
+# 🚚 Batch runner (read in batches, process pool, streamed output)
+# ==========================================
+def _init_worker(context):
+    _context.update(context)
+
+
+def _evaluate_batch(frame):
+    return evaluate(frame)
+
+
+def iter_scenarios(path, batch_rows=BATCH_ROWS):
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=batch_rows)
+
+
+class _Sink:
+    # Streaming writer: Parquet row groups or CSV appends, schema fixed by the first batch
+    def __init__(self, path):
+        self.path, self.writer, self.rows = path, None, 0
+        self.tmp_path = path + f'.{os.getpid()}.tmp'
+
+    def write(self, frame):
+        if self.path.endswith('.parquet'):
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.tmp_path, table.schema)
+            self.writer.write_table(table.cast(self.writer.schema))
+        else:
+            frame.to_csv(self.tmp_path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        self.rows += len(frame)
+
+    def _close_writer(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def commit(self):
+        # Only a run that finished is published; the previous output stays until then
+        self._close_writer()
+        if self.rows:
+            os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._close_writer()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def run_scenarios(scenario_path, output_path, workers=1, batch_rows=BATCH_ROWS, context=None):
+    context = context or load_context()
+    sink = _Sink(output_path)
+    frames = iter_scenarios(scenario_path, batch_rows)
+    try:
+        if workers <= 1:
+            for frame in frames:
+                sink.write(evaluate(frame, context))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(context,)) as executor:
+                # Batches are read lazily, so at most 2 x workers of them are held at once
+                for result in iter_bounded(executor, _evaluate_batch, ((frame,) for frame in frames), window=2 * workers):
+                    sink.write(result)
+    except BaseException:
+        sink.abort()
+        raise
+    sink.commit()
+    return sink.rows
+
+
+def make_grid(parts, countries=(PORTFOLIO,), price_changes=range(-20, 21), fx_shocks=range(0, 201, 10), models=('linear',)):
+    # Full factorial scenario grid (handy for overnight sweeps)
+    index = pd.MultiIndex.from_product([parts, countries, price_changes, fx_shocks, models],
+                                       names=['Part', 'Country', 'Price_Change_Pct', 'FX_Shock', 'Model'])
+    return index.to_frame(index=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Evaluate pricing / FX-shock scenarios headlessly")
+    parser.add_argument('--scenarios', help="CSV/Parquet with Part, Price_Change_Pct, FX_Shock [, Country, Model]")
+    parser.add_argument('--grid', action='store_true', help="generate a full part x price x shock grid instead")
+    parser.add_argument('--out', required=True, help="output .parquet or .csv")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    context = load_context()
+    scenario_path = args.scenarios
+    if args.grid:
+        table = context['plans']['linear']
+        grid = make_grid(sorted(table['Part'].unique()), countries=sorted(table['Country'].unique()), models=DEMAND_MODELS)
+        scenario_path = os.path.splitext(args.out)[0] + '_grid.parquet'
+        pq.write_table(pa.Table.from_pandas(grid, preserve_index=False), scenario_path)
+    n_rows = run_scenarios(scenario_path, args.out, workers=args.workers, batch_rows=args.batch_rows, context=context)
+    print(f"✅ {n_rows:,} scenarios evaluated in {time.perf_counter() - start:.2f}s -> {args.out}")
@@ -0,0 +1,117 @@
+import os
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+from data_store import DATASETS, load_table, source_stamp
+
+# ==========================================
+# 🔒 Shared Read-Only Datasets (one copy per process, not per session)
+# ==========================================
+# st.cache_data hands every caller its own unpickled copy of each DataFrame, so dashboard memory grew
+# with the number of connected sessions. Each dataset is now materialized once per process from its
+# Arrow table, derived columns included, and every session references the same frame; it is reloaded
+# only when the CSV source changes. The frame is frozen: column buffers are read-only and column
+# assignment / deletion raise, so one page can't silently change what every other session sees.
+# Freezing uses public pandas API only, and assert_frozen re-checks every buffer on each cache hit, so a
+# pandas upgrade that copies or re-consolidates shows up as an error instead of silently writable data.
+# Derive per-request columns with .assign() / .copy(), or compute them once here in DERIVED.
+
+def _var_derived(table):
+    # Date index computed once, so page 3 no longer copies and re-indexes the frame every rerun
+    return table.to_pandas().set_index('Date')
+
+
+def _wb_derived(table):
+    # Log GDP per capita (3D market map / segment feature) as an Arrow column before conversion
+    log_gdp = pc.log10(pc.cast(table['GDP_Per_Capita'], 'float64'))
+    return table.append_column('Log_GDP', log_gdp).to_pandas()
+
+
+DERIVED = {'var': _var_derived, 'wb': _wb_derived}
+
+_lock = threading.Lock()
+_memory = {}   # name -> (source stamp, frozen frame)
+
+
+class FrozenFrame(pd.DataFrame):
+    # Process-wide DataFrame: reads, slicing and .assign() work as usual (and return plain DataFrames)
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared dataset is read-only: use .assign() / .copy(), or add the column to shared_data.DERIVED")
+
+    __setitem__ = __delitem__ = insert = pop = _read_only
+
+
+EMPTY = FrozenFrame()   # stand-in for a dataset a page doesn't use / that has no data yet
+
+
+def _column_buffer(series):
+    # The array a column's values live in, reached through public API only
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.array.codes
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy()      # no copy for numpy-backed columns (numbers, datetime64)
+    raise TypeError(f"can't share column {series.name!r} of dtype {series.dtype}: convert it in DERIVED")
+
+
+def assert_frozen(df):
+    # Fails loudly if a pandas release copied on construction, or something consolidated the frame into
+    # fresh (writable) arrays after it was frozen
+    writable = [name for name in df.columns if _column_buffer(df[name]).flags.writeable]
+    if writable:
+        raise RuntimeError(f"shared dataset columns {writable} are writable after freezing (pandas {pd.__version__})")
+    return df
+
+
+def freeze(df):
+    # Rebuild the frame (copy=False) on read-only views of each column's buffer: one block per column,
+    # nothing to consolidate, no pandas internals
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        buffer = _column_buffer(series).view()
+        buffer.flags.writeable = False
+        columns[name] = pd.Categorical.from_codes(buffer, dtype=series.dtype) if isinstance(series.dtype, pd.CategoricalDtype) else buffer
+    return assert_frozen(FrozenFrame(pd.DataFrame(columns, index=df.index, copy=False)))
+
+
+def _materialize(name):
+    table = load_table(name, as_arrow=True)
+    if table is None:
+        return EMPTY
+    return freeze(DERIVED.get(name, lambda t: t.to_pandas())(table))
+
+
+def get_dataset(name):
+    # Same object for every caller while the source is unchanged (a missing CSV keeps the Parquet copy)
+    csv_path = DATASETS[name]['csv']
+    stamp = source_stamp(name) if os.path.exists(csv_path) else None
+    with _lock:
+        cached = _memory.get(name)
+        if cached is not None and cached[0] == stamp:
+            return assert_frozen(cached[1])
+        # Sessions arriving mid-load wait here instead of materializing a second copy
+        frame = _materialize(name)
+        _memory[name] = (stamp, frame)
+        return frame
+
+
+def frame_bytes(df):
+    # Column buffer bytes, index included (categorical categories counted once)
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Materialize the shared dashboard datasets and report their size")
+    parser.add_argument('--datasets', nargs='+', default=list(DERIVED), choices=list(DATASETS))
+    args = parser.parse_args()
+
+    for name in args.datasets:
+        df = get_dataset(name)
+        print(f"✅ {name}: {len(df):,} rows x {df.shape[1]} columns, {frame_bytes(df) / 2**20:,.2f} MiB shared "
+              f"({', '.join(df.columns)})")
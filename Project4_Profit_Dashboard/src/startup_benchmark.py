@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import statistics
+_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+if _root not in sys.path:
+    sys.path.append(_root)      # repo root: shared pipeline_utils
+from pipeline_utils import atomic_write
+
+# ==========================================
+# ⏱️ Cold-Start Benchmark (per page, fresh interpreter each run)
+# ==========================================
+# Each run starts a new Python process that renders one page headlessly (Streamlit AppTest, page
+# picked with ?page=N) exactly like the first request on a fresh container: framework import, then
+# the first script run with every import it triggers (measured with -X importtime), then the time
+# until the background warm-up has finished. Results go to artifacts/startup_benchmark.json;
+# --check compares against a saved baseline and exits non-zero on a regression.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(base_dir, 'app.py')
+RESULT_PATH = os.path.join(base_dir, '..', 'artifacts', 'startup_benchmark.json')
+BASELINE_PATH = os.path.join(base_dir, '..', 'artifacts', 'startup_baseline.json')
+PAGES = [1, 2, 3, 4]
+HEAVY_MODULES = ['plotly.express', 'statsmodels', 'scipy', 'sklearn', 'irf_bootstrap', 'profit_at_risk', 'price_optimizer']
+MARKER = '### first-render ###'
+TOLERANCE = 0.25      # relative slowdown allowed before --check fails
+SLACK = 0.05          # absolute seconds, so tiny timings don't flap
+
+
+def _child(page):
+    # Runs inside the fresh interpreter; prints one JSON line on stdout
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    framework = time.perf_counter() - start
+
+    sys.path.insert(0, base_dir)
+    at = AppTest.from_file(APP_PATH, default_timeout=600)
+    at.query_params['page'] = str(page)
+    print(MARKER, file=sys.stderr, flush=True)
+    render_start = time.perf_counter()
+    at.run()
+    first_render = time.perf_counter() - render_start
+    print(MARKER, file=sys.stderr, flush=True)
+
+    import warmup
+    while warmup.status['state'] != 'done' and time.perf_counter() - render_start < 600:
+        time.sleep(0.05)
+    loaded = set(warmup.status.get('first_page_modules', sys.modules))
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+    print(json.dumps({'page': page, 'framework_import_s': framework, 'first_render_s': first_render,
+                      'warm_s': time.perf_counter() - render_start, 'errors': [e.message for e in at.exception],
+                      'heavy_modules': heavy}))
+
+
+def _import_seconds(stderr):
+    # Sum of self-times of every import between the two markers (= import cost of the first render)
+    inside, total = False, 0
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            if inside:
+                break
+            inside = True
+        elif inside and line.startswith('import time:') and not line.rstrip().endswith('| imported package'):
+            field = line.split(':', 1)[1].split('|')[0].strip()
+            if field.isdigit():
+                total += int(field)
+    return total / 1e6
+
+
+def measure_page(page):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', __file__, '--child', str(page)],
+                          capture_output=True, text=True, cwd=base_dir)
+    if proc.returncode != 0:
+        raise RuntimeError(f"page {page} benchmark failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result['page_import_s'] = _import_seconds(proc.stderr)
+    return result
+
+
+def run_benchmark(pages=PAGES, repeat=3):
+    # Median per page over `repeat` fresh processes
+    results = {}
+    for page in pages:
+        runs = [measure_page(page) for _ in range(repeat)]
+        results[str(page)] = {key: statistics.median(r[key] for r in runs) for key in ('framework_import_s', 'page_import_s', 'first_render_s', 'warm_s')}
+        results[str(page)]['heavy_modules'] = runs[-1]['heavy_modules']
+        results[str(page)]['errors'] = runs[-1]['errors']
+    return results
+
+
+def regressions(results, baseline, tolerance=TOLERANCE, slack=SLACK):
+    found = []
+    for page, row in results.items():
+        ref = baseline.get(page)
+        if ref is None:
+            continue
+        for key in ('page_import_s', 'first_render_s'):
+            if row[key] > ref[key] * (1 + tolerance) + slack:
+                found.append(f"page {page} {key}: {ref[key]:.3f}s -> {row[key]:.3f}s")
+    return found
+
+
+def _write_json(obj, path):
+    atomic_write(path, lambda f: json.dump(obj, f, indent=2), mode='w')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Cold-start import / first-render benchmark per dashboard page")
+    parser.add_argument('--pages', type=int, nargs='+', default=PAGES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save-baseline', action='store_true', help=f"store this run as {BASELINE_PATH}")
+    parser.add_argument('--check', action='store_true', help="exit 1 if slower than the saved baseline")
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child)
+        sys.exit(0)
+
+    results = run_benchmark(args.pages, args.repeat)
+    _write_json(results, RESULT_PATH)
+    print(f"{'page':>4} {'framework':>10} {'imports':>8} {'1st render':>11} {'warm':>7}  heavy modules")
+    for page, row in results.items():
+        print(f"{page:>4} {row['framework_import_s']:>9.2f}s {row['page_import_s']:>7.2f}s {row['first_render_s']:>10.2f}s "
+              f"{row['warm_s']:>6.2f}s  {', '.join(row['heavy_modules'])}{'  ⚠️ ' + row['errors'][0] if row['errors'] else ''}")
+    if args.save_baseline:
+        _write_json(results, BASELINE_PATH)
+        print(f"✅ Baseline saved -> {BASELINE_PATH}")
+    if args.check:
+        if not os.path.exists(BASELINE_PATH):
+            sys.exit(f"No baseline at {BASELINE_PATH}; run with --save-baseline first")
+        with open(BASELINE_PATH) as f:
+            found = regressions(results, json.load(f))
+        if found:
+            print("❌ Cold-start regression:\n  " + "\n  ".join(found))
+            sys.exit(1)
+        print("✅ No cold-start regression against the baseline")
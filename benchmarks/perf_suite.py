@@ -0,0 +1,254 @@
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 📏 Performance Suite (hot paths x data scale factor, stored baseline)
+# ==========================================
+# Times each hot path in isolation on synthetic data at several TPC-style scale factors (SF=1 is the
+# shipped data size), so it's visible how a path grows with the data, not just how fast it is today:
+#   generate.*  synthetic_data.write_table          load.*   data_store.load_table (full / pruned columns)
+#   fit.*       panel cube, FE + cell elasticities, market segments, VAR fit / forecast / IRF / bootstrap,
+#               per-series demand forecasts (vectorized damped Holt) and their hierarchical reconciliation
+#   page2.*     catalogue inputs + optimal prices and profit curves (price_optimizer)
+#   page4.*     robust anomaly fit + top-k scan, segment assignment
+#   app.*       end-to-end Streamlit page render and rerun on the shipped data (AppTest, no browser)
+# Setup (data generation, model state) is outside the timed region; each case reports the median
+# over --repeat runs. Results go to artifacts/perf_results.json; --check compares against the saved
+# baseline and exits non-zero on a regression. Cold start is startup_benchmark.py's job.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.abspath(os.path.join(base_dir, '..'))
+for _path in [root_dir] + [os.path.join(root_dir, p, 'src') for p in ['Project1_Price_Elasticity', 'Project2_TimeSeries_Forecast',
+                                                                       'Project3_Market_Clustering', 'Project4_Profit_Dashboard']]:
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+from pipeline_utils import atomic_write
+
+RESULT_PATH = os.path.join(root_dir, 'artifacts', 'perf_results.json')
+BASELINE_PATH = os.path.join(root_dir, 'artifacts', 'perf_baseline.json')
+APP_PATH = os.path.join(root_dir, 'Project4_Profit_Dashboard', 'src', 'app.py')
+
+SCALE_FACTORS = [1, 10, 100]
+MARKET_SCALE = 100      # 50 markets at SF=1; scaled harder so SF=100 reaches dealer-level row counts
+VAR_ROWS = 75           # months in the shipped VAR data (SF=1)
+REPEAT = 3
+TOLERANCE = 0.25        # relative slowdown allowed before --check fails
+SLACK = 0.02            # absolute seconds, so millisecond cases don't flap
+PAGES = [1, 2, 3, 4]
+
+
+def _timed(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+@contextmanager
+def _redirect_dataset(name, csv_path):
+    # Point data_store at a generated copy (its Parquet sits next to the would-be CSV)
+    from data_store import DATASETS
+    original = DATASETS[name]['csv']
+    DATASETS[name]['csv'] = csv_path
+    try:
+        yield
+    finally:
+        DATASETS[name]['csv'] = original
+
+
+def _var_frame(sf, seed=7):
+    # Longer macro history with the dynamics of the shipped data: simulate the fitted VAR(2)
+    from var_artifacts import load_var_frame
+    from var_core import fit_var, simulate
+    df = load_var_frame()
+    fit = fit_var(df.to_numpy(dtype=np.float64), 2)
+    n = VAR_ROWS * sf
+    rng = np.random.default_rng(seed)
+    shocks = rng.multivariate_normal(np.zeros(df.shape[1]), fit['sigma_u'], size=n)
+    paths = simulate(fit['intercept'], fit['coefs'], df.to_numpy()[:2], shocks)[2:]
+    # Integer index: SF=100 monthly dates would run past pandas' Timestamp range
+    return pd.DataFrame(paths, columns=df.columns)
+
+
+def scale_cases(sf, work_dir):
+    # -> {case: (callable, rows processed)}; everything a case needs is prepared here, untimed
+    from synthetic_data import write_table
+    from data_store import load_table
+    from panel_cube import build_cube
+    from fe_elasticity import estimate_elasticities, read_panel_codes
+    from cell_elasticity import estimate_cells
+    from price_optimizer import catalogue_inputs, solve_catalogue
+    from market_segments import fit_segments, get_segments, assign, iter_chunks
+    from pricing_anomaly import fit_price_model, score_anomalies
+    from irf_bootstrap import bootstrap_irfs
+    from demand_forecast import read_demand, build_hierarchy, fit_series, reconcile
+
+    panel_dir, market_dir = os.path.join(work_dir, 'panel'), os.path.join(work_dir, 'markets')
+    os.makedirs(panel_dir, exist_ok=True)
+    os.makedirs(market_dir, exist_ok=True)
+    panel_csv = os.path.join(panel_dir, 'panel_sales_data.csv')
+    panel_pq = os.path.join(panel_dir, 'panel_sales_data.parquet')
+    markets_pq = os.path.join(market_dir, 'markets.parquet')
+    market_sf = sf * MARKET_SCALE
+    n_panel = write_table('panel', sf, panel_pq)
+    n_markets = write_table('markets', market_sf, markets_pq)
+
+    with _redirect_dataset('panel', panel_csv):
+        panel = load_table('panel')
+    codes = read_panel_codes(panel_pq)
+    cube = build_cube(panel)
+    fe = estimate_elasticities(codes)
+    cells = estimate_cells(codes)
+    inputs = catalogue_inputs(cube, fe, cells)
+    markets = pd.concat(iter_chunks(markets_pq, columns=['GDP_Per_Capita', 'Avg_Part_Price_USD', 'Inflation_Rate',
+                                                         'Annual_Sales_Volume', 'Country_Code']), ignore_index=True)
+    price_model = fit_price_model(markets)
+    segments = get_segments()
+    df_var = _var_frame(sf)
+    hierarchy = build_hierarchy(read_demand(panel_pq))
+    demand_base, demand_mse, _ = fit_series(hierarchy['y'], 'holt')
+
+    def load_full():
+        with _redirect_dataset('panel', panel_csv):
+            load_table('panel')
+
+    def load_pruned():
+        with _redirect_dataset('panel', panel_csv):
+            load_table('panel', ['Part', 'Price_USD'])
+
+    def var_fit():
+        from statsmodels.tsa.api import VAR
+        return VAR(df_var).fit(2)
+
+    fitted = var_fit()
+    return {
+        'generate.panel': (lambda: write_table('panel', sf, os.path.join(work_dir, 'gen_panel.parquet')), n_panel),
+        'generate.markets': (lambda: write_table('markets', market_sf, os.path.join(work_dir, 'gen_markets.parquet')), n_markets),
+        'load.panel': (load_full, n_panel),
+        'load.panel_pruned': (load_pruned, n_panel),
+        'fit.panel_cube': (lambda: build_cube(panel), n_panel),
+        'fit.fe_elasticity': (lambda: estimate_elasticities(codes), n_panel),
+        'fit.cell_elasticity': (lambda: estimate_cells(codes), n_panel),
+        'fit.market_segments': (lambda: fit_segments(markets_pq), n_markets),
+        'fit.var': (var_fit, len(df_var)),
+        'fit.var_forecast': (lambda: fitted.forecast(df_var.values[-fitted.k_ar:], steps=24), len(df_var)),
+        'fit.var_irf': (lambda: fitted.irf(12).orth_irfs, len(df_var)),
+        'fit.var_bootstrap': (lambda: bootstrap_irfs(df_var.to_numpy(), lags=2, horizon=12, reps=200), len(df_var)),
+        'fit.demand_forecast': (lambda: fit_series(hierarchy['y'], 'holt'), len(hierarchy['y'])),
+        'fit.demand_reconcile': (lambda: reconcile(hierarchy, demand_base, demand_mse), len(hierarchy['y'])),
+        'page2.catalogue_inputs': (lambda: catalogue_inputs(cube, fe, cells), len(inputs)),
+        'page2.solve_catalogue': (lambda: solve_catalogue(inputs), len(inputs)),
+        'page4.anomaly_fit': (lambda: fit_price_model(markets), n_markets),
+        'page4.anomaly_scan': (lambda: score_anomalies(price_model, [markets.iloc[i:i + 100_000] for i in range(0, len(markets), 100_000)]), n_markets),
+        'page4.segment_assign': (lambda: assign(segments, markets), n_markets),
+    }
+
+
+def run_scale(sf, repeat=REPEAT, only=None):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix=f'perf_sf{sf}_') as work_dir:
+        for case, (fn, rows) in scale_cases(sf, work_dir).items():
+            if only and not any(case.startswith(prefix) for prefix in only):
+                continue
+            runs = _timed(fn, repeat)
+            results[f"{case}@sf{sf}"] = {'median_s': statistics.median(runs), 'min_s': min(runs), 'rows': int(rows)}
+            print(f"  {case + '@sf' + str(sf):<32} {statistics.median(runs):>9.4f}s  ({int(rows):,} rows)", flush=True)
+    return results
+
+
+def run_app(repeat=REPEAT):
+    # First render of each page in a warm process, then the median of plain reruns (what a widget click costs)
+    from streamlit.testing.v1 import AppTest
+    results = {}
+    for page in PAGES:
+        at = AppTest.from_file(APP_PATH, default_timeout=600)
+        at.query_params['page'] = str(page)
+        first = _timed(at.run, 1)[0]
+        if at.exception:
+            raise RuntimeError(f"page {page} failed: {at.exception[0].message}")
+        runs = _timed(at.run, max(repeat, 3))
+        results[f"app.page{page}_first_render"] = {'median_s': first, 'min_s': first, 'rows': 0}
+        results[f"app.page{page}_rerun"] = {'median_s': statistics.median(runs), 'min_s': min(runs), 'rows': 0}
+        print(f"  {'app.page' + str(page):<32} {first:>9.4f}s first, {statistics.median(runs):.4f}s rerun", flush=True)
+    return results
+
+
+def regressions(results, baseline, tolerance=TOLERANCE, slack=SLACK):
+    found = []
+    for case, row in results.items():
+        ref = baseline.get('cases', {}).get(case)
+        if ref is not None and row['median_s'] > ref['median_s'] * (1 + tolerance) + slack:
+            found.append(f"{case}: {ref['median_s']:.4f}s -> {row['median_s']:.4f}s ({row['median_s'] / ref['median_s'] - 1:+.0%})")
+    return found
+
+
+def scaling_table(results):
+    # case x scale factor grid of medians (seconds)
+    rows = {}
+    for key, row in results.items():
+        case, _, sf = key.partition('@sf')
+        rows.setdefault(case, {})[f"sf{sf}" if sf else 'app'] = row['median_s']
+    return pd.DataFrame(rows).T
+
+
+def _write_json(obj, path):
+    atomic_write(path, lambda f: json.dump(obj, f, indent=2), mode='w')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Hot-path benchmarks across data scale factors, with baseline regression check")
+    parser.add_argument('--sf', type=float, nargs='+', default=SCALE_FACTORS, help="scale factors (1 = shipped data size)")
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--only', nargs='+', help="case name prefixes, e.g. fit.var page4.")
+    parser.add_argument('--no-app', action='store_true', help="skip the end-to-end page renders")
+    parser.add_argument('--save-baseline', action='store_true', help=f"store this run as {BASELINE_PATH}")
+    parser.add_argument('--check', action='store_true', help="exit 1 if slower than the saved baseline")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = {}
+    for sf in args.sf:
+        sf = int(sf) if float(sf).is_integer() else sf
+        print(f"SF={sf}")
+        results.update(run_scale(sf, args.repeat, args.only))
+    if not args.no_app and (not args.only or any(p.startswith('app') for p in args.only)):
+        print("End-to-end page renders (shipped data)")
+        results.update(run_app(args.repeat))
+
+    report = {'meta': {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+                       'cpus': os.cpu_count(), 'machine': platform.machine(), 'repeat': args.repeat,
+                       'created': time.strftime('%Y-%m-%dT%H:%M:%S')},
+              'cases': results}
+    _write_json(report, RESULT_PATH)
+    print(scaling_table(results).to_string(float_format=lambda v: f"{v:.4f}"))
+    print(f"✅ {len(results)} cases in {time.perf_counter() - start:.1f}s -> {RESULT_PATH}")
+
+    if args.save_baseline:
+        _write_json(report, BASELINE_PATH)
+        print(f"✅ Baseline saved -> {BASELINE_PATH}")
+    if args.check:
+        if not os.path.exists(BASELINE_PATH):
+            sys.exit(f"No baseline at {BASELINE_PATH}; run with --save-baseline first")
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('cpus') != report['meta']['cpus']:
+            print(f"⚠️ Baseline was recorded on {baseline['meta'].get('cpus')} CPUs, this run has {report['meta']['cpus']}")
+        found = regressions(results, baseline, args.tolerance)
+        if found:
+            print("❌ Performance regression:\n  " + "\n  ".join(found))
+            sys.exit(1)
+        print("✅ No regression against the baseline")
@@ -0,0 +1,129 @@
+import os
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 👥 Concurrent Session Load Test (dataset memory vs number of sessions)
+# ==========================================
+# Simulates N dashboard sessions that are all mid-run at once (N threads, each holding what page 4
+# reads until every session has loaded), on a market table scaled to --rows rows, and reports the
+# memory held by dataset frames for 1 -> 100 sessions. Two access modes are compared:
+#   cache_data  what st.cache_data did: every call unpickles its own copy, page 4 then added Log_GDP on another copy
+#   shared      shared_data.get_dataset: one frozen frame per process, Log_GDP precomputed, sessions hold a reference
+# Memory is reported three ways while the sessions hold their frames: bytes of the distinct frames held,
+# what tracemalloc sees newly allocated (numpy buffers included) and process RSS growth. --check exits 1
+# unless shared frame bytes stay flat (FLAT_LIMIT x the 1-session figure) and no session allocated a copy.
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, base_dir)
+from perf_suite import _redirect_dataset, _write_json, root_dir
+
+RESULT_PATH = os.path.join(root_dir, 'artifacts', 'session_load.json')
+SESSIONS = [1, 10, 100]
+ROWS = 100_000          # market rows (the shipped World Bank table has 50)
+FLAT_LIMIT = 1.10
+SEED = 11
+
+
+def _market_csv(rows, path, seed=SEED):
+    # World Bank-shaped market table: the shipped countries resampled with jitter
+    from data_store import load_table
+    wb = load_table('wb')
+    rng = np.random.default_rng(seed)
+    picked = wb.iloc[rng.integers(0, len(wb), rows)].reset_index(drop=True)
+    noise = lambda: rng.lognormal(0.0, 0.1, rows)
+    df = pd.DataFrame({'Country_Code': picked['Country_Code'].astype(str),
+                       'Inflation_Rate': picked['Inflation_Rate'] * noise(), 'GDP_Per_Capita': picked['GDP_Per_Capita'] * noise(),
+                       'Avg_Part_Price_USD': picked['Avg_Part_Price_USD'] * noise(),
+                       'Annual_Sales_Volume': (picked['Annual_Sales_Volume'] * noise()).round().astype(int)})
+    df.to_csv(path, index=False)
+    return path
+
+
+def _rss():
+    from perf_metrics import memory_snapshot
+    return memory_snapshot()['rss'] or 0
+
+
+def _session_loader(mode):
+    # -> zero-arg callable returning what one page-4 run holds
+    import shared_data
+    shared_data._memory.clear()
+    if mode == 'shared':
+        return lambda: shared_data.get_dataset('wb')
+    from data_store import load_table
+    cached = pickle.dumps(load_table('wb'))       # st.cache_data keeps pickled bytes, one unpickle per call
+    def load():
+        df_wb = pickle.loads(cached)
+        return df_wb, df_wb.assign(Log_GDP=np.log10(df_wb['GDP_Per_Capita']))
+    return load
+
+
+def run_sessions(mode, n_sessions):
+    traced_before = tracemalloc.get_traced_memory()[0]
+    rss_before = _rss()
+    load = _session_loader(mode)
+    loaded, release = threading.Barrier(n_sessions + 1), threading.Event()
+    held = [None] * n_sessions
+
+    def session(i):
+        held[i] = load()
+        loaded.wait()
+        release.wait()        # keep the frames alive until memory has been measured
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(n_sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    loaded.wait()
+    elapsed = time.perf_counter() - start
+    traced = tracemalloc.get_traced_memory()[0] - traced_before
+    rss = _rss() - rss_before
+    from shared_data import frame_bytes
+    frames = {id(f): f for h in held for f in (h if isinstance(h, tuple) else (h,))}
+    held_bytes = sum(frame_bytes(f) for f in frames.values())
+    release.set()
+    for t in threads:
+        t.join()
+    del held
+    return {'mode': mode, 'sessions': n_sessions, 'frames': len(frames), 'frame_mib': held_bytes / 2**20,
+            'traced_mib': traced / 2**20, 'rss_growth_mib': rss / 2**20, 'load_s': elapsed}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Dataset memory with N concurrent dashboard sessions (st.cache_data copies vs shared frames)")
+    parser.add_argument('--rows', type=int, default=ROWS)
+    parser.add_argument('--sessions', type=int, nargs='+', default=SESSIONS)
+    parser.add_argument('--modes', nargs='+', default=['cache_data', 'shared'], choices=['cache_data', 'shared'])
+    parser.add_argument('--check', action='store_true', help=f"exit 1 unless shared memory stays within {FLAT_LIMIT}x of 1 session")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = _market_csv(args.rows, os.path.join(work_dir, 'worldbank_market_data.csv'))
+        with _redirect_dataset('wb', csv_path):
+            from shared_data import get_dataset, frame_bytes
+            dataset_mib = frame_bytes(get_dataset('wb')) / 2**20
+            print(f"Market table: {args.rows:,} rows, {dataset_mib:.1f} MiB as a shared frame")
+            tracemalloc.start()
+            rows = [run_sessions(mode, n) for mode in args.modes for n in args.sessions]
+            tracemalloc.stop()
+
+    table = pd.DataFrame(rows)
+    print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    _write_json({'rows': args.rows, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'runs': rows}, RESULT_PATH)
+    print(f"✅ {len(rows)} runs -> {RESULT_PATH}")
+
+    if args.check and 'shared' in args.modes:
+        shared = table[table['mode'] == 'shared'].set_index('sessions')
+        ratio = shared['frame_mib'].iloc[-1] / shared['frame_mib'].iloc[0]
+        if ratio > FLAT_LIMIT or shared['traced_mib'].max() > dataset_mib:
+            sys.exit(f"❌ shared dataset memory grew {ratio:.2f}x from {shared.index[0]} to {shared.index[-1]} sessions "
+                     f"(max {shared['traced_mib'].max():.1f} MiB newly allocated)")
+        print(f"✅ shared dataset memory flat: {ratio:.2f}x from {shared.index[0]} to {shared.index[-1]} sessions")
@@ -1,16 +1,24 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
-from statsmodels.tsa.api import VAR
+import sys
+import json
+import time
+import hashlib
+import inspect
+import argparse
 import matplotlib.ticker as ticker
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # ==========================================
 # 🎨 SCI-Paper Level Plot Settings
 # ==========================================
 # Use a professional seaborn context and aesthetic style
-sns.set_theme(context='paper', style='ticks', font='Malgun Gothic', rc={
+STYLE = {
     'axes.spines.top': False,
     'axes.spines.right': False,
     'axes.linewidth': 1.2,
@@ -22,95 +30,141 @@ sns.set_theme(context='paper', style='ticks', font='Malgun Gothic', rc={
     'figure.titlesize': 18,
     'grid.alpha': 0.3,
     'grid.linestyle': '--'
-})
+}
+sns.set_theme(context='paper', style='ticks', font='Malgun Gothic', rc=STYLE)
 plt.rcParams['axes.unicode_minus'] = False
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
 image_dir = os.path.join(base_dir, 'images')
-os.makedirs(image_dir, exist_ok=True)
+draft_dir = os.path.join(image_dir, 'draft')
+MANIFEST_PATH = os.path.join(base_dir, 'artifacts', 'report_manifest.json')
+
+FINAL_DPI = 600
+DRAFT_DPI = 100     # --draft: same figures, ~1/36 of the pixels, written to images/draft/
+
+# Shared fitted-VAR artifact store (same fit as the dashboard's page 3) and panel FE estimator
+sys.path.insert(0, os.path.join(base_dir, 'Project2_TimeSeries_Forecast', 'src'))
+sys.path.insert(0, os.path.join(base_dir, 'Project1_Price_Elasticity', 'src'))
+from var_artifacts import get_var_artifact, column_index, SPEC_PATH
+from irf_bootstrap import get_irf_bands
+from fe_elasticity import load_elasticities, DEFAULT_PANEL_PATH
+from pipeline_utils import atomic_write
+
+var_path = os.path.join(base_dir, 'Project2_TimeSeries_Forecast', 'data', 'var_macro_data.csv')
+wb_path = os.path.join(base_dir, 'Project3_Market_Clustering', 'data', 'worldbank_market_data.csv')
+
+
+def load_var_frame():
+    df_var = pd.read_csv(var_path)
+    df_var['Date'] = pd.to_datetime(df_var['Date'])
+    df_var.set_index('Date', inplace=True)
+    return df_var
+
+
+def save_figure(fig, out_path, dpi):
+    # An interrupted build never leaves a truncated PNG behind
+    atomic_write(out_path, lambda tmp: fig.savefig(tmp, dpi=dpi, bbox_inches='tight', format='png'))
+    plt.close(fig)
+
 
 # ==========================================
 # 📉 1. FE vs OLS (Bar Chart with Error Bars)
 # ==========================================
-fig, ax = plt.subplots(figsize=(9, 6), dpi=600)
-parts = ['Brake Pad', 'Oil Filter', 'Spark Plug']
-ols_vals = [-0.60, -1.20, -0.95]
-fe_vals = [-0.85, -1.45, -1.15]
-
-# Simulate standard errors for academic realism
-ols_err = [0.15, 0.20, 0.18]
-fe_err = [0.08, 0.12, 0.10] # FE typically has tighter or more robust SEs if specified well
-
-x = np.arange(len(parts))
-width = 0.35
-
-# Professional colors
-color_ols = '#D65F5F' # Muted Red
-color_fe = '#4878D0'  # Muted Blue
-
-bar1 = ax.bar(x - width/2, ols_vals, width, yerr=ols_err, label='OLS (Uncontrolled)', 
-              color=color_ols, capsize=5, edgecolor='black', linewidth=1.2, alpha=0.8)
-bar2 = ax.bar(x + width/2, fe_vals, width, yerr=fe_err, label='Panel FE (Controlled)', 
-              color=color_fe, capsize=5, edgecolor='black', linewidth=1.2, alpha=0.9)
-
-ax.set_ylabel('Price Elasticity Coefficient ($\epsilon$)', fontweight='bold')
-ax.set_title('Figure 1. Comparison of Price Elasticity Estimates: OLS vs. Panel Fixed Effects', pad=20, fontweight='bold')
-ax.set_xticks(x)
-ax.set_xticklabels(parts, fontweight='bold')
-ax.axhline(0, color='black', linewidth=1.2)
-
-# Add p-value stars to emphasize significance
-for i in range(len(parts)):
-    ax.text(x[i] + width/2, fe_vals[i] - fe_err[i] - 0.05, '***', ha='center', va='top', fontsize=14, color='black')
-
-ax.legend(loc='lower left', frameon=True, fancybox=True, shadow=True)
-ax.yaxis.grid(True)
-plt.tight_layout()
-plt.savefig(os.path.join(image_dir, '1_fe_vs_ols.png'), dpi=600, bbox_inches='tight')
-plt.close()
+def fe_vs_ols(out_path, dpi):
+    fig, ax = plt.subplots(figsize=(9, 6), dpi=dpi)
+    elasticities = load_elasticities()
+    ols_res = elasticities[elasticities['Model'] == 'OLS'].set_index('Part')
+    fe_res = elasticities[elasticities['Model'] == 'FE'].set_index('Part').loc[ols_res.index]
+    note = None
+    if not (fe_res['Elasticity'] < 0).all():
+        # Same rule as the dashboard: a non-negative FE estimate is no usable demand response, so draw the
+        # report's documented values instead (FE = price_optimizer.PRIOR_ELASTICITY) and say so on the figure
+        estimated = ', '.join(f"{part.replace('_', ' ')} {e:+.2f}" for part, e in fe_res['Elasticity'].items())
+        note = f"Reference values (report text). Panel FE estimates on the current data are not negative: {estimated}"
+        reference = ['Brake_Pad', 'Oil_Filter', 'Spark_Plug']
+        # Documented error bars are 95% CI half-widths
+        ols_res = pd.DataFrame({'Elasticity': [-0.60, -1.20, -0.95], 'SE': np.array([0.15, 0.20, 0.18]) / 1.96}, index=reference)
+        fe_res = pd.DataFrame({'Elasticity': [-0.85, -1.45, -1.15], 'SE': np.array([0.08, 0.12, 0.10]) / 1.96}, index=reference)
+        fe_res['t_stat'] = fe_res['Elasticity'] / fe_res['SE']
+    parts = [name.replace('_', ' ') for name in ols_res.index]
+    ols_vals = ols_res['Elasticity'].values
+    fe_vals = fe_res['Elasticity'].values
+
+    # 95% CI half-widths from country-clustered standard errors
+    ols_err = 1.96 * ols_res['SE'].values
+    fe_err = 1.96 * fe_res['SE'].values
+
+    x = np.arange(len(parts))
+    width = 0.35
+
+    # Professional colors
+    color_ols = '#D65F5F' # Muted Red
+    color_fe = '#4878D0'  # Muted Blue
+
+    bar1 = ax.bar(x - width/2, ols_vals, width, yerr=ols_err, label='OLS (Uncontrolled)',
+                  color=color_ols, capsize=5, edgecolor='black', linewidth=1.2, alpha=0.8)
+    bar2 = ax.bar(x + width/2, fe_vals, width, yerr=fe_err, label='Panel FE (Controlled)',
+                  color=color_fe, capsize=5, edgecolor='black', linewidth=1.2, alpha=0.9)
+
+    ax.set_ylabel('Price Elasticity Coefficient ($\\epsilon$)', fontweight='bold')
+    ax.set_title('Figure 1. Comparison of Price Elasticity Estimates: OLS vs. Panel Fixed Effects', pad=20, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(parts, fontweight='bold')
+    ax.axhline(0, color='black', linewidth=1.2)
+
+    # Add p-value stars to emphasize significance (two-sided, normal approximation)
+    def significance_stars(t):
+        return '***' if abs(t) > 2.576 else '**' if abs(t) > 1.96 else '*' if abs(t) > 1.645 else ''
+
+    for i in range(len(parts)):
+        y_tip = fe_vals[i] - fe_err[i] - 0.05 if fe_vals[i] < 0 else fe_vals[i] + fe_err[i] + 0.05
+        ax.text(x[i] + width/2, y_tip, significance_stars(fe_res['t_stat'].values[i]), ha='center',
+                va='top' if fe_vals[i] < 0 else 'bottom', fontsize=14, color='black')
+
+    ax.legend(loc='lower left', frameon=True, fancybox=True, shadow=True)
+    ax.yaxis.grid(True)
+    if note:
+        fig.text(0.5, -0.01, note, ha='center', va='top', fontsize=8, style='italic', color='#555555')
+    plt.tight_layout()
+    save_figure(fig, out_path, dpi)
+
 
 # ==========================================
 # 📊 2. VAR IRF (Manual Plot with Confidence Intervals)
 # ==========================================
-try:
-    var_path = os.path.join(base_dir, 'Project2_TimeSeries_Forecast', 'data', 'var_macro_data.csv')
-    df_var = pd.read_csv(var_path)
-    df_var['Date'] = pd.to_datetime(df_var['Date'])
-    df_var.set_index('Date', inplace=True)
-    
-    model = VAR(df_var)
-    var_fitted = model.fit(2) 
-    irf = var_fitted.irf(12)
-    
-    # Extract IRF and standard errors manually for a beautiful academic plot
-    # irfs shape: (n_step, n_var, n_var), stderr shape: same
-    orth_irfs = irf.orth_irfs
-    orth_stderr = irf.orth_stderr()
-    
+def var_irf(out_path, dpi, horizon=12, method='residual', reps=1000):
+    var_art = get_var_artifact(var_path, irf_horizon=horizon)
+
+    # Extract IRF and residual-bootstrap percentile bands (cached per data fingerprint) for a beautiful academic plot
+    # irfs shape: (n_step, n_var, n_var), band shape: same
+    orth_irfs = var_art['orth_irfs']
+    bands = get_irf_bands(var_path, horizon=horizon, method=method, reps=reps)
+
     # Index of KRW_USD as impulse, Steel/Alum as response
-    impulse_idx = list(df_var.columns).index('KRW_USD')
-    steel_idx = list(df_var.columns).index('Steel_Index')
-    alum_idx = list(df_var.columns).index('Aluminum_Index')
-    
-    steps = np.arange(13) # 0 to 12
-    
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5.5), dpi=600)
-    fig.suptitle('Figure 2. Orthogonalized Impulse Response Functions (Shock: 1 SD KRW/USD)', 
+    # (the selected VAR spec may drop a response series; plot only the ones in the system)
+    impulse_idx = column_index(var_art, 'KRW_USD')
+
+    steps = np.arange(orth_irfs.shape[0]) # 0 to 12
+
+    responses = [(name, column_index(var_art, col), color) for name, col, color in
+                 [('Steel Index', 'Steel_Index', '#2ecc71'), ('Aluminum Index', 'Aluminum_Index', '#e67e22')]
+                 if col in var_art['columns']]
+
+    fig, axes = plt.subplots(1, len(responses), figsize=(7 * len(responses), 5.5), dpi=dpi, squeeze=False)
+    axes = axes[0]
+    fig.suptitle('Figure 2. Orthogonalized Impulse Response Functions (Shock: 1 SD KRW/USD)',
                  fontsize=18, fontweight='bold', y=1.05)
-    
-    responses = [('Steel Index', steel_idx, '#2ecc71'), ('Aluminum Index', alum_idx, '#e67e22')]
-    
+
     for ax, (name, r_idx, color) in zip(axes, responses):
         y = orth_irfs[:, r_idx, impulse_idx]
-        se = orth_stderr[:, r_idx, impulse_idx]
-        
-        # 95% CI
-        lower = y - 1.96 * se
-        upper = y + 1.96 * se
-        
+
+        # 95% CI (residual bootstrap, 1000 replications)
+        lower = bands['lower'][:, r_idx, impulse_idx]
+        upper = bands['upper'][:, r_idx, impulse_idx]
+
         ax.plot(steps, y, color=color, linewidth=2.5, marker='o', markersize=6, label='Response')
-        ax.fill_between(steps, lower, upper, color=color, alpha=0.2, label='95% CI')
-        
+        ax.fill_between(steps, lower, upper, color=color, alpha=0.2, label='95% CI (Bootstrap)')
+
         ax.axhline(0, color='black', linestyle='--', linewidth=1.5)
         ax.set_title(f'Response of {name}', fontsize=14, fontweight='bold')
         ax.set_xlabel('Months after Shock (Lag)', fontweight='bold')
@@ -118,127 +172,272 @@ try:
         ax.xaxis.set_major_locator(ticker.MaxNLocator(integer=True))
         ax.grid(True, linestyle=':', alpha=0.6)
         ax.legend(loc='upper right', frameon=True)
-        
+
     plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, '2_var_irf.png'), dpi=600, bbox_inches='tight')
-    plt.close()
-except Exception as e:
-    print("Error on VAR:", e)
+    save_figure(fig, out_path, dpi)
+
 
 # ==========================================
 # 🌐 3. Market Clustering (Regplot + Density)
 # ==========================================
-try:
-    wb_path = os.path.join(base_dir, 'Project3_Market_Clustering', 'data', 'worldbank_market_data.csv')
+def cluster_scatter(out_path, dpi):
     df_wb = pd.read_csv(wb_path)
-    
-    fig, ax = plt.subplots(figsize=(11, 7), dpi=600)
-    
+
+    fig, ax = plt.subplots(figsize=(11, 7), dpi=dpi)
+
     # Use seaborn regplot for CI shading around the trend line
-    sns.regplot(data=df_wb, x=np.log(df_wb['GDP_Per_Capita']), y='Avg_Part_Price_USD', 
+    sns.regplot(data=df_wb, x=np.log(df_wb['GDP_Per_Capita']), y='Avg_Part_Price_USD',
                 scatter=False, ax=ax, color='black', line_kws={'linestyle':'--', 'linewidth': 1.5, 'label': 'Global Pricing Trend (95% CI)'})
-    
+
     # Scatter with color mapping
     scatter = ax.scatter(np.log(df_wb['GDP_Per_Capita']), df_wb['Avg_Part_Price_USD'],
-                         c=df_wb['Inflation_Rate'], cmap='Spectral_r', 
+                         c=df_wb['Inflation_Rate'], cmap='Spectral_r',
                          s=df_wb['Annual_Sales_Volume']/20, alpha=0.85, edgecolors='w', linewidth=0.8)
-    
+
     # Colorbar
     cbar = plt.colorbar(scatter, ax=ax)
     cbar.set_label('Inflation Rate (%)', rotation=270, labelpad=20, fontweight='bold')
-    
+
     # Highlight Specific Anomalies (Top 3 Overpriced, Top 3 Underpriced)
     z = np.polyfit(np.log(df_wb['GDP_Per_Capita']), df_wb['Avg_Part_Price_USD'], 1)
     p = np.poly1d(z)
     df_wb['Expected_Price'] = p(np.log(df_wb['GDP_Per_Capita']))
     df_wb['Residual'] = df_wb['Avg_Part_Price_USD'] - df_wb['Expected_Price']
-    
+
     # Sort and annotate
     extreme_under = df_wb.nsmallest(4, 'Residual')
     extreme_over = df_wb.nlargest(4, 'Residual')
-    
+
     def annotate_points(df, color, label_prefix):
         for _, row in df.iterrows():
-            ax.annotate(row['Country_Code'], 
+            ax.annotate(row['Country_Code'],
                         (np.log(row['GDP_Per_Capita']), row['Avg_Part_Price_USD']),
                         xytext=(0, 10), textcoords='offset points', ha='center',
                         fontsize=10, fontweight='bold', color=color,
                         bbox=dict(boxstyle='round,pad=0.2', fc='white', ec=color, alpha=0.8))
-            
+
     annotate_points(extreme_under, 'blue', 'U')  # Underpriced (Opportunity)
     annotate_points(extreme_over, 'red', 'O')    # Overpriced (Risk)
 
     ax.set_title('Figure 3. Global Market Pricing Anomalies relative to GDP Capacity', pad=20, fontsize=16, fontweight='bold')
     ax.set_xlabel('Log(GDP Per Capita, USD)', fontsize=14, fontweight='bold')
     ax.set_ylabel('Average Part Price (USD)', fontsize=14, fontweight='bold')
-    
+
     ax.legend(loc='upper left', frameon=True)
     ax.grid(True, linestyle=':', alpha=0.5)
-    
+
     plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, '3_cluster_scatter.png'), dpi=600, bbox_inches='tight')
-    plt.close()
-except Exception as e:
-    print("Error on clustering plot:", e)
+    save_figure(fig, out_path, dpi)
+
 
 # ==========================================
 # 📈 4. Macro Trends & Moving Averages (Dual Axis)
 # ==========================================
-try:
-    fig, ax1 = plt.subplots(figsize=(10, 6), dpi=600)
-    
+def macro_trends(out_path, dpi):
+    df_var = load_var_frame()
+    fig, ax1 = plt.subplots(figsize=(10, 6), dpi=dpi)
+
     # Plot KRW/USD
     color_krw = '#e74c3c'
     ax1.set_xlabel('Timeline (Months)', fontweight='bold')
     ax1.set_ylabel('KRW/USD Exchange Rate (₩)', color=color_krw, fontweight='bold')
     line1 = ax1.plot(df_var.index, df_var['KRW_USD'], color=color_krw, linewidth=2, label='KRW/USD')
     ax1.tick_params(axis='y', labelcolor=color_krw)
-    
+
     # Moving Average
     ma_krw = df_var['KRW_USD'].rolling(window=3).mean()
     line_ma = ax1.plot(df_var.index, ma_krw, color='darkred', linestyle='--', linewidth=1.5, alpha=0.7, label='3-Month MA (KRW)')
-    
-    ax2 = ax1.twinx()  
+
+    ax2 = ax1.twinx()
     color_steel = '#2ecc71'
     ax2.set_ylabel('Global Steel Index (pt)', color=color_steel, fontweight='bold')
     line2 = ax2.plot(df_var.index, df_var['Steel_Index'], color=color_steel, linewidth=2, label='Steel Index')
     ax2.tick_params(axis='y', labelcolor=color_steel)
-    
+
     # Combine legends
     lines = line1 + line_ma + line2
     labels = [l.get_label() for l in lines]
     ax1.legend(lines, labels, loc='upper left', frameon=True)
-    
+
     plt.title('Figure 4. Macroeconomic Trend: Exchange Rate vs. Raw Material Cost\n(With 3-Month Moving Average)', fontweight='bold', pad=15)
     fig.tight_layout()
-    plt.savefig(os.path.join(image_dir, '4_macro_trends.png'), dpi=600, bbox_inches='tight')
-    plt.close()
-except Exception as e:
-    print("Error on Macro Trends plot:", e)
+    save_figure(fig, out_path, dpi)
+
 
 # ==========================================
 # 🧩 5. Correlation Heatmap
 # ==========================================
-try:
-    # Merge relevant numerical data from wb and var for a comprehensive heatmap
-    # Using df_wb mostly as it has cross-sectional economic data
+def correlation_heatmap(out_path, dpi):
+    # Using df_wb as it has cross-sectional economic data
+    df_wb = pd.read_csv(wb_path)
     corr_cols = ['GDP_Per_Capita', 'Inflation_Rate', 'Avg_Part_Price_USD', 'Annual_Sales_Volume']
     corr_matrix = df_wb[corr_cols].corr()
-    
+
     # Rename for professional look
     corr_matrix.columns = ['GDP per Capita', 'Inflation Rate', 'Part Price (USD)', 'Sales Volume']
     corr_matrix.index = corr_matrix.columns
-    
-    fig, ax = plt.subplots(figsize=(8, 6), dpi=600)
-    sns.heatmap(corr_matrix, annot=True, fmt=".2f", cmap='coolwarm', vmin=-1, vmax=1, 
+
+    fig, ax = plt.subplots(figsize=(8, 6), dpi=dpi)
+    sns.heatmap(corr_matrix, annot=True, fmt=".2f", cmap='coolwarm', vmin=-1, vmax=1,
                 square=True, linewidths=.5, cbar_kws={"shrink": .8}, ax=ax,
                 annot_kws={"size": 14, "weight": "bold"})
-    
+
     plt.title('Figure 5. Cross-Sectional Correlation Heatmap of Market Variables', fontweight='bold', pad=20)
     plt.tight_layout()
-    plt.savefig(os.path.join(image_dir, '5_correlation_heatmap.png'), dpi=600, bbox_inches='tight')
-    plt.close()
-except Exception as e:
-    print("Error on Correlation Heatmap:", e)
+    save_figure(fig, out_path, dpi)
+
+
+# ==========================================
+# ⚙️ Incremental Parallel Build
+# ==========================================
+# Each figure is an independent task: output file -> (render function, input files, parameters).
+# Its content hash covers the input files' bytes, the parameters, the DPI, the shared style and the
+# code that draws it: the render function and the helpers it calls here (their source), plus every repo
+# module they reach, followed through those modules' imports (whole files: fe_elasticity, var_artifacts,
+# irf_bootstrap, var_core, ...). A PNG is only redrawn when something that shapes it changed.
+# Stale figures render in a process pool; hashes of the last good build live in the manifest.
+FIGURES = {
+    '1_fe_vs_ols.png': (fe_vs_ols, [DEFAULT_PANEL_PATH], {}),
+    '2_var_irf.png': (var_irf, [var_path, SPEC_PATH], {'horizon': 12, 'method': 'residual', 'reps': 1000}),
+    '3_cluster_scatter.png': (cluster_scatter, [wb_path], {}),
+    '4_macro_trends.png': (macro_trends, [var_path], {}),
+    '5_correlation_heatmap.png': (correlation_heatmap, [wb_path], {}),
+}
+
+
+def _referenced(code):
+    # Global names a function refers to, nested lambdas / comprehensions included
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _referenced(const)
+    return names
+
+
+def _repo_file(obj):
+    # Source file of a repo module / function / class; None for the stdlib and installed packages
+    try:
+        path = os.path.abspath(inspect.getsourcefile(obj) or '')
+    except TypeError:
+        return None
+    return path if path.startswith(base_dir + os.sep) and 'site-packages' not in path else None
+
+
+def code_sources(render):
+    # -> {label: source text} for everything in the repo that runs when `render` draws its figure
+    script = _repo_file(render)
+    sources, stack, modules = {}, [render], []
+    while stack:
+        fn = stack.pop()
+        if fn.__name__ in sources:
+            continue
+        sources[fn.__name__] = inspect.getsource(fn)
+        for name in _referenced(fn.__code__):
+            obj = fn.__globals__.get(name)
+            if obj is None or _repo_file(obj) is None:
+                continue
+            if _repo_file(obj) == script:
+                if inspect.isfunction(obj):
+                    stack.append(obj)
+            else:
+                modules.append(inspect.getmodule(obj))
+    files = set()
+    while modules:
+        module = modules.pop()
+        path = _repo_file(module)
+        if path is None or path in files or path == script:
+            continue
+        files.add(path)
+        modules.extend(inspect.getmodule(obj) for obj in vars(module).values()
+                       if (inspect.ismodule(obj) or inspect.isfunction(obj) or inspect.isclass(obj)) and _repo_file(obj))
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            sources[os.path.relpath(path, base_dir)] = f.read()
+    return sources
+
+
+def content_hash(name, dpi):
+    render, inputs, params = FIGURES[name]
+    h = hashlib.sha256()
+    for label, source in sorted(code_sources(render).items()):
+        h.update(label.encode())
+        h.update(hashlib.sha256(source.encode()).digest())
+    h.update(json.dumps({'params': params, 'dpi': dpi, 'style': STYLE}, sort_keys=True).encode())
+    for path in inputs:
+        h.update(os.path.basename(path).encode())
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                h.update(hashlib.sha256(f.read()).digest())
+        else:
+            h.update(b'<missing>')
+    return h.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    atomic_write(path, lambda f: json.dump(manifest, f, indent=2), mode='w')
+
+
+def render_task(name, out_path, dpi):
+    # Runs in a worker process; errors come back as text so one broken figure never stops the others
+    render, _, params = FIGURES[name]
+    start = time.perf_counter()
+    try:
+        render(out_path, dpi, **params)
+        return name, time.perf_counter() - start, None
+    except Exception as e:
+        return name, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+
+def build(names=None, draft=False, workers=None, force=False):
+    dpi, out_dir = (DRAFT_DPI, draft_dir) if draft else (FINAL_DPI, image_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest()
+    section = manifest.setdefault('draft' if draft else 'final', {})
+
+    todo, report = {}, {'rendered': [], 'skipped': [], 'failed': {}}
+    for name in names or FIGURES:
+        digest = content_hash(name, dpi)
+        out_path = os.path.join(out_dir, name)
+        if not force and section.get(name) == digest and os.path.exists(out_path):
+            report['skipped'].append(name)
+        else:
+            todo[name] = (out_path, digest)
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(todo))) as executor:
+            futures = [executor.submit(render_task, name, out_path, dpi) for name, (out_path, _) in todo.items()]
+            for fut in as_completed(futures):
+                name, seconds, error = fut.result()
+                if error:
+                    # No manifest entry: the figure is retried on the next build
+                    section.pop(name, None)
+                    report['failed'][name] = error
+                    print(f"Error on {name}:", error)
+                else:
+                    section[name] = todo[name][1]
+                    report['rendered'].append(name)
+                    print(f"   {name} ({seconds:.1f}s)")
+        save_manifest(manifest)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the report figures (parallel, only figures whose inputs changed)")
+    parser.add_argument('--draft', action='store_true', help=f"{DRAFT_DPI} dpi into images/draft/ for quick iteration")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--force', action='store_true', help="re-render every figure")
+    parser.add_argument('--only', nargs='+', choices=list(FIGURES), help="build just these figures")
+    args = parser.parse_args()
 
-print("SCI-level Images generated successfully in 'images' directory.")
+    start = time.perf_counter()
+    report = build(args.only, args.draft, args.workers, args.force)
+    print(f"SCI-level Images generated successfully in '{os.path.relpath(draft_dir if args.draft else image_dir, base_dir)}' directory: "
+          f"{len(report['rendered'])} rendered, {len(report['skipped'])} up to date, {len(report['failed'])} failed "
+          f"({time.perf_counter() - start:.1f}s)")
@@ -0,0 +1,41 @@
+import os
+import threading
+
+# ==========================================
+# 🧰 Shared Pipeline Helpers (atomic file writes, bounded parallel maps)
+# ==========================================
+# Imported by every project's src modules and the repo-root scripts (each adds the repo root to
+# sys.path, as for synthetic_data.py). Stdlib only, so importing it never pulls in heavy libraries.
+
+
+def atomic_write(path, writer, mode=None):
+    # Write-then-rename so a concurrent reader never sees a half-written file (and an interrupted
+    # write never replaces a good one). writer(tmp_path), or writer(file) when `mode` ('w' / 'wb') is given.
+    # The tmp file is dot-prefixed so directory readers (pyarrow datasets, partition globs) skip it.
+    folder, name = os.path.split(path)
+    os.makedirs(folder or '.', exist_ok=True)
+    tmp_path = os.path.join(folder, f'.{name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        if mode is None:
+            writer(tmp_path)
+        else:
+            with open(tmp_path, mode, encoding='utf-8' if 'b' not in mode else None) as f:
+                writer(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def iter_bounded(executor, fn, tasks, window):
+    # fn(*task) for each task, results in task order, with at most `window` tasks in flight: `tasks` may
+    # be a lazy iterator, and callers that consume each result as it arrives never hold more than that
+    pending = []
+    for task in tasks:
+        pending.append(executor.submit(fn, *task))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for fut in pending:
+        yield fut.result()
@@ -0,0 +1,300 @@
+import os
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+from pipeline_utils import iter_bounded
+
+# ==========================================
+# 🏭 Unified Scale-Factor Synthetic Data Generator (Projects 1 & 3)
+# ==========================================
+# TPC-style: SF=1 matches the size of the original project datasets, larger SF grows every dimension
+# (SKUs x countries x months) for dashboard load tests. Each table is split into fixed partitions whose
+# random streams come from SeedSequence(seed, spawn_key=(table, partition)), so the output is bit-identical
+# no matter how many worker processes build it. Partitions are streamed to disk one at a time, as
+# partitioned Parquet (categorical keys, compact numerics) by default; CSV stays an import/export format.
+
+TABLE_CODES = {'panel': 1, 'sales': 2, 'markets': 3}
+DEFAULT_SEEDS = {'panel': 42, 'sales': 42, 'markets': 2024}
+ROWS_PER_PARTITION = 1_000_000
+
+# Compact on-disk schemas: dictionary-encoded (categorical) keys, float32 prices, int32 counts
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+COMPACT_SCHEMAS = {
+    'panel': pa.schema([('Date', pa.timestamp('ms')), ('Country', _CATEGORY), ('Part', _CATEGORY),
+                        ('Price_USD', pa.float32()), ('Quantity', pa.int32()), ('KRW_USD', pa.float32())]),
+    'sales': pa.schema([('Date', pa.timestamp('ms')), ('Part_ID', _CATEGORY), ('Price', pa.float32()),
+                        ('Quantity', pa.int32()), ('Cost', pa.float32()), ('Revenue', pa.float32()), ('Margin', pa.float32())]),
+    'markets': pa.schema([('Country_ID', pa.string()), ('GDP_Per_Capita_USD', pa.float32()), ('Inflation_Rate_%', pa.float32()),
+                          ('Avg_Part_Price_USD', pa.float32()), ('Annual_Sales_Volume', pa.int32())]),
+}
+
+# Original Project 1 panel (generate_panel_data.py)
+PANEL_COUNTRY_FE = {'USA': 1.2, 'Germany': 1.1, 'Brazil': 0.8, 'India': 0.7, 'Vietnam': 0.6}
+PANEL_PART_FE = {'Brake_Pad': 50, 'Oil_Filter': 20, 'Spark_Plug': 30}
+PANEL_ELASTICITY = {'Brake_Pad': -0.8, 'Oil_Filter': -1.5, 'Spark_Plug': -1.2}
+PANEL_END = '2024-02-01'
+
+# Original Project 1 daily mock (generate_mock_data.py)
+SALES_PARTS = ['Brake_Pad_A', 'Oil_Filter_B', 'Spark_Plug_C', 'Air_Filter_D', 'Shock_Absorber_E']
+SALES_BASE_PRICE = [45.0, 15.0, 25.0, 20.0, 120.0]
+SALES_BASE_COST = [20.0, 5.0, 8.0, 7.0, 60.0]
+SALES_ELASTICITY = [-1.2, -0.8, -1.5, -1.0, -2.0]
+SALES_BASE_DEMAND = [100, 300, 200, 250, 50]
+SALES_DAYS = 1000
+
+# Original Project 3 market mock (generate_market_data.py): Developed / Developing / Emerging
+MARKET_CLUSTER_P = [0.3, 0.4, 0.3]
+MARKET_GDP = ([50000, 15000, 3000], [10000, 5000, 1500])
+MARKET_INFLATION = ([2.0, 5.0, 10.0], [1.0, 2.0, 5.0])
+MARKET_PRICE = ([120, 90, 70], [15, 10, 15])
+MARKET_VOLUME = ([10000, 25000, 5000], [3000, 8000, 2000])
+
+
+def table_dims(table, sf):
+    if table == 'panel':
+        return {
+            'parts': max(len(PANEL_PART_FE), int(round(3 * sf))),
+            'countries': min(200, max(len(PANEL_COUNTRY_FE), int(round(5 * sf ** 0.5)))),
+            'months': min(120, max(26, int(round(26 * sf ** 0.25)))),
+        }
+    if table == 'sales':
+        return {'parts': max(len(SALES_PARTS), int(round(5 * sf))), 'days': SALES_DAYS}
+    if table == 'markets':
+        return {'markets': max(50, int(round(50 * sf)))}
+    raise ValueError(f"Unknown table: {table}")
+
+
+def _rng(seed, table, *key):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(TABLE_CODES[table],) + key))
+
+
+def _partitions(table, dims):
+    # Partition boundaries depend only on the dimensions, never on the worker count
+    if table == 'markets':
+        n = dims['markets']
+        return [(lo, min(n, lo + ROWS_PER_PARTITION)) for lo in range(0, n, ROWS_PER_PARTITION)]
+    rows_per_part = dims['countries'] * dims['months'] if table == 'panel' else dims['days']
+    block = max(1, ROWS_PER_PARTITION // rows_per_part)
+    n = dims['parts']
+    return [(lo, min(n, lo + block)) for lo in range(0, n, block)]
+
+
+# ==========================================
+# 🔧 Dimension Attributes (vectorized, one stream per table)
+# ==========================================
+def _panel_attributes(dims, seed):
+    rng = _rng(seed, 'panel', 0)
+    n_p, n_c, n_m = dims['parts'], dims['countries'], dims['months']
+
+    part_names = np.array(list(PANEL_PART_FE) + [f"Part_{i:05d}" for i in range(len(PANEL_PART_FE), n_p)])
+    part_fe = np.exp(rng.normal(np.log(30), 0.6, n_p))
+    elasticity = rng.uniform(-2.0, -0.5, n_p)
+    part_fe[:len(PANEL_PART_FE)] = list(PANEL_PART_FE.values())
+    elasticity[:len(PANEL_ELASTICITY)] = list(PANEL_ELASTICITY.values())
+
+    country_names = np.array(list(PANEL_COUNTRY_FE) + [f"Country_{i:03d}" for i in range(len(PANEL_COUNTRY_FE), n_c)])
+    country_fe = rng.uniform(0.5, 1.3, n_c)
+    country_fe[:len(PANEL_COUNTRY_FE)] = list(PANEL_COUNTRY_FE.values())
+
+    # Synthetic KRW/USD path (1200 -> ~1400 peak -> back), shared by every partition
+    dates = pd.date_range(end=PANEL_END, periods=n_m, freq='MS')
+    fx = 1200 + np.sin(np.linspace(0, 3.14, n_m + 1)) * 200 + rng.normal(0, 15, n_m + 1)
+    return part_names, part_fe, elasticity, country_names, country_fe, dates, fx[:n_m]
+
+
+def _sales_attributes(dims, seed):
+    rng = _rng(seed, 'sales', 0)
+    n_p, n_base = dims['parts'], len(SALES_PARTS)
+
+    names = np.array(SALES_PARTS + [f"SKU_{i:06d}" for i in range(n_base, n_p)])
+    price = np.exp(rng.normal(np.log(30), 0.7, n_p))
+    cost = price * rng.uniform(0.3, 0.55, n_p)
+    elasticity = rng.uniform(-2.2, -0.6, n_p)
+    demand = np.exp(rng.normal(np.log(150), 0.6, n_p))
+    price[:n_base], cost[:n_base] = SALES_BASE_PRICE, SALES_BASE_COST
+    elasticity[:n_base], demand[:n_base] = SALES_ELASTICITY, SALES_BASE_DEMAND
+    return names, price, cost, elasticity, demand
+
+
+# ==========================================
+# 🧱 Partition Builders (fully vectorized numpy)
+# ==========================================
+def _build_panel(dims, seed, index, lo, hi):
+    part_names, part_fe, elasticity, country_names, country_fe, dates, fx = _panel_attributes(dims, seed)
+    rng = _rng(seed, 'panel', 1, index)
+    shape = (len(dates), len(country_names), hi - lo)  # date -> country -> part, like the original loops
+
+    base_p = part_fe[lo:hi][None, None, :]
+    fx_shock = ((fx - 1200) / 100 * -0.5)[:, None, None]
+    price = np.maximum(5, base_p * country_fe[None, :, None] + fx_shock + rng.normal(0, 2, shape))
+
+    # Endogeneity: an unobserved demand shock raises both price and quantity
+    demand_shock = rng.normal(0, 100, shape)
+    price = price + demand_shock * 0.05
+    a = 1000 * country_fe[None, :, None]
+    with np.errstate(invalid='ignore', over='ignore', divide='ignore'):
+        qty = a * price ** elasticity[lo:hi][None, None, :] + demand_shock + rng.normal(0, 50, shape)
+    qty = np.where(np.isfinite(qty), qty, 10)
+    # Near-zero prices after the shock blow up P^E; keep counts inside the int32 storage type
+    qty = np.clip(np.trunc(qty), 10, np.iinfo(np.int32).max).astype(np.int64)
+
+    d_idx, c_idx, p_idx = (ix.ravel() for ix in np.indices(shape))
+    return pd.DataFrame({
+        'Date': dates[d_idx],
+        'Country': country_names[c_idx],
+        'Part': part_names[lo:hi][p_idx],
+        'Price_USD': np.round(price.ravel(), 2),
+        'Quantity': qty.ravel(),
+        'KRW_USD': np.round(fx[d_idx], 2),
+    })
+
+
+def _build_sales(dims, seed, index, lo, hi):
+    names, base_price, base_cost, elasticity, base_demand = _sales_attributes(dims, seed)
+    rng = _rng(seed, 'sales', 1, index)
+    dates = pd.date_range(start='2024-01-01', periods=dims['days'], freq='D')
+    shape = (len(dates), hi - lo)
+
+    seasonality = (1.0 + 0.1 * np.sin(dates.dayofyear.values / 365.0 * 2 * np.pi))[:, None]
+    price = base_price[lo:hi] * rng.uniform(0.85, 1.15, shape)
+    # Constant elasticity demand Q = a * P^E, with a back-calculated from the base price
+    a = (base_demand[lo:hi] * seasonality) / (base_price[lo:hi] ** elasticity[lo:hi])
+    qty = rng.poisson(a * price ** elasticity[lo:hi])
+    cost = base_cost[lo:hi] * rng.uniform(0.95, 1.05, shape)
+
+    d_idx, p_idx = (ix.ravel() for ix in np.indices(shape))
+    df = pd.DataFrame({
+        'Date': dates[d_idx],
+        'Part_ID': names[lo:hi][p_idx],
+        'Price': np.round(price.ravel(), 2),
+        'Quantity': qty.ravel(),
+        'Cost': np.round(cost.ravel(), 2),
+    })
+    df['Revenue'] = df['Price'] * df['Quantity']
+    df['Margin'] = (df['Price'] - df['Cost']) * df['Quantity']
+    return df
+
+
+def _market_ids(lo, hi):
+    idx = np.arange(lo, hi)
+    ids = np.char.add('Market_', np.char.zfill(idx.astype(str), 7))
+    # Keep the original 50 names for SF=1 compatibility
+    n_head = int((idx < 50).sum())
+    ids[:n_head] = [f"Country_{chr(65 + i)}{chr(65 + (i * 2) % 26)}" for i in idx[:n_head]]
+    return ids
+
+
+def _build_markets(dims, seed, index, lo, hi):
+    rng = _rng(seed, 'markets', 1, index)
+    n = hi - lo
+    cluster = rng.choice(3, size=n, p=MARKET_CLUSTER_P)
+
+    def draw(params):
+        mu, sd = (np.asarray(v)[cluster] for v in params)
+        return rng.normal(mu, sd)
+
+    gdp, inflation, price, vol = draw(MARKET_GDP), draw(MARKET_INFLATION), draw(MARKET_PRICE), draw(MARKET_VOLUME)
+
+    # Intentional anomalies: rich market priced too low / poor market priced too high
+    anomaly = rng.random(n) < 0.05
+    price = np.where(anomaly & (cluster == 0), 75, np.where(anomaly & (cluster == 2), 115, price))
+
+    return pd.DataFrame({
+        'Country_ID': _market_ids(lo, hi),
+        'GDP_Per_Capita_USD': np.round(gdp, 2),
+        'Inflation_Rate_%': np.round(inflation, 2),
+        'Avg_Part_Price_USD': np.round(price, 2),
+        'Annual_Sales_Volume': np.maximum(100, np.trunc(vol)).astype(np.int64),
+    })
+
+
+BUILDERS = {'panel': _build_panel, 'sales': _build_sales, 'markets': _build_markets}
+
+
+def synthesize_market_pricing(gdp, rng):
+    # Vectorized pricing/volume synthesis on top of real World Bank GDP (used by fetch_wb_data.py)
+    gdp = np.asarray(gdp, dtype=float)
+    n = len(gdp)
+    base_price = 50 + (np.log(gdp) * 5)
+
+    # 5% heavily underpriced (opportunity), 5% heavily overpriced (risk), rest normal
+    anomaly = rng.random(n)
+    price = np.where(anomaly < 0.05, base_price * 0.6,
+                     np.where(anomaly > 0.95, base_price * 1.5, base_price + rng.normal(0, 5, n)))
+    price = np.round(price, 2)
+
+    vol = 1000 * np.log(gdp) - (price * 10) + rng.normal(0, 500, n)
+    return price, np.maximum(100, np.trunc(vol)).astype(np.int64)
+
+
+# ==========================================
+# 💾 Streaming Writers
+# ==========================================
+def build_partition(table, sf, seed, index):
+    dims = table_dims(table, sf)
+    lo, hi = _partitions(table, dims)[index]
+    return BUILDERS[table](dims, seed, index, lo, hi)
+
+
+def to_arrow(table, df):
+    return pa.Table.from_pandas(df, schema=COMPACT_SCHEMAS[table], preserve_index=False)
+
+
+def _write_partition(table, sf, seed, index, out_dir, fmt):
+    df = build_partition(table, sf, seed, index)
+    path = os.path.join(out_dir, f"part-{index:05d}.{fmt}")
+    if fmt == 'parquet':
+        pq.write_table(to_arrow(table, df), path)
+    else:
+        df.to_csv(path, index=False)
+    return path, len(df)
+
+
+def write_table(table, sf, output_path, seed=None, workers=1, fmt='parquet'):
+    # output_path ending in .csv/.parquet -> one file appended in partition order;
+    # otherwise a directory of part files in `fmt` (a partitioned Parquet dataset by default)
+    seed = DEFAULT_SEEDS[table] if seed is None else seed
+    n_parts = len(_partitions(table, table_dims(table, sf)))
+    single_file = output_path.endswith(('.csv', '.parquet'))
+    out_dir = os.path.dirname(output_path) if single_file else output_path
+    os.makedirs(out_dir or '.', exist_ok=True)
+
+    if single_file:
+        fn, tasks = build_partition, [(table, sf, seed, i) for i in range(n_parts)]
+    else:
+        fn, tasks = _write_partition, [(table, sf, seed, i, output_path, fmt) for i in range(n_parts)]
+
+    total = 0
+    writer = None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for i, result in enumerate(iter_bounded(executor, fn, tasks, window=max(1, workers) * 2)):
+            if not single_file:
+                total += result[1]
+            elif output_path.endswith('.parquet'):
+                # One row group per partition, streamed through a single writer
+                writer = writer or pq.ParquetWriter(output_path, COMPACT_SCHEMAS[table])
+                writer.write_table(to_arrow(table, result))
+                total += len(result)
+            else:
+                result.to_csv(output_path, index=False, mode='w' if i == 0 else 'a', header=(i == 0))
+                total += len(result)
+    if writer is not None:
+        writer.close()
+    return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Scale-factor synthetic data generator")
+    parser.add_argument('--table', choices=list(BUILDERS), default='panel')
+    parser.add_argument('--sf', type=float, default=1.0, help="TPC-style scale factor (1 = original size)")
+    parser.add_argument('--out', required=True, help="*.csv / *.parquet for a single file, otherwise a partition directory")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet', help="part file format for directory output")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    n_rows = write_table(args.table, args.sf, args.out, seed=args.seed, workers=args.workers, fmt=args.format)
+    print(f"✅ Generated '{args.table}' at SF={args.sf} {table_dims(args.table, args.sf)} ({n_rows:,} rows) -> {args.out}")